@@ -4,17 +4,146 @@ This module defines the base classes and interfaces for implementing
 workflow actions in the automation platform.
 """
 
+import asyncio
+import json
 import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 from datetime import datetime
 import time
 
+try:
+    import aiohttp
+except ImportError:  # actions that make HTTP requests report it when they run
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; JSON bodies use the stdlib json module
+    orjson = None
+
 from ..core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
 
+# Seconds to cache resolved host addresses in pooled HTTP connectors
+DNS_CACHE_TTL = 300
+
+# Connection limits for the process-wide session shared by API actions
+SHARED_POOL_LIMIT = 200
+SHARED_POOL_LIMIT_PER_HOST = 50
+
+# Process-wide HTTP sessions keyed by (limit, limit_per_host), each
+# stored with the event loop it belongs to
+_shared_sessions = {}
+
+
+def create_http_connector(
+    limit: int = 100,
+    limit_per_host: int = 20,
+    dns_cache_ttl: int = DNS_CACHE_TTL,
+    **kwargs: Any
+):
+    """Create a pooled aiohttp connector that caches DNS lookups.
+
+    Uses aiodns for asynchronous resolution when it is installed and the
+    thread-pool resolver otherwise. Must be called from a running event loop.
+
+    Args:
+        limit: Total connection limit (0 for unlimited)
+        limit_per_host: Connection limit per host
+        dns_cache_ttl: Seconds to keep resolved addresses
+        **kwargs: Extra TCPConnector arguments
+
+    Returns:
+        aiohttp.TCPConnector instance
+    """
+    try:
+        import aiodns  # noqa: F401
+        resolver = aiohttp.AsyncResolver()
+    except ImportError:  # aiodns is optional; resolve in a thread instead
+        resolver = aiohttp.ThreadedResolver()
+
+    kwargs.setdefault("keepalive_timeout", 75)
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=dns_cache_ttl,
+        resolver=resolver,
+        **kwargs
+    )
+
+
+def json_serialize(data: Any) -> str:
+    """Serialize a request body to JSON, preferring orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # Integers wider than 64 bits and other values orjson rejects
+            pass
+    return json.dumps(data)
+
+
+async def read_json(response) -> Any:
+    """Decode an aiohttp JSON response, preferring orjson when installed.
+
+    Falls back to response.json() when orjson is missing or cannot parse
+    the body, so errors and edge cases match aiohttp's own decoding.
+    """
+    if orjson is not None:
+        body = await response.read()
+        if not body.strip():
+            return None
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+    return await response.json()
+
+
+async def get_shared_session(
+    limit: int = SHARED_POOL_LIMIT,
+    limit_per_host: int = SHARED_POOL_LIMIT_PER_HOST
+):
+    """Get a process-wide aiohttp session, creating it on first use.
+
+    Actions that use it share one connection pool, so DNS lookups and
+    TLS handshakes are reused across action instances. Actions asking
+    for the same connection limits get the same session. A session is
+    recreated if it was closed or belongs to another event loop.
+
+    Args:
+        limit: Total connection limit of the pool
+        limit_per_host: Connection limit per host
+    """
+    loop = asyncio.get_running_loop()
+    key = (limit, limit_per_host)
+    session, session_loop = _shared_sessions.get(key, (None, None))
+    if session is None or session.closed or session_loop is not loop:
+        session = aiohttp.ClientSession(
+            connector=create_http_connector(
+                limit=limit,
+                limit_per_host=limit_per_host,
+                enable_cleanup_closed=True
+            ),
+            json_serialize=json_serialize
+        )
+        _shared_sessions[key] = (session, loop)
+    return session
+
+
+async def close_shared_session() -> None:
+    """Close every process-wide aiohttp session."""
+    sessions = list(_shared_sessions.values())
+    _shared_sessions.clear()
+    for session, _ in sessions:
+        if not session.closed:
+            await session.close()
+
+
 class ActionError(Exception):
     """Raised when an action execution fails."""
     def __init__(self, action_name: str, message: str, details: Optional[Dict[str, Any]] = None):
@@ -88,6 +217,13 @@ class BaseAction(ABC):
         """
         pass
 
+    async def close(self) -> None:
+        """Release resources held by the action, such as HTTP sessions.
+
+        Actions that keep connections open between executions override this.
+        """
+        pass
+
     def get_schema(self) -> Dict[str, Any]:
         """Get the JSON schema for the action's input and output.
 
@@ -155,11 +291,11 @@ class BaseAction(ABC):
         Returns:
             Execution result with timing information
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             result = await execution_func(*args, **kwargs)
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
 
             # Add timing metadata
             if isinstance(result, dict):
@@ -170,7 +306,7 @@ class BaseAction(ABC):
             return result
 
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.error(f"Action {self.action_name} failed after {execution_time:.2f}s: {e}")
             raise
 
@@ -201,6 +337,42 @@ class HttpAction(BaseAction):
         self.timeout = config.get("timeout", 30)
         self.headers = config.get("headers", {})
 
+        self.dns_cache_ttl = config.get("dns_cache_ttl", DNS_CACHE_TTL)
+
+        # Shared HTTP session, created on first use and released by close()
+        self._session = None
+
+        # SSL setting for the session's connector; None keeps aiohttp's default
+        self._ssl_context = None
+
+    async def _get_session(self):
+        """Get the shared aiohttp session, creating it on first use.
+
+        Requests made by the same action instance, including retries,
+        reuse its keep-alive connections instead of opening new ones.
+        """
+        if self._session is None or self._session.closed:
+            connector_kwargs = {}
+            if self._ssl_context is not None:
+                connector_kwargs["ssl"] = self._ssl_context
+
+            self._session = aiohttp.ClientSession(
+                connector=create_http_connector(
+                    limit=0,
+                    limit_per_host=32,
+                    dns_cache_ttl=self.dns_cache_ttl,
+                    enable_cleanup_closed=True,
+                    **connector_kwargs
+                )
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def validate_config(self) -> bool:
         """Validate HTTP action configuration."""
         if not self.base_url:
@@ -219,15 +391,13 @@ class HttpAction(BaseAction):
     async def test_connection(self) -> bool:
         """Test HTTP connection to the configured endpoint."""
         try:
-            import aiohttp
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.base_url,
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    return response.status < 400
+            session = await self._get_session()
+            async with session.get(
+                self.base_url,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                return response.status < 400
         except Exception as e:
             logger.error(f"HTTP connection test failed: {e}")
             return False
@@ -246,6 +416,10 @@ class ApiAction(BaseAction):
         self.api_base_url = config.get("api_base_url", "")
         self.auth_method = config.get("auth_method", "bearer")
 
+    async def _get_session(self):
+        """Get the process-wide aiohttp session shared by API actions."""
+        return await get_shared_session()
+
     async def validate_config(self) -> bool:
         """Validate API action configuration."""
         if not self.api_key:
@@ -273,18 +447,16 @@ class ApiAction(BaseAction):
     async def test_connection(self) -> bool:
         """Test API connection."""
         try:
-            import aiohttp
-
             headers = self.get_auth_headers()
             headers.update({"Content-Type": "application/json"})
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_base_url}/health" if self.api_base_url else "https://httpbin.org/get",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    return response.status < 400
+            session = await self._get_session()
+            async with session.get(
+                f"{self.api_base_url}/health" if self.api_base_url else "https://httpbin.org/get",
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                return response.status < 400
         except Exception as e:
             logger.error(f"API connection test failed: {e}")
             return False
@@ -6,15 +6,36 @@ grouping, and statistical calculations on data arrays.
 """
 
 import logging
-from typing import Any, Dict, Optional, List, Union
+from typing import Any, Callable, Dict, Iterable, Optional, List, Union
 from collections import defaultdict
+import math
 import statistics
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; reductions fall back to pure Python
+    np = None
+
 from ..base import BaseAction
 from ...core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+# Below this size pure-Python reductions beat the cost of building a numpy array
+NUMPY_THRESHOLD = 1024
+
+# Numeric reductions that can run on a numpy array
+NUMPY_REDUCTIONS = ("sum", "min", "max", "avg", "median", "std_dev", "variance")
+
+# Inputs with at least this many rows are aggregated column by column
+COLUMNAR_THRESHOLD = 10000
+
+# Grouped aggregations that can be computed with numpy segment reductions
+VECTORIZED_GROUP_REDUCTIONS = ("count", "sum", "avg", "min", "max")
+
+INT32_MIN = -(2 ** 31)
+INT32_MAX = 2 ** 31 - 1
+
 
 class DataAggregateAction(BaseAction):
     """Action for aggregating data collections.
@@ -35,6 +56,11 @@ class DataAggregateAction(BaseAction):
         self.output_format = config.get("output_format", "object")  # object, array
         self.include_original_data = config.get("include_original_data", False)
 
+        # Field paths are fixed after construction, so resolve them into getters once
+        self._compiled_paths: Dict[str, Callable[[Any], Any]] = {}
+        self._group_getter = self._compile_group_getter()
+        self._agg_specs = self._compile_aggregations()
+
     async def validate_config(self) -> bool:
         """Validate data aggregate action configuration."""
         if not isinstance(self.aggregations, dict):
@@ -105,39 +131,74 @@ class DataAggregateAction(BaseAction):
         if not data:
             return {} if not self.group_by else []
 
+        # Large inputs are transposed once so each aggregation scans a single column
+        columns = self._to_columns(data) if len(data) >= COLUMNAR_THRESHOLD else None
+
         if self.group_by:
-            return self._group_and_aggregate(data)
+            return self._group_and_aggregate(data, columns)
         else:
-            return self._aggregate_all(data)
-
-    def _aggregate_all(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+            return self._aggregate_all(data, columns)
+
+    def _to_columns(self, data: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Transpose rows into one value list per referenced field."""
+        fields = set(self.group_by)
+        for _, _, field in self._agg_specs:
+            if field is not None:
+                fields.add(field)
+
+        columns = {}
+        for field in fields:
+            getter = self._get_path_getter(field)
+            columns[field] = [getter(item) for item in data]
+
+        return columns
+
+    def _aggregate_all(
+        self,
+        data: List[Dict[str, Any]],
+        columns: Optional[Dict[str, List[Any]]] = None
+    ) -> Dict[str, Any]:
         """Aggregate all data without grouping."""
         result = {}
 
-        for agg_name, agg_config in self.aggregations.items():
-            if isinstance(agg_config, str):
-                func_name = agg_config
-                field = None
+        for agg_name, func_name, field in self._agg_specs:
+            if columns is None:
+                result[agg_name] = self._apply_aggregation(data, func_name, field)
             else:
-                func_name = agg_config.get("function", "")
-                field = agg_config.get("field")
-
-            result[agg_name] = self._apply_aggregation(data, func_name, field)
+                values = columns[field] if field is not None else None
+                result[agg_name] = self._apply_column_aggregation(len(data), values, func_name)
 
         return result
 
-    def _group_and_aggregate(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Group data and aggregate within each group."""
+    def _group_and_aggregate(
+        self,
+        data: List[Dict[str, Any]],
+        columns: Optional[Dict[str, List[Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Group data and aggregate within each group.
+
+        Without ``columns`` each group holds its rows; with ``columns`` each
+        group holds row indices into the column lists.
+        """
+        if columns is not None and self._can_vectorize_groups():
+            results = self._group_and_aggregate_vectorized(columns, len(data))
+            if results is not None:
+                return results
+
         groups = defaultdict(list)
 
         # Group data
-        for item in data:
-            group_key = self._get_group_key(item)
-            groups[group_key].append(item)
+        if columns is None:
+            group_getter = self._group_getter
+            for item in data:
+                groups[group_getter(item)].append(item)
+        else:
+            for index, group_key in enumerate(self._column_group_keys(columns)):
+                groups[group_key].append(index)
 
         # Aggregate each group
         results = []
-        for group_key, group_data in groups.items():
+        for group_key, members in groups.items():
             group_result = {}
 
             # Add group key fields
@@ -148,73 +209,275 @@ class DataAggregateAction(BaseAction):
                 group_result[self.group_by[0]] = group_key
 
             # Add aggregations
-            for agg_name, agg_config in self.aggregations.items():
-                if isinstance(agg_config, str):
-                    func_name = agg_config
-                    field = None
+            for agg_name, func_name, field in self._agg_specs:
+                if columns is None:
+                    group_result[agg_name] = self._apply_aggregation(members, func_name, field)
                 else:
-                    func_name = agg_config.get("function", "")
-                    field = agg_config.get("field")
-
-                group_result[agg_name] = self._apply_aggregation(group_data, func_name, field)
+                    values = None
+                    if field is not None and func_name != "count":
+                        column = columns[field]
+                        values = [column[i] for i in members]
+                    group_result[agg_name] = self._apply_column_aggregation(len(members), values, func_name)
 
             # Add original data if requested
             if self.include_original_data:
-                group_result["_data"] = group_data
+                group_result["_data"] = members if columns is None else [data[i] for i in members]
 
             results.append(group_result)
 
         return results
 
-    def _get_group_key(self, item: Dict[str, Any]) -> Union[str, tuple]:
-        """Get the group key for an item."""
+    def _compile_aggregations(self) -> List[tuple]:
+        """Normalize aggregation definitions into (agg_name, func_name, field) tuples."""
+        if not isinstance(self.aggregations, dict):
+            return []
+
+        specs = []
+        for agg_name, agg_config in self.aggregations.items():
+            if isinstance(agg_config, str):
+                specs.append((agg_name, agg_config, None))
+            elif isinstance(agg_config, dict):
+                specs.append((agg_name, agg_config.get("function", ""), agg_config.get("field")))
+            else:
+                # Rejected by validate_config; yields None if executed anyway
+                specs.append((agg_name, "", None))
+
+        return specs
+
+    def _column_group_keys(self, columns: Dict[str, List[Any]]) -> Iterable[Any]:
+        """Iterate over the group key of each row from the group-by columns."""
         if len(self.group_by) == 1:
-            field = self.group_by[0]
-            return self._get_nested_value(item, field)
-        else:
-            return tuple(self._get_nested_value(item, field) for field in self.group_by)
+            return columns[self.group_by[0]]
+        return zip(*[columns[field] for field in self.group_by])
 
-    def _get_nested_value(self, data: Dict[str, Any], path: str) -> Any:
-        """Get value from nested data structure using dot notation."""
-        if not path:
-            return data
+    def _can_vectorize_groups(self) -> bool:
+        """Check whether grouped results can be computed without per-group row lists."""
+        if np is None or self.include_original_data:
+            return False
 
-        keys = path.split(".")
-        current = data
+        for _, func_name, _ in self._agg_specs:
+            if func_name not in VECTORIZED_GROUP_REDUCTIONS:
+                return False
 
-        try:
-            for key in keys:
-                if isinstance(current, dict):
-                    current = current[key]
-                elif isinstance(current, list) and key.isdigit():
-                    current = current[int(key)]
+        return True
+
+    def _group_and_aggregate_vectorized(
+        self,
+        columns: Dict[str, List[Any]],
+        row_count: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Group and aggregate with integer group labels and numpy segment reductions.
+
+        Returns None when a value column cannot be reduced exactly with numpy,
+        in which case the caller falls back to per-group row lists.
+        """
+        # Factorize group keys into labels, keeping first-seen group order
+        group_index = {}
+        labels = np.fromiter(
+            (group_index.setdefault(key, len(group_index)) for key in self._column_group_keys(columns)),
+            dtype=np.intp,
+            count=row_count
+        )
+        group_count = len(group_index)
+
+        results = []
+        for group_key in group_index:
+            if isinstance(group_key, tuple):
+                results.append(dict(zip(self.group_by, group_key)))
+            else:
+                results.append({self.group_by[0]: group_key})
+
+        row_counts = None
+        segmented_columns = {}
+        for agg_name, func_name, field in self._agg_specs:
+            if func_name == "count":
+                if row_counts is None:
+                    row_counts = np.bincount(labels, minlength=group_count).tolist()
+                reduced = row_counts
+            elif field is None:
+                reduced = [None] * group_count
+            else:
+                if field not in segmented_columns:
+                    segmented_columns[field] = self._segment_column(columns[field], labels, group_count)
+                segments = segmented_columns[field]
+                if segments is None:
+                    return None
+                reduced = self._reduce_segments(segments, group_count, func_name)
+
+            for group_result, value in zip(results, reduced):
+                group_result[agg_name] = value
+
+        return results
+
+    def _segment_column(
+        self,
+        column: List[Any],
+        labels: "np.ndarray",
+        group_count: int
+    ) -> Optional[tuple]:
+        """Coerce a value column and sort its values into one contiguous segment per group.
+
+        Returns ``(sorted_values, groups, starts, counts)`` for the groups that have
+        at least one numeric value, or None when the column cannot be reduced exactly.
+        """
+        column_types = set(map(type, column))
+
+        if column_types <= {int} or column_types <= {float}:
+            # Homogeneous columns need no per-value coercion
+            values = column
+            value_labels = labels
+            has_int = int in column_types
+        else:
+            # Coerce values exactly like _aggregate_values, remembering which rows survive
+            values = []
+            valid_rows = []
+            has_int = has_float = False
+            for row, value in enumerate(column):
+                if value is None:
+                    continue
+                if isinstance(value, str):
+                    try:
+                        value = float(value) if '.' in value else int(value)
+                    except ValueError:
+                        continue
+                if type(value) is int:
+                    has_int = True
+                elif type(value) is float:
+                    has_float = True
                 else:
                     return None
-            return current
-        except (KeyError, IndexError, TypeError):
+                values.append(value)
+                valid_rows.append(row)
+
+            # Mixed int/float columns would change the result types
+            if has_int and has_float:
+                return None
+            value_labels = labels[valid_rows]
+
+        # Integer sums are accumulated in int64 and must not overflow
+        if has_int and values and max(map(abs, values)) * len(values) > INT32_MAX * INT32_MAX:
+            return None
+
+        value_array = np.asarray(values, dtype=np.int64 if has_int else np.float64)
+        counts = np.bincount(value_labels, minlength=group_count)
+        order = np.argsort(value_labels, kind="stable")
+        groups = np.flatnonzero(counts)
+        group_counts = counts[groups]
+        starts = np.concatenate(([0], np.cumsum(group_counts)[:-1])).astype(np.intp)
+
+        return value_array[order], groups, starts, group_counts
+
+    def _reduce_segments(self, segments: tuple, group_count: int, func_name: str) -> List[Any]:
+        """Reduce each group segment; groups without numeric values get None."""
+        sorted_values, groups, starts, group_counts = segments
+        reduced = [None] * group_count
+
+        if not groups.size:
+            return reduced
+
+        if func_name == "min":
+            segment = np.minimum.reduceat(sorted_values, starts)
+        elif func_name == "max":
+            segment = np.maximum.reduceat(sorted_values, starts)
+        else:
+            segment = np.add.reduceat(sorted_values, starts)
+            if func_name == "avg":
+                segment = segment / group_counts
+
+        for group, value in zip(groups.tolist(), segment.tolist()):
+            reduced[group] = value
+
+        return reduced
+
+    def _compile_group_getter(self) -> Optional[Callable[[Any], Any]]:
+        """Build a callable returning the group key for an item."""
+        if not self.group_by:
             return None
 
+        getters = [self._get_path_getter(field) for field in self.group_by]
+
+        if len(getters) == 1:
+            return getters[0]
+        elif len(getters) == 2:
+            g0, g1 = getters
+            return lambda item: (g0(item), g1(item))
+        else:
+            return lambda item: tuple([g(item) for g in getters])
+
+    def _get_path_getter(self, path: str) -> Callable[[Any], Any]:
+        """Get the compiled getter for a dot-notation path, compiling it on first use."""
+        getter = self._compiled_paths.get(path)
+        if getter is None:
+            getter = self._compiled_paths[path] = self._compile_path(path)
+        return getter
+
+    def _compile_path(self, path: str) -> Callable[[Any], Any]:
+        """Compile a dot-notation path into a getter.
+
+        Digit keys also index lists; a missing key or index gives None.
+        """
+        if not path:
+            return lambda data: data
+
+        keys = tuple((key, int(key) if key.isdigit() else None) for key in path.split("."))
+
+        if len(keys) == 1 and keys[0][1] is None:
+            key = keys[0][0]
+            return lambda data: data.get(key) if isinstance(data, dict) else None
+
+        def getter(data: Any) -> Any:
+            current = data
+            try:
+                for key, index in keys:
+                    if isinstance(current, dict):
+                        current = current[key]
+                    elif index is not None and isinstance(current, list):
+                        current = current[index]
+                    else:
+                        return None
+                return current
+            except (KeyError, IndexError, TypeError):
+                return None
+
+        return getter
+
     def _apply_aggregation(self, data: List[Dict[str, Any]], func_name: str, field: Optional[str]) -> Any:
         """Apply an aggregation function to data."""
         if not data:
             return None
 
-        try:
-            if func_name == "count":
-                return len(data)
+        if func_name == "count":
+            return len(data)
 
-            if field is None:
-                # Count aggregation doesn't need field
-                if func_name == "count":
-                    return len(data)
-                return None
+        if field is None:
+            return None
+
+        getter = self._get_path_getter(field)
+        return self._aggregate_values([getter(item) for item in data], func_name)
+
+    def _apply_column_aggregation(self, row_count: int, values: Optional[List[Any]], func_name: str) -> Any:
+        """Apply an aggregation function to values already extracted from a column.
+
+        ``values`` is None when the aggregation has no field.
+        """
+        if not row_count:
+            return None
 
-            # Extract values from the specified field
+        if func_name == "count":
+            return row_count
+
+        if values is None:
+            return None
+
+        return self._aggregate_values(values, func_name)
+
+    def _aggregate_values(self, raw_values: List[Any], func_name: str) -> Any:
+        """Reduce the raw values of a field with an aggregation function."""
+        try:
+            # Drop missing values and coerce numeric strings for mathematical operations
             values = []
-            for item in data:
-                value = self._get_nested_value(item, field)
+            for value in raw_values:
                 if value is not None:
-                    # Try to convert to numeric for mathematical operations
                     if func_name in ["sum", "avg", "min", "max", "median", "std_dev", "variance"]:
                         try:
                             if isinstance(value, str):
@@ -232,6 +495,11 @@ class DataAggregateAction(BaseAction):
             if not values:
                 return None
 
+            if np is not None and len(values) >= NUMPY_THRESHOLD and func_name in NUMPY_REDUCTIONS:
+                array = self._to_numeric_array(values)
+                if array is not None:
+                    return self._reduce_array(array, func_name)
+
             # Apply aggregation function
             if func_name == "sum":
                 return sum(values)
@@ -242,15 +510,15 @@ class DataAggregateAction(BaseAction):
             elif func_name == "max":
                 return max(values)
             elif func_name == "avg":
-                return sum(values) / len(values)
+                return statistics.fmean(values)
             elif func_name == "median":
-                return statistics.median(values)
+                return self._median(values)
             elif func_name == "mode":
                 return statistics.mode(values)
             elif func_name == "std_dev":
-                return statistics.stdev(values) if len(values) > 1 else 0
+                return math.sqrt(self._variance(values)) if len(values) > 1 else 0
             elif func_name == "variance":
-                return statistics.variance(values) if len(values) > 1 else 0
+                return self._variance(values) if len(values) > 1 else 0
             elif func_name == "first":
                 return values[0]
             elif func_name == "last":
@@ -258,7 +526,7 @@ class DataAggregateAction(BaseAction):
             elif func_name == "concat":
                 return "".join(str(v) for v in values)
             elif func_name == "unique_count":
-                return len(set(values))
+                return self._unique_count(values)
             else:
                 return None
 
@@ -266,6 +534,78 @@ class DataAggregateAction(BaseAction):
             logger.warning(f"Error applying aggregation {func_name}: {e}")
             return None
 
+    def _unique_count(self, values: List[Any]) -> int:
+        """Count distinct values, using numpy's sort-based unique for large float columns."""
+        # Python's set hashes ints and strings faster than numpy can convert them
+        if np is not None and len(values) >= COLUMNAR_THRESHOLD and type(values[0]) is float:
+            array = np.asarray(values)
+            if array.dtype == np.float64:
+                return np.unique(array).size
+        return len(set(values))
+
+    def _median(self, values: List[Union[int, float]]) -> Union[int, float]:
+        """Compute the median of a list of numbers."""
+        return statistics.median(values)
+
+    def _to_numeric_array(self, values: List[Any]) -> Optional["np.ndarray"]:
+        """Convert numeric values to the narrowest numpy array that holds them exactly.
+
+        Returns None when the values are not purely numeric, or are integers
+        too large for int64 (numpy would pick an unsigned or object dtype).
+        """
+        array = np.asarray(values)
+
+        if array.dtype.kind == "i":
+            if array.min() >= INT32_MIN and array.max() <= INT32_MAX:
+                array = array.astype(np.int32)
+        elif array.dtype == np.float64:
+            narrowed = array.astype(np.float32)
+            if np.array_equal(narrowed, array):
+                array = narrowed
+        elif array.dtype.kind != "f":
+            return None
+
+        return array
+
+    def _reduce_array(self, array: "np.ndarray", func_name: str) -> Union[int, float]:
+        """Apply a numeric reduction to a numpy array, accumulating in 64-bit precision."""
+        accumulator = np.float64 if array.dtype.kind == "f" else np.int64
+
+        if func_name == "sum":
+            # Same bound as _segment_column: past it an int64 total could wrap
+            if accumulator is np.int64 and array.size:
+                largest = max(abs(int(array.min())), abs(int(array.max())))
+                if largest * array.size > INT32_MAX * INT32_MAX:
+                    return sum(array.tolist())
+            return array.sum(dtype=accumulator).item()
+        elif func_name == "min":
+            return array.min().item()
+        elif func_name == "max":
+            return array.max().item()
+        elif func_name == "avg":
+            return array.mean(dtype=np.float64).item()
+        elif func_name == "median":
+            n = array.size
+            mid = n // 2
+            if n % 2:
+                return np.partition(array, mid)[mid].item()
+            lower, upper = np.partition(array, [mid - 1, mid])[mid - 1:mid + 1]
+            return (float(lower) + float(upper)) / 2
+        elif func_name == "std_dev":
+            return array.std(ddof=1, dtype=np.float64).item() if array.size > 1 else 0
+        else:
+            return array.var(ddof=1, dtype=np.float64).item() if array.size > 1 else 0
+
+    def _variance(self, values: List[Union[int, float]]) -> float:
+        """Compute the sample variance in a single pass (Welford's algorithm)."""
+        mean = 0.0
+        m2 = 0.0
+        for n, value in enumerate(values, 1):
+            delta = value - mean
+            mean += delta / n
+            m2 += delta * (value - mean)
+        return m2 / (len(values) - 1)
+
     async def test_connection(self) -> bool:
         """Test data aggregate action (no external connections needed)."""
         return True
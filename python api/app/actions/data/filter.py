@@ -7,7 +7,7 @@ field values, patterns, ranges, and complex logical expressions.
 
 import logging
 import re
-from typing import Any, Dict, Optional, List, Union
+from typing import Any, Callable, Dict, Optional, List, Union
 from datetime import datetime
 import operator
 
@@ -16,6 +16,9 @@ from ...core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+LENGTH_OPERATORS = ("length_equals", "length_greater", "length_less")
+STRING_OPERATORS = ("contains", "not_contains", "starts_with", "ends_with")
+
 
 class DataFilterAction(BaseAction):
     """Action for filtering data collections.
@@ -36,6 +39,10 @@ class DataFilterAction(BaseAction):
         self.case_sensitive = config.get("case_sensitive", True)
         self.max_results = config.get("max_results", None)
 
+        # Criteria are fixed after construction, so resolve paths and operands once
+        self._compiled_criteria = self._compile_criteria()
+        self._compiled_match, self._compiled_select = self._generate_filter_functions()
+
     async def validate_config(self) -> bool:
         """Validate data filter action configuration."""
         if not isinstance(self.filter_criteria, list):
@@ -106,6 +113,9 @@ class DataFilterAction(BaseAction):
             return data if self._matches_criteria(data) else None
         elif isinstance(data, list):
             # Filter array
+            if self._compiled_select is not None:
+                return self._compiled_select(data)
+
             filtered = []
             for item in data:
                 if isinstance(item, dict) and self._matches_criteria(item):
@@ -116,22 +126,16 @@ class DataFilterAction(BaseAction):
 
     def _matches_criteria(self, item: Dict[str, Any]) -> bool:
         """Check if an item matches all filter criteria."""
-        if not self.filter_criteria:
+        if not self._compiled_criteria:
             return True
 
-        results = []
+        if self._compiled_match is not None:
+            return self._compiled_match(item)
 
-        for criterion in self.filter_criteria:
-            field = criterion.get("field", "")
-            operator_name = criterion.get("operator", "")
-            value = criterion.get("value")
-            case_sensitive = criterion.get("case_sensitive", self.case_sensitive)
-
-            # Get field value
-            field_value = self._get_nested_value(item, field)
+        results = []
 
-            # Apply operator
-            match = self._apply_operator(field_value, operator_name, value, case_sensitive)
+        for getter, operator_name, value, case_sensitive, operand in self._compiled_criteria:
+            match = self._apply_operator(getter(item), operator_name, value, case_sensitive, operand)
             results.append(match)
 
         # Apply logical operator
@@ -142,29 +146,181 @@ class DataFilterAction(BaseAction):
         else:
             return False
 
-    def _get_nested_value(self, data: Dict[str, Any], path: str) -> Any:
-        """Get value from nested data structure using dot notation."""
-        if not path:
-            return data
+    def _compile_criteria(self) -> List[tuple]:
+        """Normalize filter criteria into (getter, operator, value, case_sensitive, operand) tuples.
 
-        keys = path.split(".")
-        current = data
+        ``operand`` is the pre-stringified (and, when case-insensitive, lowercased)
+        expected value for string operators, or None for every other operator.
+        """
+        if not isinstance(self.filter_criteria, list):
+            return []
 
-        try:
-            for key in keys:
-                if isinstance(current, dict):
-                    current = current[key]
-                elif isinstance(current, list) and key.isdigit():
-                    current = current[int(key)]
+        compiled = []
+        for criterion in self.filter_criteria:
+            if not isinstance(criterion, dict):
+                continue
+
+            operator_name = criterion.get("operator", "")
+            value = criterion.get("value")
+            case_sensitive = criterion.get("case_sensitive", self.case_sensitive)
+            operand = None
+
+            if operator_name in STRING_OPERATORS:
+                if not case_sensitive and isinstance(value, str):
+                    operand = value.lower()
                 else:
-                    return None
-            return current
-        except (KeyError, IndexError, TypeError):
-            return None
+                    operand = str(value)
 
-    def _apply_operator(self, field_value: Any, operator_name: str, expected_value: Any, case_sensitive: bool = True) -> bool:
+            # Length operators compare against an integer; coerce it once, not per row
+            if operator_name in LENGTH_OPERATORS:
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    pass
+
+            compiled.append((
+                self._compile_path(criterion.get("field", "")),
+                operator_name,
+                value,
+                case_sensitive,
+                operand
+            ))
+
+        return compiled
+
+    def _generate_filter_functions(self) -> tuple:
+        """Generate Python functions specialized for the configured criteria.
+
+        Returns ``(match, select)`` where ``match(item)`` tests a single object and
+        ``select(data)`` filters a list, or ``(None, None)`` when there is nothing to
+        specialize. Common operators are inlined; the rest call _apply_operator.
+        Configured values are bound through the namespace and never spliced into
+        the generated source.
+        """
+        if not self._compiled_criteria:
+            return None, None
+
+        namespace = {"apply": self._apply_operator}
+        terms = []
+
+        for i, (getter, operator_name, value, case_sensitive, operand) in enumerate(self._compiled_criteria):
+            lowered = not case_sensitive and isinstance(value, str)
+            namespace[f"g{i}"] = getter
+            namespace[f"c{i}"] = value.lower() if lowered else value
+            namespace[f"raw{i}"] = value
+            namespace[f"op{i}"] = operator_name
+            namespace[f"cs{i}"] = case_sensitive
+            namespace[f"o{i}"] = operand
+
+            fetch = f"(v{i} := g{i}(item))"
+            text = f"v{i}" if case_sensitive else f"(v{i}.lower() if type(v{i}) is str else v{i})"
+            fallback = f"apply(v{i}, op{i}, raw{i}, cs{i}, o{i})"
+
+            if operator_name == "is_null":
+                term = f"{fetch} is None"
+            elif operator_name == "not_null":
+                term = f"{fetch} is not None"
+            elif operator_name in ("equals", "=="):
+                term = f"{fetch} is not None and {text} == c{i}"
+            elif operator_name in ("not_equals", "!="):
+                term = f"{fetch} is not None and {text} != c{i}"
+            elif operator_name == "in":
+                term = f"{fetch} is not None and {text} in raw{i}" if isinstance(value, list) else "False"
+            elif operator_name == "not_in":
+                term = f"{fetch} is not None" + (f" and {text} not in raw{i}" if isinstance(value, list) else "")
+            elif operator_name == "is_empty":
+                term = f"{fetch} is None or not v{i} or (isinstance(v{i}, str) and v{i}.strip() == '')"
+            elif operator_name == "not_empty":
+                term = f"{fetch} is not None and bool(v{i}) and (not isinstance(v{i}, str) or v{i}.strip() != '')"
+            elif operator_name in STRING_OPERATORS:
+                string_value = f"v{i}" if case_sensitive else f"v{i}.lower()"
+                if operator_name == "contains":
+                    test = f"o{i} in {string_value}"
+                elif operator_name == "not_contains":
+                    test = f"o{i} not in {string_value}"
+                elif operator_name == "starts_with":
+                    test = f"{string_value}.startswith(o{i})"
+                else:
+                    test = f"{string_value}.endswith(o{i})"
+                term = f"{test} if type({fetch}) is str else {fallback}"
+            else:
+                term = f"apply({fetch}, op{i}, raw{i}, cs{i}, o{i})"
+
+            terms.append(f"({term})")
+
+        joiner = " and " if self.logical_operator == "AND" else " or "
+        condition = joiner.join(terms)
+        source = (
+            "def match(item):\n"
+            f"    return bool({condition})\n"
+            "\n"
+            "def select(data):\n"
+            "    out = []\n"
+            "    append = out.append\n"
+            "    for item in data:\n"
+            f"        if isinstance(item, dict) and ({condition}):\n"
+            "            append(item)\n"
+            "    return out\n"
+        )
+
+        try:
+            exec(compile(source, "<data_filter>", "exec"), namespace)
+        except SyntaxError as e:
+            logger.warning(f"Falling back to interpreted filtering: {e}")
+            return None, None
+
+        return namespace["match"], namespace["select"]
+
+    def _compile_path(self, path: str) -> Callable[[Any], Any]:
+        """Compile a dot-notation path into a getter returning None when the path is missing."""
+        if not path:
+            return lambda data: data
+
+        keys = tuple((key, int(key) if key.isdigit() else None) for key in path.split("."))
+
+        if len(keys) == 1 and keys[0][1] is None:
+            key = keys[0][0]
+            return lambda data: data.get(key) if isinstance(data, dict) else None
+
+        def getter(data: Any) -> Any:
+            current = data
+            try:
+                for key, index in keys:
+                    if isinstance(current, dict):
+                        current = current[key]
+                    elif index is not None and isinstance(current, list):
+                        current = current[index]
+                    else:
+                        return None
+                return current
+            except (KeyError, IndexError, TypeError):
+                return None
+
+        return getter
+
+    def _apply_operator(
+        self,
+        field_value: Any,
+        operator_name: str,
+        expected_value: Any,
+        case_sensitive: bool = True,
+        operand: Optional[str] = None
+    ) -> bool:
         """Apply a comparison operator."""
         try:
+            # Fast path for string operators on string fields with a precomputed operand
+            if operand is not None and type(field_value) is str:
+                if not case_sensitive:
+                    field_value = field_value.lower()
+                if operator_name == "contains":
+                    return operand in field_value
+                elif operator_name == "not_contains":
+                    return operand not in field_value
+                elif operator_name == "starts_with":
+                    return field_value.startswith(operand)
+                else:
+                    return field_value.endswith(operand)
+
             # Handle None values
             if field_value is None:
                 if operator_name in ["is_null", "is_empty"]:
@@ -219,12 +375,8 @@ class DataFilterAction(BaseAction):
                 return not field_value or (isinstance(field_value, str) and field_value.strip() == "")
             elif operator_name == "not_empty":
                 return field_value and (not isinstance(field_value, str) or field_value.strip() != "")
-            elif operator_name == "length_equals":
-                return len(str(field_value)) == int(expected_value)
-            elif operator_name == "length_greater":
-                return len(str(field_value)) > int(expected_value)
-            elif operator_name == "length_less":
-                return len(str(field_value)) < int(expected_value)
+            elif operator_name in LENGTH_OPERATORS:
+                return self._compare_length(field_value, operator_name, expected_value)
             else:
                 logger.warning(f"Unknown operator: {operator_name}")
                 return False
@@ -233,6 +385,22 @@ class DataFilterAction(BaseAction):
             logger.warning(f"Error applying operator {operator_name}: {e}")
             return False
 
+    def _compare_length(self, field_value: Any, operator_name: str, expected_value: Any) -> bool:
+        """Compare the length of a value, measuring sized containers directly."""
+        if isinstance(field_value, (str, list, tuple, dict, set)):
+            length = len(field_value)
+        else:
+            length = len(str(field_value))
+
+        expected_length = expected_value if type(expected_value) is int else int(expected_value)
+
+        if operator_name == "length_equals":
+            return length == expected_length
+        elif operator_name == "length_greater":
+            return length > expected_length
+        else:
+            return length < expected_length
+
     def _compare_values(self, value1: Any, value2: Any, op_func) -> bool:
         """Compare two values with type conversion."""
         try:
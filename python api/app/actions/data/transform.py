@@ -5,18 +5,112 @@ It can convert between different data formats, restructure data, apply mappings,
 and perform various data transformation operations.
 """
 
+import ast
 import logging
 import json
 import csv
+import functools
 import io
-from typing import Any, Dict, Optional, List, Union
+import operator
+from typing import Any, Callable, Dict, Optional, List, Tuple, Union
 import re
+from xml.sax.saxutils import escape
 
 from ..base import BaseAction
 from ...core.context import ExecutionContext
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import yaml
+    # Prefer the libyaml-backed classes; they behave like SafeLoader and Dumper
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    _YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+except ImportError:  # PyYAML is optional; YAML payloads are passed through unparsed
+    yaml = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; CSV is parsed with the csv module
+    pa = None
+    pa_csv = None
+
 logger = logging.getLogger(__name__)
 
+# CSV payloads larger than this are handed to pyarrow's parser when available
+CSV_ARROW_THRESHOLD = 64 * 1024
+
+TEMPLATE_PLACEHOLDER_PATTERN = re.compile(r"\{([^}]+)\}")
+
+SUBSTRING_PATTERN = re.compile(r"substring\((\d+),(\d+)\)")
+
+# Field transformations that take no arguments
+VALUE_TRANSFORMS = {
+    "uppercase": lambda value: str(value).upper(),
+    "lowercase": lambda value: str(value).lower(),
+    "capitalize": lambda value: str(value).capitalize(),
+    "strip": lambda value: str(value).strip(),
+    "length": lambda value: len(str(value)),
+}
+
+ARITHMETIC_PATTERN = re.compile(r'^[\d\s\+\-\*\/\(\)\.]+$')
+
+# AST nodes allowed in compiled calculate expressions
+ARITHMETIC_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Pow, ast.UAdd, ast.USub
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_path(path: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """Split a dot-notation path into (key, list_index) pairs, caching the result."""
+    return tuple((key, int(key) if key.isdigit() else None) for key in path.split("."))
+
+
+def _json_loads(text: Any) -> Any:
+    """Parse JSON, preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity and integers wider than 64 bits,
+            # which the stdlib accepts; let json decide (and raise) instead
+            pass
+    return json.loads(text)
+
+
+def _json_dumps_indented(data: Any) -> str:
+    """Serialize to JSON indented by two spaces, preferring orjson."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # Types orjson cannot serialize get the stdlib's error message
+            pass
+    return json.dumps(data, indent=2)
+
+
+class _TemplateFields:
+    """Mapping view used by str.format_map for flat templates.
+
+    Values render with str(); unknown fields keep their placeholder.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    def __getitem__(self, key: str) -> str:
+        if key in self.data:
+            return str(self.data[key])
+        return "{" + key + "}"
+
 
 class DataTransformAction(BaseAction):
     """Action for transforming data structures and formats.
@@ -40,6 +134,30 @@ class DataTransformAction(BaseAction):
         self.delimiter = config.get("delimiter", ",")  # CSV delimiter
         self.include_headers = config.get("include_headers", True)  # For CSV output
 
+        # Mappings are fixed after construction, so resolve them into getters once
+        self._compiled_mappings = self._compile_mappings()
+        self._expression_cache: Dict[str, Optional[tuple]] = {}
+        self._template_getters = {
+            path: self._compile_path(path)
+            for path in set(TEMPLATE_PLACEHOLDER_PATTERN.findall(self.template or ""))
+        } if isinstance(self.template, str) else {}
+        # String input parser for input_format; other formats pass data through
+        self._input_parser = {
+            "json": _json_loads,
+            "csv": self._parse_csv,
+            "xml": self._parse_xml,
+            "yaml": self._parse_yaml,
+        }.get(self.input_format) if isinstance(self.input_format, str) else None
+        # Templates without placeholders render to themselves
+        self._template_is_static = isinstance(self.template, str) and not self._template_getters
+        # Templates whose placeholders are all plain top-level names, with no
+        # other braces, can be rendered by str.format_map in one C-level pass
+        self._template_is_flat = (
+            bool(self._template_getters)
+            and all(path.isidentifier() for path in self._template_getters)
+            and not any(brace in TEMPLATE_PLACEHOLDER_PATTERN.sub("", self.template) for brace in "{}")
+        )
+
     async def validate_config(self) -> bool:
         """Validate data transform action configuration."""
         valid_transform_types = ["map", "convert", "template", "calculate"]
@@ -92,37 +210,84 @@ class DataTransformAction(BaseAction):
 
     def _transform_map(self, data: Any) -> Any:
         """Transform data using field mappings."""
-        if not isinstance(data, (dict, list)):
-            return data
+        if isinstance(data, dict):
+            return self._transform_map_one(data)
 
         if isinstance(data, list):
-            return [self._transform_map(item) for item in data]
+            map_one = self._transform_map_one
+            return [map_one(item) if isinstance(item, dict) else self._transform_map(item) for item in data]
+
+        return data
 
+    def _transform_map_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the compiled field mappings to a single object."""
         result = {}
 
+        for output_field, getter, transform_func, default_value in self._compiled_mappings:
+            value = getter(item)
+
+            if transform_func:
+                value = self._apply_transformation(value, transform_func)
+
+            if value is None and default_value is not None:
+                value = default_value
+
+            result[output_field] = value
+
+        return result
+
+    def _compile_mappings(self) -> List[tuple]:
+        """Normalize field mappings into (output_field, getter, transform, default) tuples."""
+        if not isinstance(self.mappings, dict):
+            return []
+
+        compiled = []
         for output_field, mapping_config in self.mappings.items():
             if isinstance(mapping_config, str):
                 # Simple field mapping
-                result[output_field] = self._get_nested_value(data, mapping_config)
+                compiled.append((output_field, self._compile_path(mapping_config), None, None))
             elif isinstance(mapping_config, dict):
                 # Complex mapping with transformation
                 input_field = mapping_config.get("field", "")
-                transform_func = mapping_config.get("transform", "")
                 default_value = mapping_config.get("default", "")
-
-                value = self._get_nested_value(data, input_field) if input_field else data
-
-                if transform_func:
-                    value = self._apply_transformation(value, transform_func)
-
-                if value is None and default_value:
-                    value = default_value
-
-                result[output_field] = value
+                compiled.append((
+                    output_field,
+                    self._compile_path(input_field),
+                    mapping_config.get("transform", "") or None,
+                    default_value if default_value else None
+                ))
             else:
-                result[output_field] = mapping_config
+                # Constant value
+                compiled.append((output_field, lambda item, constant=mapping_config: constant, None, None))
 
-        return result
+        return compiled
+
+    def _compile_path(self, path: str) -> Callable[[Any], Any]:
+        """Compile a dot-notation path (list indices as digit keys) into a getter."""
+        if not path:
+            return lambda data: data
+
+        keys = _split_path(path)
+
+        if len(keys) == 1 and keys[0][1] is None:
+            key = keys[0][0]
+            return lambda data: data.get(key) if isinstance(data, dict) else None
+
+        def getter(data: Any) -> Any:
+            current = data
+            try:
+                for key, index in keys:
+                    if isinstance(current, dict):
+                        current = current[key]
+                    elif index is not None and isinstance(current, list):
+                        current = current[index]
+                    else:
+                        return None
+                return current
+            except (KeyError, IndexError, TypeError):
+                return None
+
+        return getter
 
     async def _transform_convert(self, data: Any) -> Any:
         """Convert data between different formats."""
@@ -130,7 +295,7 @@ class DataTransformAction(BaseAction):
         if self.input_format == "json" and not isinstance(data, (dict, list)):
             if isinstance(data, str):
                 try:
-                    data = json.loads(data)
+                    data = _json_loads(data)
                 except:
                     pass
 
@@ -151,72 +316,59 @@ class DataTransformAction(BaseAction):
 
     def _transform_template(self, data: Any) -> str:
         """Transform data using a template string."""
+        if self._template_is_static:
+            return self.template
+
         if not isinstance(data, dict):
             data = {"data": data}
 
-        result = self.template
+        if self._template_is_flat:
+            return self.template.format_map(_TemplateFields(data))
 
-        # Replace template variables
-        for key, value in data.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in result:
-                result = result.replace(placeholder, str(value))
+        getters = self._template_getters
 
-        # Replace nested properties
-        for match in re.finditer(r"\{([^}]+)\}", result):
+        def replace(match: re.Match) -> str:
             path = match.group(1)
-            value = self._get_nested_value(data, path)
-            if value is not None:
-                result = result.replace(f"{{{path}}}", str(value))
 
-        return result
+            # Top-level keys take precedence over nested lookups
+            if path in data:
+                return str(data[path])
+
+            value = getters[path](data)
+            return match.group(0) if value is None else str(value)
+
+        return TEMPLATE_PLACEHOLDER_PATTERN.sub(replace, self.template)
 
     def _transform_calculate(self, data: Any) -> Any:
         """Transform data using calculations and expressions."""
         if not isinstance(data, dict):
             return data
 
-        result = data.copy()
+        if not self.transformations:
+            return data
+
+        # Collect the computed fields and copy the input only if any were set
+        updates = {}
 
         for field_name, calc_config in self.transformations.items():
             if isinstance(calc_config, str):
                 # Simple expression
-                result[field_name] = self._evaluate_expression(calc_config, data)
+                updates[field_name] = self._evaluate_expression(calc_config, data)
             elif isinstance(calc_config, dict):
                 # Complex calculation
                 expression = calc_config.get("expression", "")
                 operation = calc_config.get("operation", "set")
 
                 if operation == "set":
-                    result[field_name] = self._evaluate_expression(expression, data)
+                    updates[field_name] = self._evaluate_expression(expression, data)
                 elif operation == "add":
-                    existing = result.get(field_name, 0)
-                    result[field_name] = existing + self._evaluate_expression(expression, data)
+                    existing = data.get(field_name, 0)
+                    updates[field_name] = existing + self._evaluate_expression(expression, data)
                 elif operation == "multiply":
-                    existing = result.get(field_name, 1)
-                    result[field_name] = existing * self._evaluate_expression(expression, data)
-
-        return result
+                    existing = data.get(field_name, 1)
+                    updates[field_name] = existing * self._evaluate_expression(expression, data)
 
-    def _get_nested_value(self, data: Any, path: str) -> Any:
-        """Get value from nested data structure using dot notation."""
-        if not path:
-            return data
-
-        keys = path.split(".")
-        current = data
-
-        try:
-            for key in keys:
-                if isinstance(current, dict):
-                    current = current[key]
-                elif isinstance(current, list) and key.isdigit():
-                    current = current[int(key)]
-                else:
-                    return None
-            return current
-        except (KeyError, IndexError, TypeError):
-            return None
+        return {**data, **updates} if updates else data
 
     def _apply_transformation(self, value: Any, transform_func: str) -> Any:
         """Apply a transformation function to a value."""
@@ -224,53 +376,62 @@ class DataTransformAction(BaseAction):
             return value
 
         try:
-            if transform_func == "uppercase":
-                return str(value).upper()
-            elif transform_func == "lowercase":
-                return str(value).lower()
-            elif transform_func == "capitalize":
-                return str(value).capitalize()
-            elif transform_func == "strip":
-                return str(value).strip()
-            elif transform_func.startswith("substring"):
-                # substring(start,end)
-                match = re.match(r"substring\((\d+),(\d+)\)", transform_func)
-                if match:
-                    start, end = int(match.group(1)), int(match.group(2))
-                    return str(value)[start:end]
-            elif transform_func == "length":
-                return len(str(value))
-            else:
-                return value
+            transform = VALUE_TRANSFORMS.get(transform_func)
+            if transform is not None:
+                return transform(value)
+
+            # substring(start,end)
+            match = SUBSTRING_PATTERN.match(transform_func)
+            if match:
+                start, end = int(match.group(1)), int(match.group(2))
+                return str(value)[start:end]
+
+            return value
         except Exception:
             return value
 
     async def _parse_input_data(self, data: Any) -> Any:
         """Parse input data based on format."""
-        if self.input_format == "json":
-            if isinstance(data, str):
-                return json.loads(data)
-            return data
-        elif self.input_format == "csv":
-            if isinstance(data, str):
-                return self._parse_csv(data)
-            return data
-        elif self.input_format == "xml":
-            if isinstance(data, str):
-                return self._parse_xml(data)
-            return data
-        elif self.input_format == "yaml":
-            if isinstance(data, str):
-                return self._parse_yaml(data)
-            return data
-        else:
-            return data
+        if self._input_parser is not None and isinstance(data, str):
+            return self._input_parser(data)
+        return data
 
     def _parse_csv(self, csv_data: str) -> List[Dict[str, Any]]:
         """Parse CSV data into list of dictionaries."""
+        if pa_csv is not None and len(csv_data) > CSV_ARROW_THRESHOLD:
+            rows = self._parse_csv_arrow(csv_data)
+            if rows is not None:
+                return rows
+
         reader = csv.DictReader(io.StringIO(csv_data), delimiter=self.delimiter)
         return list(reader)
 
+    def _parse_csv_arrow(self, csv_data: str) -> Optional[List[Dict[str, Any]]]:
+        """Parse CSV data with pyarrow, producing the same rows as csv.DictReader.
+
+        Returns None when the payload needs csv.DictReader's handling, e.g.
+        duplicate column names or rows with a different number of fields.
+        """
+        header = next(csv.reader(io.StringIO(csv_data), delimiter=self.delimiter), None)
+        if not header or len(set(header)) != len(header):
+            return None
+
+        try:
+            table = pa_csv.read_csv(
+                pa.BufferReader(csv_data.encode()),
+                parse_options=pa_csv.ParseOptions(delimiter=self.delimiter, newlines_in_values=True),
+                convert_options=pa_csv.ConvertOptions(
+                    # Keep every value a string, as csv.DictReader does
+                    column_types={name: pa.string() for name in header},
+                    strings_can_be_null=False,
+                    quoted_strings_can_be_null=False
+                )
+            )
+        except (pa.ArrowException, ValueError):
+            return None
+
+        return table.to_pylist()
+
     def _parse_xml(self, xml_data: str) -> Dict[str, Any]:
         """Parse XML data into dictionary."""
         # Simplified XML parsing - in production, use xml.etree.ElementTree
@@ -278,11 +439,9 @@ class DataTransformAction(BaseAction):
 
     def _parse_yaml(self, yaml_data: str) -> Any:
         """Parse YAML data."""
-        try:
-            import yaml
-            return yaml.safe_load(yaml_data)
-        except ImportError:
+        if yaml is None:
             return {"yaml_content": yaml_data, "parsed": False}
+        return yaml.load(yaml_data, Loader=_YAML_LOADER)
 
     def _convert_to_csv(self, data: Any) -> str:
         """Convert data to CSV format."""
@@ -298,48 +457,142 @@ class DataTransformAction(BaseAction):
             fieldnames = list(data[0].keys())
 
         output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=fieldnames, delimiter=self.delimiter)
+
+        if not fieldnames:
+            writer = csv.DictWriter(output, fieldnames=fieldnames, delimiter=self.delimiter)
+            if self.include_headers:
+                writer.writeheader()
+            writer.writerows(data)
+            return output.getvalue()
+
+        writer = csv.writer(output, delimiter=self.delimiter)
 
         if self.include_headers:
-            writer.writeheader()
+            writer.writerow(fieldnames)
+
+        field_set = data[0].keys()
+        if len(fieldnames) == 1:
+            key = fieldnames[0]
+            getter = lambda row: (row[key],)
+        else:
+            getter = operator.itemgetter(*fieldnames)
+
+        # Rows shaped like the first one skip csv.DictWriter's per-field lookups
+        if all(row.keys() == field_set for row in data):
+            writer.writerows(map(getter, data))
+            return output.getvalue()
+
+        def rows():
+            for row in data:
+                if row.keys() == field_set:
+                    yield getter(row)
+                else:
+                    yield self._csv_row_values(row, fieldnames, field_set)
 
-        for row in data:
-            writer.writerow(row)
+        writer.writerows(rows())
 
         return output.getvalue()
 
+    def _csv_row_values(self, row: Dict[str, Any], fieldnames: List[str], field_set) -> tuple:
+        """Order a row's values by fieldnames the way csv.DictWriter does."""
+        extra_fields = row.keys() - field_set
+        if extra_fields:
+            raise ValueError("dict contains fields not in fieldnames: "
+                             + ", ".join([repr(x) for x in extra_fields]))
+        return tuple(row.get(key, "") for key in fieldnames)
+
     def _convert_to_xml(self, data: Any) -> str:
         """Convert data to XML format."""
         # Simplified XML conversion - in production, use proper XML libraries
         if isinstance(data, dict):
-            xml_parts = []
+            xml_parts = ["<root>"]
+            append = xml_parts.append
             for key, value in data.items():
-                xml_parts.append(f"<{key}>{value}</{key}>")
-            return f"<root>{''.join(xml_parts)}</root>"
+                append(f"<{key}>{escape(str(value))}</{key}>")
+            append("</root>")
+            return "".join(xml_parts)
         else:
-            return f"<root>{data}</root>"
+            return f"<root>{escape(str(data))}</root>"
 
     def _convert_to_yaml(self, data: Any) -> str:
         """Convert data to YAML format."""
-        try:
-            import yaml
-            return yaml.dump(data, default_flow_style=False)
-        except ImportError:
-            return json.dumps(data, indent=2)
+        if yaml is None:
+            return _json_dumps_indented(data)
+        return yaml.dump(data, Dumper=_YAML_DUMPER, default_flow_style=False)
 
     def _evaluate_expression(self, expression: str, data: Dict[str, Any]) -> Any:
         """Safely evaluate a simple expression."""
-        # This is a very basic expression evaluator for simple calculations
-        # In production, you'd want a more robust solution
+        if expression in self._expression_cache:
+            compiled = self._expression_cache[expression]
+        else:
+            compiled = self._expression_cache[expression] = self._compile_expression(expression)
+
+        if compiled is None:
+            return self._evaluate_expression_text(expression, data)
+
+        code, names = compiled
         try:
-            # Replace field references with values
-            safe_expr = expression
-            for key, value in data.items():
-                if isinstance(value, (int, float)):
-                    safe_expr = safe_expr.replace(f"{{{key}}}", str(value))
+            values = {}
+            for key, name in names.items():
+                value = data.get(key)
+                if type(value) not in (int, float):
+                    return 0
+                values[name] = value
+
+            return eval(code, {"__builtins__": {}}, values)
+        except Exception:
+            return 0
+
+    def _compile_expression(self, expression: str) -> Optional[tuple]:
+        """Compile an arithmetic expression with {field} placeholders.
+
+        Returns ``(code, names)`` where ``names`` maps each referenced field to the
+        variable it is bound to, or None when the expression is not a plain
+        arithmetic expression over standalone placeholders.
+        """
+        if not isinstance(expression, str):
+            return None
+
+        if not ARITHMETIC_PATTERN.match(TEMPLATE_PLACEHOLDER_PATTERN.sub("0", expression)):
+            return None
+
+        names = {}
+
+        def bind(match: re.Match) -> str:
+            key = match.group(1)
+            if key not in names:
+                names[key] = f"_v{len(names)}"
+            return f" {names[key]} "
+
+        try:
+            tree = ast.parse(TEMPLATE_PLACEHOLDER_PATTERN.sub(bind, expression).strip(), mode="eval")
+        except SyntaxError:
+            return None
+
+        bound_names = set(names.values())
+        for node in ast.walk(tree):
+            if not isinstance(node, ARITHMETIC_NODES):
+                return None
+            if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+                return None
+            if isinstance(node, ast.Name) and node.id not in bound_names:
+                return None
+
+        return compile(tree, "<expression>", "eval"), names
+
+    def _evaluate_expression_text(self, expression: str, data: Dict[str, Any]) -> Any:
+        """Evaluate an expression by substituting field values into its text."""
+        # Used for expressions that only make sense textually, e.g. "{a}{b}"
+        try:
+            # Replace numeric field references with their values in one pass
+            def replace(match: re.Match) -> str:
+                value = data.get(match.group(1))
+                return str(value) if isinstance(value, (int, float)) else match.group(0)
+
+            safe_expr = TEMPLATE_PLACEHOLDER_PATTERN.sub(replace, expression)
 
             # Only allow basic arithmetic for security
-            if not re.match(r'^[\d\s\+\-\*\/\(\)\.]+$', safe_expr):
+            if not ARITHMETIC_PATTERN.match(safe_expr):
                 raise ValueError("Invalid expression")
 
             return eval(safe_expr, {"__builtins__": {}})
@@ -8,16 +8,58 @@ headers, and attachments.
 import logging
 import re
 import json
-from typing import Any, Dict, Optional, List, Union
+from typing import Any, Dict, Optional, List, Pattern, Tuple, Union
 from email import message_from_string
 from email.header import decode_header
 import base64
+import functools
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml is optional; tag stripping falls back to a regex
+    lxml_html = None
 
 from ..base import BaseAction
 from ...core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# Standard headers, extracted first and in this order
+STANDARD_HEADERS = (
+    "Subject", "From", "To", "Cc", "Bcc", "Reply-To",
+    "Date", "Message-ID", "In-Reply-To", "References",
+    "Content-Type", "User-Agent", "X-Mailer"
+)
+STANDARD_HEADER_SET = frozenset(STANDARD_HEADERS)
+# Lower-cased header name -> result key, for case-insensitive lookups
+STANDARD_HEADER_KEYS = {
+    name.lower(): name.lower().replace("-", "_") for name in STANDARD_HEADERS
+}
+
+# HTML bodies at least this large are stripped with lxml when it is installed
+LXML_HTML_THRESHOLD = 32 * 1024
+
+
+def _decode_header_value(header_value: str) -> str:
+    """Decode an RFC 2047 header value, returning it unchanged on failure."""
+    try:
+        decoded_parts = []
+        for part, encoding in decode_header(header_value):
+            if isinstance(part, bytes):
+                decoded_parts.append(part.decode(encoding or "utf-8", errors="replace"))
+            else:
+                decoded_parts.append(str(part))
+
+        return "".join(decoded_parts)
+    except Exception:
+        return header_value
+
+
+# Senders, subjects and content types repeat heavily across a mailbox batch
+_decode_header_cached = functools.lru_cache(maxsize=4096)(_decode_header_value)
+
 
 class ParseEmailAction(BaseAction):
     """Action for parsing and extracting data from email content.
@@ -38,6 +80,9 @@ class ParseEmailAction(BaseAction):
         self.patterns = config.get("patterns", {})  # Regex patterns for data extraction
         self.max_attachment_size = config.get("max_attachment_size", 10 * 1024 * 1024)  # 10MB
 
+        # Patterns are fixed after construction, so compile them once
+        self._compiled_patterns = self._compile_patterns()
+
     async def validate_config(self) -> bool:
         """Validate email parsing action configuration."""
         if self.extract_attachments and self.max_attachment_size <= 0:
@@ -91,20 +136,21 @@ class ParseEmailAction(BaseAction):
             if self.extract_headers:
                 result["headers"] = self._extract_headers(msg)
 
-            # Extract body
+            # Walk the message parts once for body, attachments and metadata
+            body, attachments, has_attachments = self._process_parts(msg)
+
             if self.extract_body:
-                result["body"] = self._extract_body(msg)
+                result["body"] = body
 
-            # Extract attachments
             if self.extract_attachments:
-                result["attachments"] = self._extract_attachments(msg)
+                result["attachments"] = attachments
 
             # Extract basic metadata
             result["metadata"] = {
                 "message_id": msg.get("Message-ID", "").strip("<>"),
                 "date": msg.get("Date", ""),
                 "size": len(raw_email),
-                "has_attachments": self._has_attachments(msg)
+                "has_attachments": has_attachments
             }
 
             return result
@@ -117,128 +163,127 @@ class ParseEmailAction(BaseAction):
         """Extract email headers."""
         headers = {}
 
-        # Standard headers
-        header_fields = [
-            "Subject", "From", "To", "Cc", "Bcc", "Reply-To",
-            "Date", "Message-ID", "In-Reply-To", "References",
-            "Content-Type", "User-Agent", "X-Mailer"
-        ]
-
-        for field in header_fields:
-            value = msg.get(field, "")
+        # Single pass over the headers; standard headers take their first
+        # occurrence, matched case-insensitively like msg.get()
+        standard = {}
+        custom = []
+        for header_name, header_value in msg.items():
+            lower_name = header_name.lower()
+            if lower_name in STANDARD_HEADER_KEYS and lower_name not in standard:
+                standard[lower_name] = header_value
+            if header_name not in STANDARD_HEADER_SET:
+                custom.append((lower_name, header_value))
+
+        for lower_name, key in STANDARD_HEADER_KEYS.items():
+            value = standard.get(lower_name)
             if value:
-                headers[field.lower().replace("-", "_")] = self._decode_header(value)
+                headers[key] = self._decode_header(value)
 
         # Extract additional custom headers
-        for header_name, header_value in msg.items():
-            if header_name not in header_fields:
-                headers[header_name.lower().replace("-", "_")] = self._decode_header(header_value)
+        for lower_name, header_value in custom:
+            headers[lower_name.replace("-", "_")] = self._decode_header(header_value)
 
         return headers
 
-    def _extract_body(self, msg) -> Dict[str, Any]:
-        """Extract email body content."""
+    def _process_parts(self, msg) -> Tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
+        """Extract body, attachments and the attachment flag in one walk."""
         body = {}
+        attachments = []
+        has_attachments = False
 
-        if msg.is_multipart():
-            # Handle multipart messages
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition", ""))
+        if not msg.is_multipart():
+            # Handle simple messages
+            if self.extract_body:
+                payload = msg.get_payload(decode=True)
+                if payload:
+                    charset = msg.get_content_charset() or "utf-8"
+                    if msg.get_content_type() == "text/html" and self.body_format in ["html", "both"]:
+                        body["html"] = payload.decode(charset, errors="replace")
+                    elif self.body_format in ["text", "both"]:
+                        body["text"] = payload.decode(charset, errors="replace")
+            return body, attachments, has_attachments
 
-                # Skip attachments
-                if "attachment" in content_disposition:
-                    continue
+        want_text = self.extract_body and self.body_format in ["text", "both"]
+        want_html = self.extract_body and self.body_format in ["html", "both"]
 
-                if content_type == "text/plain" and (self.body_format in ["text", "both"]):
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        charset = part.get_content_charset() or "utf-8"
-                        body["text"] = payload.decode(charset, errors="replace")
+        for part in msg.walk():
+            content_disposition = str(part.get("Content-Disposition", ""))
 
-                elif content_type == "text/html" and (self.body_format in ["html", "both"]):
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        charset = part.get_content_charset() or "utf-8"
-                        body["html"] = payload.decode(charset, errors="replace")
-        else:
-            # Handle simple messages
-            payload = msg.get_payload(decode=True)
-            if payload:
-                charset = msg.get_content_charset() or "utf-8"
-                if msg.get_content_type() == "text/html" and self.body_format in ["html", "both"]:
-                    body["html"] = payload.decode(charset, errors="replace")
-                elif self.body_format in ["text", "both"]:
+            if "attachment" in content_disposition:
+                has_attachments = True
+                if self.extract_attachments:
+                    attachment = self._extract_attachment(part)
+                    if attachment:
+                        attachments.append(attachment)
+                continue
+
+            content_type = part.get_content_type()
+            if content_type == "text/plain" and want_text:
+                payload = part.get_payload(decode=True)
+                if payload:
+                    charset = part.get_content_charset() or "utf-8"
                     body["text"] = payload.decode(charset, errors="replace")
 
-        return body
+            elif content_type == "text/html" and want_html:
+                payload = part.get_payload(decode=True)
+                if payload:
+                    charset = part.get_content_charset() or "utf-8"
+                    body["html"] = payload.decode(charset, errors="replace")
 
-    def _extract_attachments(self, msg) -> List[Dict[str, Any]]:
-        """Extract email attachments."""
-        attachments = []
+        return body, attachments, has_attachments
+
+    def _extract_attachment(self, part) -> Optional[Dict[str, Any]]:
+        """Extract a single attachment part, or None if it should be skipped."""
+        filename = part.get_filename()
+        if not filename:
+            return None
+
+        # Decode filename if necessary
+        filename = self._decode_header(filename)
+
+        # Reject oversized base64 attachments before decoding them; the
+        # estimate ignores line breaks and padding so it never overshoots
+        raw_payload = part.get_payload()
+        transfer_encoding = str(part.get("Content-Transfer-Encoding", "")).strip().lower()
+        if isinstance(raw_payload, str) and transfer_encoding == "base64":
+            encoded_size = len(raw_payload) - raw_payload.count("\n") - raw_payload.count("\r")
+            if encoded_size * 3 // 4 - 2 > self.max_attachment_size:
+                return None
 
-        if msg.is_multipart():
-            for part in msg.walk():
-                content_disposition = str(part.get("Content-Disposition", ""))
-
-                if "attachment" in content_disposition:
-                    filename = part.get_filename()
-                    if filename:
-                        # Decode filename if necessary
-                        filename = self._decode_header(filename)
-
-                        # Get attachment size
-                        payload = part.get_payload(decode=True)
-                        if payload and len(payload) <= self.max_attachment_size:
-                            attachments.append({
-                                "filename": filename,
-                                "content_type": part.get_content_type(),
-                                "size": len(payload),
-                                "content": base64.b64encode(payload).decode("utf-8")
-                            })
-
-        return attachments
-
-    def _has_attachments(self, msg) -> bool:
-        """Check if email has attachments."""
-        if msg.is_multipart():
-            for part in msg.walk():
-                content_disposition = str(part.get("Content-Disposition", ""))
-                if "attachment" in content_disposition:
-                    return True
-        return False
+        # Get attachment size
+        payload = part.get_payload(decode=True)
+        if not payload or len(payload) > self.max_attachment_size:
+            return None
+
+        return {
+            "filename": filename,
+            "content_type": part.get_content_type(),
+            "size": len(payload),
+            "content": base64.b64encode(payload).decode("ascii")
+        }
 
     def _decode_header(self, header_value: str) -> str:
         """Decode email header with proper encoding handling."""
-        try:
-            decoded_parts = decode_header(header_value)
-            decoded_string = ""
+        if isinstance(header_value, str):
+            return _decode_header_cached(header_value)
+        return _decode_header_value(header_value)
 
-            for part, encoding in decoded_parts:
-                if isinstance(part, bytes):
-                    decoded_string += part.decode(encoding or "utf-8", errors="replace")
-                else:
-                    decoded_string += str(part)
-
-            return decoded_string
-        except Exception:
-            return header_value
+    def _strip_html(self, html: str) -> str:
+        """Remove HTML tags, using lxml's C parser for large bodies."""
+        if lxml_html is not None and len(html) >= LXML_HTML_THRESHOLD:
+            try:
+                return lxml_html.fromstring(html).text_content()
+            except (ValueError, TypeError, lxml_html.etree.LxmlError):
+                pass
 
-    def _extract_structured_data(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract structured data using regex patterns."""
-        structured_data = {}
+        return HTML_TAG_PATTERN.sub("", html)
 
-        # Get text content for pattern matching
-        text_content = ""
-        if "body" in parsed_data:
-            if "text" in parsed_data["body"]:
-                text_content += parsed_data["body"]["text"]
-            if "html" in parsed_data["body"]:
-                # Remove HTML tags for pattern matching
-                html_content = re.sub(r"<[^>]+>", "", parsed_data["body"]["html"])
-                text_content += " " + html_content
+    def _compile_patterns(self) -> List[Tuple[str, Pattern]]:
+        """Compile the configured extraction patterns, skipping invalid ones."""
+        if not isinstance(self.patterns, dict):
+            return []
 
-        # Apply patterns
+        compiled = []
         for field_name, pattern_config in self.patterns.items():
             if isinstance(pattern_config, str):
                 # Simple pattern
@@ -251,17 +296,40 @@ class ParseEmailAction(BaseAction):
                 continue
 
             try:
-                compiled_pattern = re.compile(pattern, flags)
-                match = compiled_pattern.search(text_content)
-
-                if match:
-                    if match.groups():
-                        structured_data[field_name] = match.groups()[0] if len(match.groups()) == 1 else list(match.groups())
-                    else:
-                        structured_data[field_name] = match.group()
-            except re.error as e:
+                compiled.append((field_name, re.compile(pattern, flags)))
+            except (re.error, TypeError) as e:
                 logger.warning(f"Invalid regex pattern for {field_name}: {e}")
 
+        return compiled
+
+    def _extract_structured_data(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract structured data using regex patterns."""
+        structured_data = {}
+
+        # Get text content for pattern matching
+        text_content = ""
+        body = parsed_data.get("body")
+        if body:
+            parts = []
+            if "text" in body:
+                parts.append(body["text"])
+            if "html" in body:
+                # Remove HTML tags for pattern matching
+                if not parts:
+                    parts.append("")
+                parts.append(self._strip_html(body["html"]))
+            text_content = " ".join(parts)
+
+        # Apply patterns
+        for field_name, compiled_pattern in self._compiled_patterns:
+            match = compiled_pattern.search(text_content)
+
+            if match:
+                if match.groups():
+                    structured_data[field_name] = match.groups()[0] if len(match.groups()) == 1 else list(match.groups())
+                else:
+                    structured_data[field_name] = match.group()
+
         return structured_data
 
     async def test_connection(self) -> bool:
@@ -4,20 +4,113 @@ This module implements an action for sending emails through various providers
 including SMTP, SendGrid, Mailgun, and other email service APIs.
 """
 
+import base64
 import logging
-from typing import Any, Dict, Optional, List
+import mimetypes
+import os
+from typing import Any, Dict, Optional, List, Tuple
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
+import asyncio
+import hashlib
+import json
 import smtplib
 import ssl
+import threading
+import uuid
 
-from ..base import BaseAction
+try:
+    import aiohttp
+except ImportError:  # only needed for the SendGrid and Mailgun providers
+    aiohttp = None
+
+from ..base import BaseAction, create_http_connector
 from ...core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+# Mailgun accepts at most this many recipients per batch send
+MAILGUN_BATCH_SIZE = 1000
+
+
+class EmailAPIError(Exception):
+    """Raised when an email provider's API rejects a request."""
+    def __init__(self, provider: str, status: int, details: Any):
+        self.provider = provider
+        self.status = status
+        self.details = details
+        super().__init__(f"{provider} API error: {details}")
+
+
+async def _read_error_details(response) -> Any:
+    """Read an error response as JSON, falling back to its text."""
+    body = await response.read()
+    try:
+        return json.loads(body)
+    except ValueError:
+        # HTML error pages and other non-JSON bodies are returned as text
+        return body.decode("utf-8", errors="replace")
+
+
+# Input/output schemas are static, so they are built once and shared
+INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "to": {
+            "type": "array",
+            "items": {"type": "string", "format": "email"},
+            "description": "Recipient email addresses"
+        },
+        "subject": {"type": "string", "description": "Email subject"},
+        "body": {"type": "string", "description": "Email body content"},
+        "cc": {
+            "type": "array",
+            "items": {"type": "string", "format": "email"},
+            "description": "CC recipient email addresses"
+        },
+        "bcc": {
+            "type": "array",
+            "items": {"type": "string", "format": "email"},
+            "description": "BCC recipient email addresses"
+        },
+        "content_type": {
+            "type": "string",
+            "enum": ["text", "html"],
+            "default": "text",
+            "description": "Email content type"
+        },
+        "attachments": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "filename": {"type": "string"},
+                    "content": {"type": "string", "description": "Base64-encoded content"},
+                    "path": {"type": "string", "description": "File under the configured attachment_root to attach instead of inline content"},
+                    "content_type": {"type": "string"}
+                }
+            },
+            "description": "Email attachments"
+        }
+    },
+    "required": ["to", "subject", "body"]
+}
+
+OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "success": {"type": "boolean"},
+        "message_id": {"type": "string"},
+        "provider": {"type": "string"},
+        "recipients": {"type": "integer"},
+        "attachments_count": {"type": "integer"},
+        "error": {"type": "string"}
+    },
+    "required": ["success"]
+}
+
 
 class SendEmailAction(BaseAction):
     """Action for sending emails through various providers.
@@ -41,6 +134,24 @@ class SendEmailAction(BaseAction):
         self.use_tls = config.get("use_tls", True)
         self.from_email = config.get("from_email", "")
         self.from_name = config.get("from_name", "")
+        # Sender header shared by SMTP and Mailgun messages
+        self._from_header = f"{self.from_name} <{self.from_email}>" if self.from_name else self.from_email
+
+        # Directory that attachment "path" entries must resolve inside; file
+        # attachments are refused when it is not configured
+        attachment_root = config.get("attachment_root", "")
+        self.attachment_root = os.path.realpath(attachment_root) if attachment_root else ""
+
+        self.smtp_pool_size = config.get("smtp_pool_size", 5)  # 0 disables pooling
+        self.smtp_max_messages = config.get("smtp_max_messages_per_connection", 100)
+
+        # Shared HTTP session for API providers, created on first use
+        self._session = None
+        # Idle authenticated SMTP connections as (server, messages_sent).
+        # smtplib blocks, so connections are used from executor threads.
+        self._smtp_pool: List[Tuple[smtplib.SMTP, int]] = []
+        self._smtp_pool_lock = threading.Lock()
+        self._ssl_context: Optional[ssl.SSLContext] = None
 
     async def validate_config(self) -> bool:
         """Validate email action configuration."""
@@ -111,6 +222,84 @@ class SendEmailAction(BaseAction):
                 "provider": self.provider
             }
 
+    async def send_batch(
+        self,
+        messages: List[Dict[str, Any]],
+        context: ExecutionContext
+    ) -> List[Dict[str, Any]]:
+        """Send several messages, batching shared Mailgun content.
+
+        Each message takes the same fields as execute() input, plus an
+        optional "variables" dict for Mailgun recipient-variables. With the
+        Mailgun provider, messages that share subject, body and content type
+        (and have no cc, bcc or attachments) go out in one API request per
+        MAILGUN_BATCH_SIZE recipients. An address shared by several of those
+        messages gets each of them in a separate request, since Mailgun keys
+        recipient-variables by address. Everything else is sent one by one.
+
+        Returns:
+            One execute()-style result per message, in order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        batches: Dict[tuple, List[tuple]] = {}
+
+        for index, message in enumerate(messages):
+            to_emails = message.get("to", [])
+            batchable = (
+                self.provider == "mailgun"
+                and isinstance(to_emails, list) and to_emails
+                and message.get("subject")
+                and not (message.get("cc") or message.get("bcc") or message.get("attachments"))
+            )
+            if not batchable:
+                results[index] = await self.execute(message, context)
+                continue
+
+            key = (message["subject"], message.get("body", ""), message.get("content_type", "text"))
+            batches.setdefault(key, []).append((index, to_emails, message.get("variables") or {}))
+
+        for (subject, body, content_type), entries in batches.items():
+            # The n-th message sent to an address goes in round n, so no
+            # request lists the same address twice
+            rounds: List[List[tuple]] = []
+            occurrences: Dict[str, int] = {}
+            for index, to_emails, variables in entries:
+                for email in dict.fromkeys(to_emails):
+                    round_number = occurrences.get(email, 0)
+                    occurrences[email] = round_number + 1
+                    if round_number == len(rounds):
+                        rounds.append([])
+                    rounds[round_number].append((index, email, variables))
+
+            chunks = [
+                recipients[start:start + MAILGUN_BATCH_SIZE]
+                for recipients in rounds
+                for start in range(0, len(recipients), MAILGUN_BATCH_SIZE)
+            ]
+            for chunk in chunks:
+                # Always send recipient variables so recipients don't see each other
+                recipient_variables = {email: variables for _, email, variables in chunk}
+                try:
+                    sent = await self._send_via_mailgun(
+                        list(recipient_variables), subject, body,
+                        content_type=content_type,
+                        recipient_variables=recipient_variables
+                    )
+                    result = {"success": True, "message_id": sent.get("message_id")}
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+
+                for index in {index for index, _, _ in chunk}:
+                    if results[index] is None or results[index]["success"]:
+                        results[index] = {
+                            **result,
+                            "provider": self.provider,
+                            "recipients": len(messages[index]["to"]),
+                            "attachments_count": 0
+                        }
+
+        return results
+
     async def _send_via_smtp(
         self,
         to_emails: List[str],
@@ -128,24 +317,16 @@ class SendEmailAction(BaseAction):
                 to_emails, subject, body, cc_emails, bcc_emails, attachments, content_type
             )
 
-            # Create SMTP connection
-            if self.use_tls:
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                server.starttls(context=ssl.create_default_context())
-            else:
-                server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=ssl.create_default_context())
-
-            # Login
-            server.login(self.username, self.password)
-
-            # Send email
+            # Send email; serialize once and reuse it for the message ID
+            raw_message = msg.as_string()
             all_recipients = to_emails + (cc_emails or []) + (bcc_emails or [])
-            server.sendmail(self.from_email, all_recipients, msg.as_string())
 
-            # Close connection
-            server.quit()
+            # smtplib does blocking socket I/O, so keep it off the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._smtp_sendmail, all_recipients, raw_message)
 
-            return {"message_id": f"smtp_{hash(msg.as_string())}"}
+            digest = hashlib.blake2b(raw_message.encode("utf-8", "surrogateescape"), digest_size=8).hexdigest()
+            return {"message_id": f"smtp_{digest}"}
 
         except Exception as e:
             logger.error(f"SMTP send failed: {e}")
@@ -162,9 +343,10 @@ class SendEmailAction(BaseAction):
         content_type: str = "text"
     ) -> Dict[str, Any]:
         """Send email via SendGrid API."""
-        try:
-            import aiohttp
+        if aiohttp is None:
+            raise Exception("aiohttp is required for SendGrid API")
 
+        try:
             # Prepare SendGrid API payload
             payload = {
                 "personalizations": [{
@@ -186,10 +368,7 @@ class SendEmailAction(BaseAction):
 
             # Add attachments
             if attachments:
-                payload["attachments"] = []
-                for attachment in attachments:
-                    # This would need implementation for base64 encoding
-                    pass
+                payload["attachments"] = [self._sendgrid_attachment(attachment) for attachment in attachments]
 
             # Send via SendGrid API
             headers = {
@@ -197,21 +376,18 @@ class SendEmailAction(BaseAction):
                 "Content-Type": "application/json"
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.sendgrid.com/v3/mail/send",
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status != 202:
-                        error_data = await response.json()
-                        raise Exception(f"SendGrid API error: {error_data}")
+            session = await self._get_session()
+            async with session.post(
+                "https://api.sendgrid.com/v3/mail/send",
+                headers=headers,
+                json=payload
+            ) as response:
+                if response.status != 202:
+                    raise EmailAPIError("SendGrid", response.status, await _read_error_details(response))
 
-                    message_id = response.headers.get("X-Message-Id", f"sendgrid_{hash(str(payload))}")
-                    return {"message_id": message_id}
+                message_id = response.headers.get("X-Message-Id", f"sendgrid_{uuid.uuid4().hex}")
+                return {"message_id": message_id}
 
-        except ImportError:
-            raise Exception("aiohttp is required for SendGrid API")
         except Exception as e:
             logger.error(f"SendGrid send failed: {e}")
             raise
@@ -224,15 +400,22 @@ class SendEmailAction(BaseAction):
         cc_emails: List[str] = None,
         bcc_emails: List[str] = None,
         attachments: List[Dict[str, Any]] = None,
-        content_type: str = "text"
+        content_type: str = "text",
+        recipient_variables: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
-        """Send email via Mailgun API."""
-        try:
-            import aiohttp
+        """Send email via Mailgun API.
 
+        When recipient_variables is given, Mailgun sends each recipient an
+        individual copy, personalized with their entry.
+        """
+        if aiohttp is None:
+            raise Exception("aiohttp is required for Mailgun API")
+
+        opened_files = []
+        try:
             # Prepare form data
             data = aiohttp.FormData()
-            data.add_field("from", f"{self.from_name} <{self.from_email}>" if self.from_name else self.from_email)
+            data.add_field("from", self._from_header)
             data.add_field("to", ",".join(to_emails))
             data.add_field("subject", subject)
 
@@ -245,31 +428,149 @@ class SendEmailAction(BaseAction):
                 data.add_field("cc", ",".join(cc_emails))
             if bcc_emails:
                 data.add_field("bcc", ",".join(bcc_emails))
+            if recipient_variables is not None:
+                data.add_field("recipient-variables", json.dumps(recipient_variables))
 
-            # Add attachments
+            # Add attachments; files are passed as open handles so aiohttp
+            # streams them from disk instead of buffering them
             if attachments:
                 for attachment in attachments:
-                    # This would need implementation for file handling
-                    pass
+                    filename, attachment_type = self._attachment_info(attachment)
+                    path = self._attachment_path(attachment)
+                    if path:
+                        file_obj = open(path, "rb")
+                        opened_files.append(file_obj)
+                        data.add_field("attachment", file_obj, filename=filename, content_type=attachment_type)
+                    else:
+                        data.add_field(
+                            "attachment",
+                            base64.b64decode(attachment.get("content", "")),
+                            filename=filename,
+                            content_type=attachment_type
+                        )
 
             # Send via Mailgun API
             auth = aiohttp.BasicAuth("api", self.api_key)
             url = f"https://api.mailgun.net/v3/{self.domain}/messages"
 
-            async with aiohttp.ClientSession(auth=auth) as session:
-                async with session.post(url, data=data) as response:
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Mailgun API error: {error_data}")
+            session = await self._get_session()
+            async with session.post(url, data=data, auth=auth) as response:
+                if response.status != 200:
+                    raise EmailAPIError("Mailgun", response.status, await _read_error_details(response))
 
-                    result = await response.json()
-                    return {"message_id": result.get("id", f"mailgun_{hash(str(data))}")}
+                result = await response.json()
+                return {"message_id": result.get("id", f"mailgun_{uuid.uuid4().hex}")}
 
-        except ImportError:
-            raise Exception("aiohttp is required for Mailgun API")
         except Exception as e:
             logger.error(f"Mailgun send failed: {e}")
             raise
+        finally:
+            for file_obj in opened_files:
+                file_obj.close()
+
+    async def _get_session(self):
+        """Get the shared aiohttp session, creating it on first use.
+
+        Reusing one session keeps connections to the provider APIs alive
+        between sends. Auth is passed per request so SendGrid and Mailgun
+        can share it.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=create_http_connector())
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session and pooled SMTP connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+        if self._smtp_pool:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._close_smtp_pool)
+
+    def _close_smtp_pool(self) -> None:
+        """Quit every idle pooled SMTP connection."""
+        with self._smtp_pool_lock:
+            pool, self._smtp_pool = self._smtp_pool, []
+        for server, _ in pool:
+            self._close_smtp_connection(server)
+
+    def _smtp_sendmail(self, recipients: List[str], raw_message: str) -> None:
+        """Send a serialized message over a pooled SMTP connection (blocking)."""
+        server, sent = self._checkout_smtp_connection()
+        try:
+            server.sendmail(self.from_email, recipients, raw_message)
+        except smtplib.SMTPServerDisconnected:
+            self._close_smtp_connection(server)
+            if not sent:
+                raise
+            # The pooled connection went stale while idle; retry on a new one
+            server, sent = self._open_smtp_connection(), 0
+            try:
+                server.sendmail(self.from_email, recipients, raw_message)
+            except Exception:
+                self._close_smtp_connection(server)
+                raise
+        except Exception:
+            self._close_smtp_connection(server)
+            raise
+
+        self._checkin_smtp_connection(server, sent + 1)
+
+    def _smtp_noop(self) -> None:
+        """Check a pooled SMTP connection with NOOP (blocking)."""
+        server, sent = self._checkout_smtp_connection()
+        try:
+            server.noop()
+        except Exception:
+            self._close_smtp_connection(server)
+            raise
+        self._checkin_smtp_connection(server, sent)
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """Get the SSL context for SMTP, loading the CA bundle only once."""
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    def _open_smtp_connection(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        if self.use_tls:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+            server.starttls(context=self._get_ssl_context())
+        else:
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=self._get_ssl_context())
+
+        try:
+            server.login(self.username, self.password)
+        except Exception:
+            self._close_smtp_connection(server)
+            raise
+        return server
+
+    def _checkout_smtp_connection(self) -> Tuple[smtplib.SMTP, int]:
+        """Take an idle pooled SMTP connection, or open a new one."""
+        with self._smtp_pool_lock:
+            if self._smtp_pool:
+                return self._smtp_pool.pop()
+        return self._open_smtp_connection(), 0
+
+    def _checkin_smtp_connection(self, server: smtplib.SMTP, sent: int) -> None:
+        """Return a connection to the pool, or quit it once it is used up."""
+        if sent < self.smtp_max_messages:
+            with self._smtp_pool_lock:
+                if len(self._smtp_pool) < self.smtp_pool_size:
+                    self._smtp_pool.append((server, sent))
+                    return
+        self._close_smtp_connection(server)
+
+    def _close_smtp_connection(self, server: smtplib.SMTP) -> None:
+        """Quit an SMTP connection, dropping it if the server is gone."""
+        try:
+            server.quit()
+        except Exception:
+            server.close()
 
     def _create_email_message(
         self,
@@ -283,7 +584,7 @@ class SendEmailAction(BaseAction):
     ) -> MIMEMultipart:
         """Create MIME email message."""
         msg = MIMEMultipart()
-        msg["From"] = f"{self.from_name} <{self.from_email}>" if self.from_name else self.from_email
+        msg["From"] = self._from_header
         msg["To"] = ", ".join(to_emails)
         msg["Subject"] = subject
 
@@ -303,42 +604,101 @@ class SendEmailAction(BaseAction):
         # Add attachments
         if attachments:
             for attachment in attachments:
-                # This would need implementation for file attachment
-                pass
+                msg.attach(self._create_attachment_part(attachment))
 
         return msg
 
+    def _attachment_info(self, attachment: Dict[str, Any]) -> Tuple[str, str]:
+        """Get an attachment's filename and content type."""
+        path = attachment.get("path")
+        filename = attachment.get("filename") or (os.path.basename(path) if path else "attachment")
+        content_type = (
+            attachment.get("content_type")
+            or mimetypes.guess_type(filename)[0]
+            or "application/octet-stream"
+        )
+        return filename, content_type
+
+    def _attachment_path(self, attachment: Dict[str, Any]) -> Optional[str]:
+        """Resolve an attachment's "path", which must lie inside attachment_root.
+
+        Paths come from workflow input, so symlinks and ".." are resolved
+        before the check to keep arbitrary server files from being sent.
+        """
+        path = attachment.get("path")
+        if not path:
+            return None
+
+        if not self.attachment_root:
+            raise ValueError("File attachments require attachment_root to be configured")
+
+        resolved = os.path.realpath(os.path.join(self.attachment_root, path))
+        if os.path.commonpath([resolved, self.attachment_root]) != self.attachment_root:
+            raise ValueError(f"Attachment path is outside attachment_root: {path}")
+        return resolved
+
+    def _create_attachment_part(self, attachment: Dict[str, Any]) -> MIMEBase:
+        """Create the MIME part for an attachment."""
+        filename, content_type = self._attachment_info(attachment)
+        maintype, _, subtype = content_type.partition("/")
+        part = MIMEBase(maintype, subtype or "octet-stream")
+
+        path = self._attachment_path(attachment)
+        if path:
+            with open(path, "rb") as file_obj:
+                part.set_payload(file_obj.read())
+            encoders.encode_base64(part)
+        else:
+            # Inline content is already base64, so re-wrap it to MIME line
+            # length instead of decoding and encoding it again
+            content = "".join(str(attachment.get("content", "")).split())
+            part.set_payload("\n".join(content[i:i + 76] for i in range(0, len(content), 76)))
+            part["Content-Transfer-Encoding"] = "base64"
+
+        part.add_header("Content-Disposition", "attachment", filename=filename)
+        return part
+
+    def _sendgrid_attachment(self, attachment: Dict[str, Any]) -> Dict[str, str]:
+        """Build a SendGrid attachment object."""
+        filename, content_type = self._attachment_info(attachment)
+
+        path = self._attachment_path(attachment)
+        if path:
+            with open(path, "rb") as file_obj:
+                content = base64.b64encode(file_obj.read()).decode("ascii")
+        else:
+            content = "".join(str(attachment.get("content", "")).split())
+
+        return {
+            "content": content,
+            "filename": filename,
+            "type": content_type,
+            "disposition": "attachment"
+        }
+
     async def test_connection(self) -> bool:
         """Test email provider connection."""
         try:
             if self.provider == "smtp":
                 # Test SMTP connection
-                if self.use_tls:
-                    server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                    server.starttls(context=ssl.create_default_context())
-                else:
-                    server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=ssl.create_default_context())
-
-                server.login(self.username, self.password)
-                server.quit()
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._smtp_noop)
                 return True
 
             elif self.provider == "sendgrid":
                 # Test SendGrid API
-                import aiohttp
                 headers = {"Authorization": f"Bearer {self.api_key}"}
-                async with aiohttp.ClientSession() as session:
-                    async with session.get("https://api.sendgrid.com/v3/user/account", headers=headers) as response:
-                        return response.status == 200
+                session = await self._get_session()
+                async with session.get("https://api.sendgrid.com/v3/user/account", headers=headers) as response:
+                    return response.status == 200
 
             elif self.provider == "mailgun":
                 # Test Mailgun API
-                import aiohttp
                 auth = aiohttp.BasicAuth("api", self.api_key)
                 url = f"https://api.mailgun.net/v3/domains/{self.domain}"
-                async with aiohttp.ClientSession(auth=auth) as session:
-                    async with session.get(url) as response:
-                        return response.status == 200
+                session = await self._get_session()
+                async with session.get(url, auth=auth) as response:
+                    return response.status == 200
 
             return True
 
@@ -348,59 +708,8 @@ class SendEmailAction(BaseAction):
 
     def get_input_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action input."""
-        return {
-            "type": "object",
-            "properties": {
-                "to": {
-                    "type": "array",
-                    "items": {"type": "string", "format": "email"},
-                    "description": "Recipient email addresses"
-                },
-                "subject": {"type": "string", "description": "Email subject"},
-                "body": {"type": "string", "description": "Email body content"},
-                "cc": {
-                    "type": "array",
-                    "items": {"type": "string", "format": "email"},
-                    "description": "CC recipient email addresses"
-                },
-                "bcc": {
-                    "type": "array",
-                    "items": {"type": "string", "format": "email"},
-                    "description": "BCC recipient email addresses"
-                },
-                "content_type": {
-                    "type": "string",
-                    "enum": ["text", "html"],
-                    "default": "text",
-                    "description": "Email content type"
-                },
-                "attachments": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "filename": {"type": "string"},
-                            "content": {"type": "string"},
-                            "content_type": {"type": "string"}
-                        }
-                    },
-                    "description": "Email attachments"
-                }
-            },
-            "required": ["to", "subject", "body"]
-        }
+        return INPUT_SCHEMA
 
     def get_output_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action output."""
-        return {
-            "type": "object",
-            "properties": {
-                "success": {"type": "boolean"},
-                "message_id": {"type": "string"},
-                "provider": {"type": "string"},
-                "recipients": {"type": "integer"},
-                "attachments_count": {"type": "integer"},
-                "error": {"type": "string"}
-            },
-            "required": ["success"]
-        }
+        return OUTPUT_SCHEMA
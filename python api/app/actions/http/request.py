@@ -5,15 +5,53 @@ and web services. It supports all standard HTTP methods with full configuration
 options for headers, authentication, timeouts, and response handling.
 """
 
+import asyncio
+import base64
 import logging
 from typing import Any, Dict, Optional, Union
 import json
+import re
+import ssl
+import time
+
+try:
+    import aiohttp
+except ImportError:  # checked when a request is made
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; JSON responses use aiohttp's decoder
+    orjson = None
 
 from ..base import HttpAction
 from ...core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+URL_PARAM_PATTERN = re.compile(r"\{([^}]+)\}")
+
+# Content types aiohttp's response.json() accepts
+JSON_CONTENT_TYPE_PATTERN = re.compile(r"^application/(?:[\w.+-]+?\+)?json")
+
+# The output schema is static, so it is built once and shared
+OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "success": {"type": "boolean"},
+        "status_code": {"type": "integer"},
+        "headers": {"type": "object"},
+        "url": {"type": "string"},
+        "method": {"type": "string"},
+        "response_time": {"type": "number"},
+        "data": {
+            "description": "Response data (format depends on response_type)"
+        },
+        "error": {"type": "string"}
+    },
+    "required": ["success", "status_code"]
+}
+
 
 class HTTPRequestAction(HttpAction):
     """Action for making HTTP requests to external APIs.
@@ -29,12 +67,13 @@ class HTTPRequestAction(HttpAction):
     def __init__(self, config: Dict[str, Any], connection_id: Optional[str] = None):
         super().__init__(config, connection_id)
         self.method = config.get("method", "GET").upper()
+        self._method_has_body = self.method not in ("GET", "HEAD")
         self.endpoint = config.get("endpoint", "")
         self.request_body = config.get("body", {})
         self.query_params = config.get("query_params", {})
         self.request_headers = config.get("request_headers", {})
         self.content_type = config.get("content_type", "application/json")
-        self.response_type = config.get("response_type", "json")  # json, text, xml, binary
+        self.response_type = config.get("response_type", "json")  # json, text, xml, binary, auto
         self.timeout = config.get("timeout", 30)
         self.follow_redirects = config.get("follow_redirects", True)
         self.verify_ssl = config.get("verify_ssl", True)
@@ -44,6 +83,37 @@ class HTTPRequestAction(HttpAction):
         self.retry_delay = config.get("retry_delay", 1.0)
         self.response_validation = config.get("response_validation", {})
 
+        # Explicit response types use a fixed parser; "auto" inspects the
+        # response's Content-Type header
+        self._response_parser = {
+            "json": self._read_json,
+            "text": self._read_text,
+            "xml": self._read_text,
+            "binary": self._read_binary,
+        }.get(self.response_type, self._read_by_content_type)
+        self.include_headers = config.get("include_headers", True)
+        self.header_whitelist = tuple(config.get("header_whitelist") or ())
+
+        # Load the CA bundle once; the shared connector applies it to every request
+        self._ssl_context = ssl.create_default_context() if self.verify_ssl else False
+
+        # The endpoint is fixed after construction, so its URL parameters
+        # and the input schema derived from them are computed once
+        self._url_params = tuple(URL_PARAM_PATTERN.findall(self.endpoint)) if isinstance(self.endpoint, str) else ()
+        self._input_schema = self._build_input_schema()
+
+        # Headers that come only from config, merged on the first request
+        self._static_headers: Optional[Dict[str, str]] = None
+
+        # Join base URL and endpoint once; only URLs with placeholders need
+        # per-request substitution
+        if isinstance(self.base_url, str) and isinstance(self.endpoint, str):
+            self._url = f"{self.base_url.rstrip('/')}/{self.endpoint.lstrip('/')}"
+            self._url_has_params = URL_PARAM_PATTERN.search(self._url) is not None
+        else:
+            self._url = None
+            self._url_has_params = True
+
     async def validate_config(self) -> bool:
         """Validate HTTP request action configuration."""
         await super().validate_config()
@@ -55,8 +125,8 @@ class HTTPRequestAction(HttpAction):
         if self.method not in valid_methods:
             raise ValueError(f"Invalid HTTP method: {self.method}. Must be one of {valid_methods}")
 
-        if self.response_type not in ["json", "text", "xml", "binary"]:
-            raise ValueError("response_type must be 'json', 'text', 'xml', or 'binary'")
+        if self.response_type not in ["json", "text", "xml", "binary", "auto"]:
+            raise ValueError("response_type must be 'json', 'text', 'xml', 'binary', or 'auto'")
 
         if self.auth_type not in ["none", "basic", "bearer", "api_key", "oauth2"]:
             raise ValueError("Invalid auth_type. Must be 'none', 'basic', 'bearer', 'api_key', or 'oauth2'")
@@ -71,9 +141,6 @@ class HTTPRequestAction(HttpAction):
 
     async def execute(self, input_data: Dict[str, Any], context: ExecutionContext) -> Dict[str, Any]:
         """Execute the HTTP request."""
-        import asyncio
-        import aiohttp
-
         try:
             # Prepare request parameters
             url = self._build_url(input_data)
@@ -115,73 +182,98 @@ class HTTPRequestAction(HttpAction):
         input_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Make the actual HTTP request."""
-        import aiohttp
-        import time
+        if aiohttp is None:
+            raise Exception("aiohttp is required for HTTP requests")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
-        async with aiohttp.ClientSession() as session:
-            # Prepare request parameters
-            request_kwargs = {
-                "url": url,
-                "headers": headers,
-                "timeout": aiohttp.ClientTimeout(total=self.timeout),
-                "allow_redirects": self.follow_redirects,
-                "verify_ssl": self.verify_ssl
+        session = await self._get_session()
+
+        # Prepare request parameters
+        request_kwargs = {
+            "url": url,
+            "headers": headers,
+            "timeout": aiohttp.ClientTimeout(total=self.timeout),
+            "allow_redirects": self.follow_redirects
+        }
+
+        # Add body for non-GET requests
+        if self.method != "GET" and body is not None:
+            if isinstance(body, dict):
+                request_kwargs["json"] = body
+            elif isinstance(body, str):
+                request_kwargs["data"] = body
+            else:
+                request_kwargs["data"] = body
+
+        # Add query parameters
+        if self.query_params:
+            request_kwargs["params"] = self.query_params
+
+        # Make the request
+        async with session.request(self.method, **request_kwargs) as response:
+            response_time = time.perf_counter() - start_time
+
+            # Parse response based on type
+            response_data = await self._parse_response(response)
+
+            result = {
+                "success": response.status < 400,
+                "status_code": response.status,
+                "headers": self._response_headers(response),
+                "url": str(response.url),
+                "method": self.method,
+                "response_time": response_time,
+                "data": response_data
             }
 
-            # Add body for non-GET requests
-            if self.method != "GET" and body is not None:
-                if isinstance(body, dict):
-                    request_kwargs["json"] = body
-                elif isinstance(body, str):
-                    request_kwargs["data"] = body
-                else:
-                    request_kwargs["data"] = body
-
-            # Add query parameters
-            if self.query_params:
-                request_kwargs["params"] = self.query_params
-
-            # Make the request
-            async with session.request(self.method, **request_kwargs) as response:
-                response_time = time.time() - start_time
-
-                # Parse response based on type
-                response_data = await self._parse_response(response)
-
-                result = {
-                    "success": response.status < 400,
-                    "status_code": response.status,
-                    "headers": dict(response.headers),
-                    "url": str(response.url),
-                    "method": self.method,
-                    "response_time": response_time,
-                    "data": response_data
-                }
+            if not result["success"]:
+                logger.warning(f"HTTP request failed with status {response.status}")
 
-                if not result["success"]:
-                    logger.warning(f"HTTP request failed with status {response.status}")
+            return result
 
-                return result
+    def _response_headers(self, response) -> Dict[str, str]:
+        """Copy the response headers the action is configured to return."""
+        if self.header_whitelist:
+            response_headers = response.headers
+            return {name: response_headers[name] for name in self.header_whitelist if name in response_headers}
+        if self.include_headers:
+            return dict(response.headers)
+        return {}
 
     def _build_url(self, input_data: Dict[str, Any]) -> str:
         """Build the complete URL for the request."""
-        base_url = self.base_url.rstrip('/')
-        endpoint = self.endpoint.lstrip('/')
+        url = self._url
+        if url is None:
+            base_url = self.base_url.rstrip('/')
+            endpoint = self.endpoint.lstrip('/')
+            url = f"{base_url}/{endpoint}"
 
-        url = f"{base_url}/{endpoint}"
+        # Replace URL parameters from input data in a single pass
+        if input_data and self._url_has_params:
+            def replace(match: re.Match) -> str:
+                key = match.group(1)
+                return str(input_data[key]) if key in input_data else match.group(0)
 
-        # Replace URL parameters from input data
-        if input_data:
-            for key, value in input_data.items():
-                if f"{{{key}}}" in url:
-                    url = url.replace(f"{{{key}}}", str(value))
+            url = URL_PARAM_PATTERN.sub(replace, url)
 
         return url
 
     def _prepare_headers(self, input_data: Dict[str, Any]) -> Dict[str, str]:
         """Prepare request headers."""
+        if self._static_headers is None:
+            self._static_headers = self._build_static_headers()
+        headers = self._static_headers.copy()
+
+        # Add any dynamic headers from input
+        dynamic_headers = input_data.get("headers", {})
+        if isinstance(dynamic_headers, dict):
+            headers.update(dynamic_headers)
+
+        return headers
+
+    def _build_static_headers(self) -> Dict[str, str]:
+        """Merge the configured, content type and auth headers."""
         headers = self.headers.copy()
         headers.update(self.request_headers)
 
@@ -193,11 +285,6 @@ class HTTPRequestAction(HttpAction):
         auth_headers = self._get_auth_headers()
         headers.update(auth_headers)
 
-        # Add any dynamic headers from input
-        dynamic_headers = input_data.get("headers", {})
-        if isinstance(dynamic_headers, dict):
-            headers.update(dynamic_headers)
-
         return headers
 
     def _get_auth_headers(self) -> Dict[str, str]:
@@ -205,7 +292,6 @@ class HTTPRequestAction(HttpAction):
         headers = {}
 
         if self.auth_type == "basic":
-            import base64
             username = self.auth_config.get("username", "")
             password = self.auth_config.get("password", "")
             auth_string = base64.b64encode(f"{username}:{password}".encode()).decode()
@@ -229,43 +315,66 @@ class HTTPRequestAction(HttpAction):
 
     def _prepare_body(self, input_data: Dict[str, Any]) -> Any:
         """Prepare request body."""
-        body = self.request_body.copy() if self.request_body else {}
+        # GET/HEAD requests never send a body
+        if not self._method_has_body:
+            return None
 
         # Merge with input data
         input_body = input_data.get("body")
         if input_body:
-            if isinstance(input_body, dict) and isinstance(body, dict):
-                body.update(input_body)
-            else:
+            if not isinstance(input_body, dict):
                 return input_body
+            if not self.request_body:
+                return input_body
+            if not isinstance(self.request_body, dict):
+                return input_body
+            return {**self.request_body, **input_body}
 
-        # Return None for GET/HEAD requests
-        if self.method in ["GET", "HEAD"]:
-            return None
-
-        return body if body else None
+        # The configured body is only read when the request is sent
+        return self.request_body if self.request_body else None
 
     async def _parse_response(self, response) -> Any:
         """Parse the HTTP response based on type."""
         try:
-            content_type = response.headers.get("Content-Type", "").lower()
-
-            if self.response_type == "json" or "application/json" in content_type:
-                return await response.json()
-            elif self.response_type == "text" or "text/" in content_type:
-                return await response.text()
-            elif self.response_type == "xml" or "xml" in content_type:
-                return await response.text()
-            elif self.response_type == "binary":
-                return await response.read()
-            else:
-                # Default to text
-                return await response.text()
+            return await self._response_parser(response)
 
         except Exception as e:
             logger.warning(f"Failed to parse response: {e}")
             return await response.text()
 
+    async def _read_by_content_type(self, response) -> Any:
+        """Pick the parser from the response's Content-Type header."""
+        content_type = response.headers.get("Content-Type", "").lower()
+
+        if "application/json" in content_type:
+            return await self._read_json(response)
+        # text/*, xml and anything unknown are returned as text
+        return await response.text()
+
+    @staticmethod
+    async def _read_text(response) -> str:
+        return await response.text()
+
+    @staticmethod
+    async def _read_binary(response) -> bytes:
+        return await response.read()
+
+    async def _read_json(self, response) -> Any:
+        """Decode a JSON response body, using orjson when it is installed."""
+        if orjson is None or not JSON_CONTENT_TYPE_PATTERN.match(response.content_type):
+            # Let aiohttp raise its usual content type error
+            return await response.json()
+
+        body = await response.read()
+        if not body.strip():
+            return None
+
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Not UTF-8 or not valid JSON; aiohttp decodes with the declared charset
+            return await response.json()
+
     def _validate_response(self, result: Dict[str, Any]) -> None:
         """Validate response against configured rules."""
         validation = self.response_validation
@@ -290,19 +399,17 @@ class HTTPRequestAction(HttpAction):
     async def test_connection(self) -> bool:
         """Test HTTP connection by making a test request."""
         try:
-            import aiohttp
-
             # Use a simple GET request to test connectivity
             test_url = self.base_url or "https://httpbin.org/get"
             headers = self._get_auth_headers()
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    test_url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    return response.status < 400
+            session = await self._get_session()
+            async with session.get(
+                test_url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                return response.status < 400
 
         except Exception as e:
             logger.error(f"HTTP connection test failed: {e}")
@@ -310,6 +417,10 @@ class HTTPRequestAction(HttpAction):
 
     def get_input_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action input."""
+        return self._input_schema
+
+    def _build_input_schema(self) -> Dict[str, Any]:
+        """Build the input schema, including the endpoint's URL parameters."""
         schema = {
             "type": "object",
             "properties": {
@@ -328,32 +439,14 @@ class HTTPRequestAction(HttpAction):
         }
 
         # Add URL parameter placeholders
-        if "{" in self.endpoint:
-            import re
-            params = re.findall(r"\{([^}]+)\}", self.endpoint)
-            for param in params:
-                schema["properties"][param] = {
-                    "type": "string",
-                    "description": f"URL parameter: {param}"
-                }
+        for param in self._url_params:
+            schema["properties"][param] = {
+                "type": "string",
+                "description": f"URL parameter: {param}"
+            }
 
         return schema
 
     def get_output_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action output."""
-        return {
-            "type": "object",
-            "properties": {
-                "success": {"type": "boolean"},
-                "status_code": {"type": "integer"},
-                "headers": {"type": "object"},
-                "url": {"type": "string"},
-                "method": {"type": "string"},
-                "response_time": {"type": "number"},
-                "data": {
-                    "description": "Response data (format depends on response_type)"
-                },
-                "error": {"type": "string"}
-            },
-            "required": ["success", "status_code"]
-        }
+        return OUTPUT_SCHEMA
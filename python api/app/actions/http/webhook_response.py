@@ -11,12 +11,89 @@ import hashlib
 import json
 from typing import Any, Dict, Optional, Union
 import time
+from collections import OrderedDict
 
 from ..base import BaseAction
 from ...core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+# Event type extractors per provider, called as (webhook_data, webhook_headers)
+EVENT_TYPE_EXTRACTORS = {
+    "github": lambda data, headers: headers.get("X-GitHub-Event", "unknown"),
+    "stripe": lambda data, headers: data.get("type", "unknown"),
+    "slack": lambda data, headers: data.get("type", "unknown"),
+    "twilio": lambda data, headers: "sms" if isinstance(data, dict) and "Body" in data else "call",
+}
+
+# Delivery id extractors for providers that send a unique id per event,
+# called as (webhook_data, webhook_headers). Other providers are never
+# deduplicated, since a payload "id" there often names the resource instead.
+DELIVERY_ID_EXTRACTORS = {
+    "github": lambda data, headers: headers.get("X-GitHub-Delivery"),
+    "stripe": lambda data, headers: data.get("id") if isinstance(data, dict) else None,
+    "slack": lambda data, headers: data.get("event_id") if isinstance(data, dict) else None,
+}
+
+# Recent delivery ids remembered for duplicate detection. Off by default:
+# ids are recorded before downstream nodes run, so a redelivery of an event
+# whose workflow failed is acknowledged instead of processed again.
+DEDUPE_CACHE_SIZE = 0
+
+# Static schemas returned by get_input_schema/get_output_schema
+INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "webhook_data": {
+            "description": "The webhook payload data"
+        },
+        "webhook_headers": {
+            "type": "object",
+            "description": "HTTP headers from the webhook request"
+        },
+        "raw_body": {
+            "type": "string",
+            "description": "Raw request body as sent, used for signature validation"
+        },
+        "webhook_method": {
+            "type": "string",
+            "enum": ["GET", "POST", "PUT", "PATCH"],
+            "default": "POST",
+            "description": "HTTP method used for the webhook"
+        }
+    },
+    "required": ["webhook_data", "webhook_headers"]
+}
+
+OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "success": {"type": "boolean"},
+        "processed_data": {
+            "type": "object",
+            "properties": {
+                "event_type": {"type": "string"},
+                "event_data": {},
+                "metadata": {"type": "object"},
+                "id": {"type": "string"}
+            }
+        },
+        "response": {
+            "type": "object",
+            "properties": {
+                "status": {"type": "integer"},
+                "headers": {"type": "object"},
+                "body": {}
+            }
+        },
+        "provider": {"type": "string"},
+        "validation_passed": {"type": "boolean"},
+        "duplicate": {"type": "boolean"},
+        "error": {"type": "string"}
+    },
+    "required": ["success"]
+}
+
 
 class WebhookResponseAction(BaseAction):
     """Action for handling and responding to webhook requests.
@@ -38,6 +115,27 @@ class WebhookResponseAction(BaseAction):
         self.validation_required = config.get("validation_required", True)
         self.allowed_events = config.get("allowed_events", [])  # For provider-specific filtering
         self.max_payload_size = config.get("max_payload_size", 1024 * 1024)  # 1MB
+        self.dedupe_cache_size = config.get("dedupe_cache_size", DEDUPE_CACHE_SIZE)  # 0 disables
+
+        # Recently processed delivery ids, oldest first
+        self._seen_events = OrderedDict()
+        self._extract_delivery_id = DELIVERY_ID_EXTRACTORS.get(self.provider)
+
+        # Response headers with the default Content-Type filled in
+        self._response_headers_template = dict(self.response_headers)
+        self._response_headers_template.setdefault("Content-Type", "application/json")
+
+        # Only dict bodies get the webhook id and timestamp added
+        if isinstance(self.response_body, dict):
+            self._build_response = self._build_dict_response
+        else:
+            self._build_response = self._build_static_response
+
+        # Providers without an extractor leave event_type unset
+        self._extract_event_type = EVENT_TYPE_EXTRACTORS.get(self.provider)
+
+        # HMAC key, encoded once; None if the token is unusable
+        self._secret_bytes = self.secret_token.encode() if isinstance(self.secret_token, str) else None
 
     async def validate_config(self) -> bool:
         """Validate webhook response action configuration."""
@@ -60,10 +158,29 @@ class WebhookResponseAction(BaseAction):
             webhook_data = input_data.get("webhook_data", {})
             webhook_headers = input_data.get("webhook_headers", {})
             webhook_method = input_data.get("webhook_method", "POST")
+            raw_body = input_data.get("raw_body")
+
+            try:
+                payload = self._signed_payload(webhook_data, raw_body)
+            except (TypeError, ValueError):
+                # Not JSON serializable; signature validation rejects it below
+                payload = None
+
+            # Reject oversized payloads before spending any time hashing them
+            if payload is not None and len(payload) > self.max_payload_size:
+                return {
+                    "success": False,
+                    "error": f"Webhook payload exceeds {self.max_payload_size} bytes",
+                    "response": {
+                        "status": 413,
+                        "body": {"error": "Payload too large"},
+                        "headers": {"Content-Type": "application/json"}
+                    }
+                }
 
             # Validate webhook if required
             if self.validation_required:
-                is_valid = await self._validate_webhook(webhook_data, webhook_headers)
+                is_valid = await self._validate_webhook(webhook_data, webhook_headers, payload)
                 if not is_valid:
                     return {
                         "success": False,
@@ -91,6 +208,21 @@ class WebhookResponseAction(BaseAction):
                         }
                     }
 
+            # Acknowledge re-delivered events without handling them again
+            if self._is_duplicate(webhook_data, webhook_headers):
+                return {
+                    "success": True,
+                    "processed_data": processed_data,
+                    "response": {
+                        "status": 200,
+                        "body": {"status": "duplicate", "webhook_id": processed_data.get("id")},
+                        "headers": self._response_headers_template.copy()
+                    },
+                    "provider": self.provider,
+                    "validation_passed": True,
+                    "duplicate": True
+                }
+
             # Generate response
             response = self._generate_response(processed_data)
 
@@ -114,42 +246,60 @@ class WebhookResponseAction(BaseAction):
                 }
             }
 
-    async def _validate_webhook(self, webhook_data: Any, webhook_headers: Dict[str, str]) -> bool:
-        """Validate webhook signature based on provider."""
+    async def _validate_webhook(
+        self,
+        webhook_data: Any,
+        webhook_headers: Dict[str, str],
+        raw_body: Optional[Union[bytes, str]] = None
+    ) -> bool:
+        """Validate webhook signature based on provider.
+
+        Signatures are checked against raw_body, the exact bytes the sender
+        signed, when it is given; otherwise against webhook_data re-serialized
+        as compact JSON.
+        """
         try:
-            if self.provider == "github":
-                return self._validate_github_webhook(webhook_data, webhook_headers)
-            elif self.provider == "stripe":
+            if self.provider == "stripe":
                 return self._validate_stripe_webhook(webhook_data, webhook_headers)
-            elif self.provider == "slack":
-                return self._validate_slack_webhook(webhook_data, webhook_headers)
             elif self.provider == "twilio":
                 return self._validate_twilio_webhook(webhook_data, webhook_headers)
+
+            payload = self._signed_payload(webhook_data, raw_body)
+            if self.provider == "github":
+                return self._validate_github_webhook(webhook_data, webhook_headers, payload)
+            elif self.provider == "slack":
+                return self._validate_slack_webhook(webhook_data, webhook_headers, payload)
             else:
                 # Generic validation using HMAC-SHA256
-                return self._validate_generic_webhook(webhook_data, webhook_headers)
+                return self._validate_generic_webhook(webhook_data, webhook_headers, payload)
 
         except Exception as e:
             logger.error(f"Webhook validation failed: {e}")
             return False
 
-    def _validate_github_webhook(self, webhook_data: Any, webhook_headers: Dict[str, str]) -> bool:
+    def _signed_payload(self, webhook_data: Any, raw_body: Optional[Union[bytes, str]] = None) -> bytes:
+        """Get the bytes a webhook signature covers."""
+        if raw_body is not None:
+            return raw_body.encode() if isinstance(raw_body, str) else bytes(raw_body)
+        return json.dumps(webhook_data, separators=(',', ':')).encode()
+
+    def _validate_github_webhook(
+        self,
+        webhook_data: Any,
+        webhook_headers: Dict[str, str],
+        payload: Optional[bytes] = None
+    ) -> bool:
         """Validate GitHub webhook signature."""
         signature = webhook_headers.get("X-Hub-Signature-256", "")
         if not signature:
             return False
 
-        # GitHub sends the payload as raw bytes, but we have it as parsed data
-        # In a real implementation, you'd need the raw payload
-        payload = json.dumps(webhook_data, separators=(',', ':')).encode()
+        if payload is None:
+            payload = self._signed_payload(webhook_data)
 
-        expected_signature = hmac.new(
-            self.secret_token.encode(),
-            payload,
-            hashlib.sha256
-        ).hexdigest()
-
-        return hmac.compare_digest(f"sha256={expected_signature}", signature)
+        if not signature.startswith("sha256="):
+            return False
+        return self._signature_matches(payload, signature[7:])
 
     def _validate_stripe_webhook(self, webhook_data: Any, webhook_headers: Dict[str, str]) -> bool:
         """Validate Stripe webhook signature."""
@@ -167,7 +317,12 @@ class WebhookResponseAction(BaseAction):
         except:
             return False
 
-    def _validate_slack_webhook(self, webhook_data: Any, webhook_headers: Dict[str, str]) -> bool:
+    def _validate_slack_webhook(
+        self,
+        webhook_data: Any,
+        webhook_headers: Dict[str, str],
+        payload: Optional[bytes] = None
+    ) -> bool:
         """Validate Slack webhook signature."""
         timestamp = webhook_headers.get("X-Slack-Request-Timestamp", "")
         signature = webhook_headers.get("X-Slack-Signature", "")
@@ -175,16 +330,15 @@ class WebhookResponseAction(BaseAction):
         if not timestamp or not signature:
             return False
 
-        # Slack signature validation
-        basestring = f"v0:{timestamp}:{json.dumps(webhook_data, separators=(',', ':'))}"
+        if payload is None:
+            payload = self._signed_payload(webhook_data)
 
-        expected_signature = hmac.new(
-            self.secret_token.encode(),
-            basestring.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        # Slack signature validation
+        basestring = b"v0:" + str(timestamp).encode() + b":" + payload
 
-        return hmac.compare_digest(f"v0={expected_signature}", signature)
+        if not signature.startswith("v0="):
+            return False
+        return self._signature_matches(basestring, signature[3:])
 
     def _validate_twilio_webhook(self, webhook_data: Any, webhook_headers: Dict[str, str]) -> bool:
         """Validate Twilio webhook signature."""
@@ -199,70 +353,115 @@ class WebhookResponseAction(BaseAction):
         # In production, you'd use Twilio's validation library
         return True
 
-    def _validate_generic_webhook(self, webhook_data: Any, webhook_headers: Dict[str, str]) -> bool:
+    def _validate_generic_webhook(
+        self,
+        webhook_data: Any,
+        webhook_headers: Dict[str, str],
+        payload: Optional[bytes] = None
+    ) -> bool:
         """Validate generic webhook using HMAC-SHA256."""
         signature = webhook_headers.get("X-Webhook-Signature", "")
         if not signature:
             return False
 
-        payload = json.dumps(webhook_data, separators=(',', ':')).encode()
+        if payload is None:
+            payload = self._signed_payload(webhook_data)
+
+        return self._signature_matches(payload, signature)
 
-        expected_signature = hmac.new(
-            self.secret_token.encode(),
-            payload,
-            hashlib.sha256
-        ).hexdigest()
+    def _signature_matches(self, message: bytes, signature_hex: str) -> bool:
+        """Check a hex HMAC-SHA256 signature by comparing raw digests."""
+        if self._secret_bytes is None:
+            return False
+
+        try:
+            provided = bytes.fromhex(signature_hex)
+        except (ValueError, TypeError):
+            return False
 
-        return hmac.compare_digest(expected_signature, signature)
+        expected = hmac.new(self._secret_bytes, message, hashlib.sha256).digest()
+        return hmac.compare_digest(expected, provided)
 
     async def _process_webhook_payload(self, webhook_data: Any, webhook_headers: Dict[str, str]) -> Dict[str, Any]:
         """Process webhook payload based on provider."""
+        return self._processed_event(webhook_data, webhook_headers, time.time())
+
+    def _processed_event(self, webhook_data: Any, webhook_headers: Dict[str, str], timestamp: float) -> Dict[str, Any]:
+        """Build the processed form of one webhook event."""
         processed = {
             "event_type": None,
             "event_data": webhook_data,
             "metadata": {
                 "provider": self.provider,
-                "timestamp": time.time(),
+                "timestamp": timestamp,
                 "headers": webhook_headers
             }
         }
 
         try:
-            if self.provider == "github":
-                processed["event_type"] = webhook_headers.get("X-GitHub-Event", "unknown")
-            elif self.provider == "stripe":
-                processed["event_type"] = webhook_data.get("type", "unknown")
-            elif self.provider == "slack":
-                processed["event_type"] = webhook_data.get("type", "unknown")
-            elif self.provider == "twilio":
-                processed["event_type"] = "sms" if "Body" in str(webhook_data) else "call"
+            if self._extract_event_type is not None:
+                processed["event_type"] = self._extract_event_type(webhook_data, webhook_headers)
 
             # Extract common fields
-            processed["id"] = webhook_data.get("id") or webhook_data.get("event_id") or f"webhook_{int(time.time())}"
+            processed["id"] = webhook_data.get("id") or webhook_data.get("event_id") or f"webhook_{int(timestamp)}"
 
         except Exception as e:
             logger.warning(f"Error processing webhook payload: {e}")
 
         return processed
 
+    def _is_duplicate(self, webhook_data: Any, webhook_headers: Dict[str, str]) -> bool:
+        """Record the delivery id and report whether it was seen recently.
+
+        Only providers in DELIVERY_ID_EXTRACTORS are tracked; events without
+        a delivery id are never treated as duplicates.
+        """
+        if self.dedupe_cache_size <= 0 or self._extract_delivery_id is None:
+            return False
+
+        key = self._extract_delivery_id(webhook_data, webhook_headers)
+        if not key:
+            return False
+
+        try:
+            if key in self._seen_events:
+                self._seen_events.move_to_end(key)
+                return True
+        except TypeError:
+            # Unhashable id (e.g. a list); nothing to compare against
+            return False
+
+        self._seen_events[key] = True
+        if len(self._seen_events) > self.dedupe_cache_size:
+            self._seen_events.popitem(last=False)
+        return False
+
     def _generate_response(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate HTTP response for webhook."""
-        response = {
+        return self._build_response(processed_data)
+
+    def _build_dict_response(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a response whose dict body is tagged with the webhook id."""
+        return {
             "status": self.response_status,
-            "headers": self.response_headers.copy(),
-            "body": self.response_body.copy()
+            "headers": self._response_headers_template.copy(),
+            "body": {
+                **self.response_body,
+                "webhook_id": processed_data.get("id"),
+                "processed_at": processed_data["metadata"]["timestamp"]
+            }
         }
 
-        # Add content type if not specified
-        if "Content-Type" not in response["headers"]:
-            response["headers"]["Content-Type"] = "application/json"
-
-        # Customize response based on processed data
-        if isinstance(response["body"], dict):
-            response["body"]["webhook_id"] = processed_data.get("id")
-            response["body"]["processed_at"] = processed_data["metadata"]["timestamp"]
-
-        return response
+    def _build_static_response(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a response around the configured non-dict body."""
+        body = self.response_body
+        if isinstance(body, list):
+            body = body.copy()
+        return {
+            "status": self.response_status,
+            "headers": self._response_headers_template.copy(),
+            "body": body
+        }
 
     async def test_connection(self) -> bool:
         """Test webhook response action (no external connections needed)."""
@@ -270,52 +469,8 @@ class WebhookResponseAction(BaseAction):
 
     def get_input_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action input."""
-        return {
-            "type": "object",
-            "properties": {
-                "webhook_data": {
-                    "description": "The webhook payload data"
-                },
-                "webhook_headers": {
-                    "type": "object",
-                    "description": "HTTP headers from the webhook request"
-                },
-                "webhook_method": {
-                    "type": "string",
-                    "enum": ["GET", "POST", "PUT", "PATCH"],
-                    "default": "POST",
-                    "description": "HTTP method used for the webhook"
-                }
-            },
-            "required": ["webhook_data", "webhook_headers"]
-        }
+        return INPUT_SCHEMA
 
     def get_output_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action output."""
-        return {
-            "type": "object",
-            "properties": {
-                "success": {"type": "boolean"},
-                "processed_data": {
-                    "type": "object",
-                    "properties": {
-                        "event_type": {"type": "string"},
-                        "event_data": {},
-                        "metadata": {"type": "object"},
-                        "id": {"type": "string"}
-                    }
-                },
-                "response": {
-                    "type": "object",
-                    "properties": {
-                        "status": {"type": "integer"},
-                        "headers": {"type": "object"},
-                        "body": {}
-                    }
-                },
-                "provider": {"type": "string"},
-                "validation_passed": {"type": "boolean"},
-                "error": {"type": "string"}
-            },
-            "required": ["success"]
-        }
+        return OUTPUT_SCHEMA
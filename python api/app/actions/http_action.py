@@ -4,15 +4,132 @@ This module implements an HTTP action that can make HTTP requests
 to external APIs and services as part of workflow execution.
 """
 
+import base64
+import functools
 import logging
 from typing import Any, Dict, Optional
 import json
+import re
+import ssl
+import time
 
-from .base import HttpAction
+try:
+    import aiohttp
+except ImportError:  # reported when a request is made
+    aiohttp = None
+
+from .base import HttpAction, get_shared_session, read_json
 from ..core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+URL_PARAM_PATTERN = re.compile(r"\{([^}]+)\}")
+
+# Binary responses are read in chunks of this size
+BINARY_CHUNK_SIZE = 64 * 1024
+
+# Action schemas, shared by every instance
+INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "body": {
+            "type": "object",
+            "description": "Request body data (merged with configured body)"
+        },
+        "headers": {
+            "type": "object",
+            "description": "Additional headers to include in the request"
+        },
+        "query_params": {
+            "type": "object",
+            "description": "Query parameters to include in the URL"
+        }
+    },
+    "additionalProperties": True
+}
+
+OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "success": {"type": "boolean"},
+        "status_code": {"type": ["integer", "null"]},
+        "headers": {"type": "object"},
+        "url": {"type": "string"},
+        "method": {"type": "string"},
+        "response_time": {"type": "number"},
+        "data": {"type": "object"},
+        "error": {"type": "string"}
+    },
+    "required": ["success", "status_code"]
+}
+
+CONFIG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "base_url": {
+            "type": "string",
+            "description": "Base URL for the API"
+        },
+        "endpoint": {
+            "type": "string",
+            "description": "API endpoint path"
+        },
+        "method": {
+            "type": "string",
+            "enum": ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"],
+            "default": "GET"
+        },
+        "headers": {
+            "type": "object",
+            "description": "Default headers to include"
+        },
+        "body": {
+            "type": "object",
+            "description": "Default request body"
+        },
+        "timeout": {
+            "type": "number",
+            "default": 30,
+            "minimum": 1
+        },
+        "follow_redirects": {
+            "type": "boolean",
+            "default": True
+        },
+        "verify_ssl": {
+            "type": "boolean",
+            "default": True
+        },
+        "include_headers": {
+            "type": "boolean",
+            "default": True,
+            "description": "Return the response headers in the result"
+        },
+        "header_whitelist": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Only return these response headers (case-insensitive)"
+        },
+        "max_binary_bytes": {
+            "type": "integer",
+            "default": 10 * 1024 * 1024,
+            "minimum": 1,
+            "description": "Binary responses larger than this are truncated"
+        }
+    },
+    "required": ["base_url", "endpoint"]
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _default_ssl_context() -> ssl.SSLContext:
+    """Create the certificate-verifying SSL context shared by HTTP actions.
+
+    Sharing one context object also lets actions reuse each other's
+    pooled TLS connections, since aiohttp keys connections by it.
+    """
+    return ssl.create_default_context()
+
 
 class HTTPAction(HttpAction):
     """HTTP action for making HTTP requests to external services.
@@ -31,6 +148,29 @@ class HTTPAction(HttpAction):
         self.timeout = config.get("timeout", 30)
         self.follow_redirects = config.get("follow_redirects", True)
         self.verify_ssl = config.get("verify_ssl", True)
+        self._ssl_context = _default_ssl_context() if self.verify_ssl else False
+        self.max_binary_bytes = config.get("max_binary_bytes", 10 * 1024 * 1024)  # 10MB
+        self.include_headers = config.get("include_headers", True)
+        self.header_whitelist = tuple(config.get("header_whitelist") or ())
+
+        # Headers that come only from config, merged on the first request
+        self._static_headers: Optional[Dict[str, str]] = None
+
+        # The base URL and endpoint are fixed, so they are joined once
+        if isinstance(self.base_url, str) and isinstance(self.endpoint, str):
+            self._url = f"{self.base_url.rstrip('/')}/{self.endpoint.lstrip('/')}"
+            self._url_has_params = "{" in self._url
+        else:
+            self._url = None
+            self._url_has_params = True
+
+    async def _get_session(self):
+        """Get the process-wide aiohttp session.
+
+        The SSL setting is passed per request, so HTTP actions can share
+        one connection pool.
+        """
+        return await get_shared_session()
 
     async def validate_config(self) -> bool:
         """Validate HTTP action configuration."""
@@ -51,7 +191,8 @@ class HTTPAction(HttpAction):
     async def execute(self, input_data: Dict[str, Any], context: ExecutionContext) -> Dict[str, Any]:
         """Execute the HTTP request."""
         try:
-            import aiohttp
+            if aiohttp is None:
+                raise Exception("aiohttp is required for HTTP requests")
 
             # Build the full URL
             url = self._build_url(input_data)
@@ -63,36 +204,38 @@ class HTTPAction(HttpAction):
             body = self._prepare_body(input_data)
 
             # Make the request
-            async with aiohttp.ClientSession() as session:
-                async with session.request(
-                    method=self.method,
-                    url=url,
-                    headers=headers,
-                    json=body if isinstance(body, dict) else None,
-                    data=body if isinstance(body, str) else None,
-                    params=self.query_params,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout),
-                    allow_redirects=self.follow_redirects,
-                    verify_ssl=self.verify_ssl
-                ) as response:
-
-                    # Parse response
-                    response_data = await self._parse_response(response)
-
-                    result = {
-                        "success": response.status < 400,
-                        "status_code": response.status,
-                        "headers": dict(response.headers),
-                        "url": str(response.url),
-                        "method": self.method,
-                        "response_time": response_data.get("_response_time", 0),
-                        "data": response_data
-                    }
-
-                    if not result["success"]:
-                        logger.warning(f"HTTP request failed with status {response.status}: {response_data}")
-
-                    return result
+            session = await self._get_session()
+            start_time = time.perf_counter()
+            async with session.request(
+                method=self.method,
+                url=url,
+                headers=headers,
+                json=body if isinstance(body, dict) else None,
+                data=body if isinstance(body, str) else None,
+                params=self.query_params,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                allow_redirects=self.follow_redirects,
+                ssl=self._ssl_context
+            ) as response:
+
+                # Parse response
+                response_data = await self._parse_response(response)
+                response_time = time.perf_counter() - start_time
+
+                result = {
+                    "success": response.status < 400,
+                    "status_code": response.status,
+                    "headers": self._response_headers(response),
+                    "url": str(response.url),
+                    "method": self.method,
+                    "response_time": response_time,
+                    "data": response_data
+                }
+
+                if not result["success"]:
+                    logger.warning(f"HTTP request failed with status {response.status}: {response_data}")
+
+                return result
 
         except Exception as e:
             error_msg = f"HTTP request failed: {str(e)}"
@@ -107,56 +250,70 @@ class HTTPAction(HttpAction):
     async def test_connection(self) -> bool:
         """Test HTTP connection by making a simple request."""
         try:
-            import aiohttp
-
             # Use a simple GET request to test connectivity
             test_url = self.base_url or "https://httpbin.org/get"
 
             headers = self.headers.copy()
             headers.update({"User-Agent": "FlowForge-HTTP-Action-Test"})
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    test_url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    return response.status < 400
+            session = await self._get_session()
+            async with session.get(
+                test_url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                return response.status < 400
 
         except Exception as e:
             logger.error(f"HTTP connection test failed: {e}")
             return False
 
+    def _response_headers(self, response) -> Dict[str, str]:
+        """Copy the response headers the action is configured to return."""
+        if self.header_whitelist:
+            response_headers = response.headers
+            return {name: response_headers[name] for name in self.header_whitelist if name in response_headers}
+        if self.include_headers:
+            return dict(response.headers)
+        return {}
+
     def _build_url(self, input_data: Dict[str, Any]) -> str:
         """Build the complete URL for the request."""
-        base_url = self.base_url.rstrip('/')
-        endpoint = self.endpoint.lstrip('/')
+        url = self._url
+        if url is None:
+            base_url = self.base_url.rstrip('/')
+            endpoint = self.endpoint.lstrip('/')
+            url = f"{base_url}/{endpoint}"
 
-        url = f"{base_url}/{endpoint}"
+        # Replace URL parameters from input data in a single pass; URLs
+        # without placeholders are returned as they are
+        if input_data and self._url_has_params:
+            def replace(match: re.Match) -> str:
+                key = match.group(1)
+                return str(input_data[key]) if key in input_data else match.group(0)
 
-        # Replace URL parameters from input data
-        if input_data:
-            for key, value in input_data.items():
-                if f"{{{key}}}" in url:
-                    url = url.replace(f"{{{key}}}", str(value))
+            url = URL_PARAM_PATTERN.sub(replace, url)
 
         return url
 
     def _prepare_headers(self, input_data: Dict[str, Any]) -> Dict[str, str]:
-        """Prepare request headers."""
-        headers = self.headers.copy()
-        headers.update(self.request_headers)
+        """Prepare request headers.
 
-        # Add content type if not specified
-        if "Content-Type" not in headers:
-            headers["Content-Type"] = "application/json"
+        Without dynamic headers the merged config headers are returned
+        as is; callers must not modify the result.
+        """
+        if self._static_headers is None:
+            headers = {**self.headers, **self.request_headers}
+            # Add content type if not specified
+            headers.setdefault("Content-Type", "application/json")
+            self._static_headers = headers
 
         # Add any dynamic headers from input
-        dynamic_headers = input_data.get("headers", {})
-        if isinstance(dynamic_headers, dict):
-            headers.update(dynamic_headers)
+        dynamic_headers = input_data.get("headers")
+        if isinstance(dynamic_headers, dict) and dynamic_headers:
+            return {**self._static_headers, **dynamic_headers}
 
-        return headers
+        return self._static_headers
 
     def _prepare_body(self, input_data: Dict[str, Any]) -> Any:
         """Prepare request body."""
@@ -176,26 +333,19 @@ class HTTPAction(HttpAction):
 
         return body
 
-    async def _parse_response(self, response) -> Dict[str, Any]:
+    async def _parse_response(self, response) -> Any:
         """Parse the HTTP response."""
         try:
-            import time
-            start_time = time.time()
-
             content_type = response.headers.get("Content-Type", "").lower()
 
             if "application/json" in content_type:
-                data = await response.json()
+                data = await read_json(response)
             elif "text/" in content_type or "xml" in content_type:
                 text = await response.text()
                 data = {"text": text}
             else:
                 # Binary or unknown content type
-                data = await response.read()
-                data = {"raw": data.hex() if isinstance(data, bytes) else str(data)}
-
-            response_time = time.time() - start_time
-            data["_response_time"] = response_time
+                data = await self._read_binary(response)
 
             return data
 
@@ -203,83 +353,36 @@ class HTTPAction(HttpAction):
             logger.warning(f"Failed to parse response: {e}")
             return {"error": "Failed to parse response", "raw_text": await response.text()}
 
+    async def _read_binary(self, response) -> Dict[str, Any]:
+        """Read a binary body, keeping at most max_binary_bytes, as base64."""
+        chunks = []
+        total = 0
+        truncated = False
+        async for chunk in response.content.iter_chunked(BINARY_CHUNK_SIZE):
+            remaining = self.max_binary_bytes - total
+            if len(chunk) > remaining:
+                # Stop downloading at the cap; closing drops the connection
+                # instead of reading the rest of the body
+                chunks.append(chunk[:remaining])
+                truncated = True
+                response.close()
+                break
+            chunks.append(chunk)
+            total += len(chunk)
+
+        data = {"raw_b64": base64.b64encode(b"".join(chunks)).decode("ascii")}
+        if truncated:
+            data["truncated"] = True
+        return data
+
     def get_input_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action input."""
-        return {
-            "type": "object",
-            "properties": {
-                "body": {
-                    "type": "object",
-                    "description": "Request body data (merged with configured body)"
-                },
-                "headers": {
-                    "type": "object",
-                    "description": "Additional headers to include in the request"
-                },
-                "query_params": {
-                    "type": "object",
-                    "description": "Query parameters to include in the URL"
-                }
-            },
-            "additionalProperties": True
-        }
+        return INPUT_SCHEMA
 
     def get_output_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action output."""
-        return {
-            "type": "object",
-            "properties": {
-                "success": {"type": "boolean"},
-                "status_code": {"type": ["integer", "null"]},
-                "headers": {"type": "object"},
-                "url": {"type": "string"},
-                "method": {"type": "string"},
-                "response_time": {"type": "number"},
-                "data": {"type": "object"},
-                "error": {"type": "string"}
-            },
-            "required": ["success", "status_code"]
-        }
+        return OUTPUT_SCHEMA
 
     def get_config_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action configuration."""
-        return {
-            "type": "object",
-            "properties": {
-                "base_url": {
-                    "type": "string",
-                    "description": "Base URL for the API"
-                },
-                "endpoint": {
-                    "type": "string",
-                    "description": "API endpoint path"
-                },
-                "method": {
-                    "type": "string",
-                    "enum": ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"],
-                    "default": "GET"
-                },
-                "headers": {
-                    "type": "object",
-                    "description": "Default headers to include"
-                },
-                "body": {
-                    "type": "object",
-                    "description": "Default request body"
-                },
-                "timeout": {
-                    "type": "number",
-                    "default": 30,
-                    "minimum": 1
-                },
-                "follow_redirects": {
-                    "type": "boolean",
-                    "default": true
-                },
-                "verify_ssl": {
-                    "type": "boolean",
-                    "default": true
-                }
-            },
-            "required": ["base_url", "endpoint"]
-        }
+        return CONFIG_SCHEMA
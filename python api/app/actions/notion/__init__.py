@@ -1,6 +1,7 @@
 """Notion Actions Package
 
 Contains Notion integration actions:
+- base.py: Shared request headers, rate limiting and API errors
 - database_action.py: Database operations (create, query, update)
 - page_action.py: Page operations (create, update, retrieve)
 - table_action.py: Table/database item operations
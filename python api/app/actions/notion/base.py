@@ -0,0 +1,112 @@
+"""Notion API Helpers
+
+Shared by the Notion actions: request headers, per-token request pacing,
+the API error type and rate-limit retries.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Notion API version sent with every request
+NOTION_VERSION = "2022-06-28"
+
+# Longest Retry-After delay honoured before retrying a rate-limited call
+MAX_RETRY_AFTER = 30.0
+
+# Times a rate-limited call is retried before the 429 is reported
+RATE_LIMIT_RETRIES = 3
+
+# Notion's average request rate limit per integration token
+NOTION_REQUESTS_PER_SECOND = 3
+
+
+def auth_headers(api_key: str) -> Dict[str, str]:
+    """Build the headers sent with every request made with api_key."""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Notion-Version": NOTION_VERSION
+    }
+
+
+class RequestThrottle:
+    """Token bucket pacing requests to a fixed average rate.
+
+    Holds up to one second's worth of tokens, so short bursts go out
+    immediately and sustained load is spread to the configured rate.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, then consume a token."""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# Request throttles shared by all Notion actions using the same API key
+_throttles: Dict[str, RequestThrottle] = {}
+
+
+def get_throttle(api_key: str) -> RequestThrottle:
+    """Get the throttle for api_key, creating it on first use."""
+    throttle = _throttles.get(api_key)
+    if throttle is None:
+        throttle = _throttles[api_key] = RequestThrottle(NOTION_REQUESTS_PER_SECOND)
+    return throttle
+
+
+class NotionAPIError(Exception):
+    """Raised when the Notion API returns an error status."""
+    def __init__(self, status: int, message: str, retry_after: Optional[str] = None):
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(f"Notion API error ({status}): {message}")
+
+    @classmethod
+    async def from_response(cls, response) -> "NotionAPIError":
+        """Build the error from a response's status, body text and Retry-After."""
+        return cls(response.status, await response.text(), response.headers.get("Retry-After"))
+
+    def retry_delay(self) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the call should not be retried."""
+        if self.status != 429:
+            return None
+        try:
+            delay = float(self.retry_after)
+        except (TypeError, ValueError):
+            delay = 1.0
+        return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+async def with_retries(handler, input_data: Any) -> Any:
+    """Run handler, backing off and retrying when Notion returns 429.
+
+    Waits at least the Retry-After delay, doubling the wait on each
+    further attempt and adding jitter so throttled callers spread out.
+    """
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            return await handler(input_data)
+        except NotionAPIError as e:
+            delay = e.retry_delay()
+            if delay is None or attempt == RATE_LIMIT_RETRIES:
+                raise
+            delay = max(delay, 0.5 * 2 ** attempt) + random.uniform(0, 0.25)
+            logger.warning(f"Notion rate limit hit; retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
@@ -4,15 +4,101 @@ This module implements actions for Notion database operations including
 creating items, querying databases, and updating database entries.
 """
 
+import asyncio
 import logging
 from typing import Any, Dict, Optional, List
 import json
 
-from ..base import ApiAction
+try:
+    import aiohttp
+except ImportError:  # reported when an operation runs
+    aiohttp = None
+
+from ..base import ApiAction, read_json
 from ...core.context import ExecutionContext
+from .base import NotionAPIError, auth_headers, get_throttle, with_retries
 
 logger = logging.getLogger(__name__)
 
+# Input schema for each operation; "get" takes no input
+INPUT_SCHEMAS = {
+    "create": {
+        "type": "object",
+        "properties": {
+            "properties": {
+                "type": "object",
+                "description": "Database properties to set"
+            },
+            "children": {
+                "type": "array",
+                "description": "Page content blocks"
+            },
+            "cover": {
+                "type": "object",
+                "description": "Page cover image"
+            },
+            "icon": {
+                "type": "object",
+                "description": "Page icon"
+            }
+        },
+        "required": ["properties"]
+    },
+    "query": {
+        "type": "object",
+        "properties": {
+            "filter": {
+                "type": "object",
+                "description": "Query filter conditions"
+            },
+            "sorts": {
+                "type": "array",
+                "description": "Sort specifications"
+            },
+            "page_size": {
+                "type": "integer",
+                "default": 100,
+                "description": "Number of results per page"
+            },
+            "queries": {
+                "type": "array",
+                "items": {"type": "object"},
+                "description": "Several independent queries (filter/sorts/start_cursor/page_size) to run concurrently"
+            }
+        }
+    },
+    "update": {
+        "type": "object",
+        "properties": {
+            "page_id": {
+                "type": "string",
+                "description": "ID of the page to update"
+            },
+            "properties": {
+                "type": "object",
+                "description": "Properties to update"
+            }
+        },
+        "required": ["page_id"]
+    }
+}
+
+EMPTY_INPUT_SCHEMA = {"type": "object", "properties": {}}
+
+OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "success": {"type": "boolean"},
+        "operation": {"type": "string"},
+        "database_id": {"type": "string"},
+        "result": {
+            "description": "Operation result (structure depends on operation)"
+        },
+        "error": {"type": "string"}
+    },
+    "required": ["success", "operation"]
+}
+
 
 class NotionDatabaseAction(ApiAction):
     """Action for Notion database operations.
@@ -31,6 +117,20 @@ class NotionDatabaseAction(ApiAction):
         self.operation = config.get("operation", "create")  # create, query, update, get
         self.api_base_url = "https://api.notion.com/v1"
 
+        # Request headers are the same for every call
+        self._auth_headers = auth_headers(self.api_key)
+
+        # Shares its API key's pacing with page actions using the same key
+        self._throttle = get_throttle(self.api_key)
+
+        # Handler for the configured operation; None if it is unsupported
+        self._operation_handler = {
+            "create": self._create_database_item,
+            "query": self._run_query,
+            "update": self._update_database_item,
+            "get": self._get_database_info
+        }.get(self.operation)
+
     async def validate_config(self) -> bool:
         """Validate Notion database action configuration."""
         if not self.api_key:
@@ -48,16 +148,12 @@ class NotionDatabaseAction(ApiAction):
     async def execute(self, input_data: Dict[str, Any], context: ExecutionContext) -> Dict[str, Any]:
         """Execute the Notion database operation."""
         try:
-            if self.operation == "create":
-                result = await self._create_database_item(input_data)
-            elif self.operation == "query":
-                result = await self._query_database(input_data)
-            elif self.operation == "update":
-                result = await self._update_database_item(input_data)
-            elif self.operation == "get":
-                result = await self._get_database_info()
-            else:
+            if aiohttp is None:
+                raise Exception("aiohttp is required for Notion API requests")
+
+            if self._operation_handler is None:
                 raise ValueError(f"Unsupported operation: {self.operation}")
+            result = await with_retries(self._operation_handler, input_data)
 
             return {
                 "success": True,
@@ -78,8 +174,6 @@ class NotionDatabaseAction(ApiAction):
     async def _create_database_item(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new item in the Notion database."""
         try:
-            import aiohttp
-
             # Prepare the request payload
             properties = input_data.get("properties", {})
             children = input_data.get("children", [])
@@ -98,45 +192,56 @@ class NotionDatabaseAction(ApiAction):
             if "icon" in input_data:
                 payload["icon"] = input_data["icon"]
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
+            session = await self._get_session()
+            await self._throttle.acquire()
+            async with session.post(
+                f"{self.api_base_url}/pages",
+                headers=self._auth_headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+
+                if response.status != 200:
+                    raise await NotionAPIError.from_response(response)
+
+                result = await read_json(response)
+
+                return {
+                    "page_id": result.get("id"),
+                    "url": result.get("url"),
+                    "created_time": result.get("created_time"),
+                    "last_edited_time": result.get("last_edited_time"),
+                    "properties": result.get("properties", {})
+                }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_base_url}/pages",
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Notion API error: {error_data}")
-
-                    result = await response.json()
-
-                    return {
-                        "page_id": result.get("id"),
-                        "url": result.get("url"),
-                        "created_time": result.get("created_time"),
-                        "last_edited_time": result.get("last_edited_time"),
-                        "properties": result.get("properties", {})
-                    }
-
-        except ImportError:
-            raise Exception("aiohttp is required for Notion API requests")
         except Exception as e:
             logger.error(f"Database item creation failed: {e}")
             raise
 
+    async def _run_query(self, input_data: Dict[str, Any]) -> Any:
+        """Run the query operation, fanning out when several queries are given."""
+        queries = input_data.get("queries")
+        if queries:
+            return await self.query_many(queries)
+        return await self._query_database(input_data)
+
+    async def query_many(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run independent database queries concurrently.
+
+        The queries share the pooled session and are paced by the API key's
+        request throttle, so large batches stay under Notion's rate limit.
+        A failed query yields {"error": ...} in its position instead of
+        failing the whole batch.
+        """
+        results = await asyncio.gather(
+            *(with_retries(self._query_database, query) for query in queries),
+            return_exceptions=True
+        )
+        return [{"error": str(result)} if isinstance(result, BaseException) else result for result in results]
+
     async def _query_database(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Query the Notion database with optional filters."""
         try:
-            import aiohttp
-
             # Prepare query parameters
             query_params = {}
 
@@ -155,35 +260,27 @@ class NotionDatabaseAction(ApiAction):
             page_size = input_data.get("page_size", 100)
             query_params["page_size"] = min(page_size, 100)  # Notion API limit
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
+            session = await self._get_session()
+            await self._throttle.acquire()
+            async with session.post(
+                f"{self.api_base_url}/databases/{self.database_id}/query",
+                headers=self._auth_headers,
+                json=query_params,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+
+                if response.status != 200:
+                    raise await NotionAPIError.from_response(response)
+
+                result = await read_json(response)
+
+                return {
+                    "results": result.get("results", []),
+                    "has_more": result.get("has_more", False),
+                    "next_cursor": result.get("next_cursor"),
+                    "count": len(result.get("results", []))
+                }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_base_url}/databases/{self.database_id}/query",
-                    headers=headers,
-                    json=query_params,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Notion API error: {error_data}")
-
-                    result = await response.json()
-
-                    return {
-                        "results": result.get("results", []),
-                        "has_more": result.get("has_more", False),
-                        "next_cursor": result.get("next_cursor"),
-                        "count": len(result.get("results", []))
-                    }
-
-        except ImportError:
-            raise Exception("aiohttp is required for Notion API requests")
         except Exception as e:
             logger.error(f"Database query failed: {e}")
             raise
@@ -191,8 +288,6 @@ class NotionDatabaseAction(ApiAction):
     async def _update_database_item(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing database item."""
         try:
-            import aiohttp
-
             page_id = input_data.get("page_id")
             if not page_id:
                 raise ValueError("page_id is required for update operation")
@@ -209,75 +304,57 @@ class NotionDatabaseAction(ApiAction):
             if not payload:
                 raise ValueError("properties or children must be provided for update")
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
+            session = await self._get_session()
+            await self._throttle.acquire()
+            async with session.patch(
+                f"{self.api_base_url}/pages/{page_id}",
+                headers=self._auth_headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+
+                if response.status != 200:
+                    raise await NotionAPIError.from_response(response)
+
+                result = await read_json(response)
+
+                return {
+                    "page_id": result.get("id"),
+                    "url": result.get("url"),
+                    "last_edited_time": result.get("last_edited_time"),
+                    "properties": result.get("properties", {})
+                }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.patch(
-                    f"{self.api_base_url}/pages/{page_id}",
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Notion API error: {error_data}")
-
-                    result = await response.json()
-
-                    return {
-                        "page_id": result.get("id"),
-                        "url": result.get("url"),
-                        "last_edited_time": result.get("last_edited_time"),
-                        "properties": result.get("properties", {})
-                    }
-
-        except ImportError:
-            raise Exception("aiohttp is required for Notion API requests")
         except Exception as e:
             logger.error(f"Database item update failed: {e}")
             raise
 
-    async def _get_database_info(self) -> Dict[str, Any]:
-        """Get database metadata and schema."""
+    async def _get_database_info(self, input_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get database metadata and schema (input_data is unused)."""
         try:
-            import aiohttp
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
+            session = await self._get_session()
+            await self._throttle.acquire()
+            async with session.get(
+                f"{self.api_base_url}/databases/{self.database_id}",
+                headers=self._auth_headers,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+
+                if response.status != 200:
+                    raise await NotionAPIError.from_response(response)
+
+                result = await read_json(response)
+
+                return {
+                    "id": result.get("id"),
+                    "title": result.get("title", [{}])[0].get("plain_text", ""),
+                    "description": result.get("description", []),
+                    "properties": result.get("properties", {}),
+                    "url": result.get("url"),
+                    "created_time": result.get("created_time"),
+                    "last_edited_time": result.get("last_edited_time")
+                }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_base_url}/databases/{self.database_id}",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Notion API error: {error_data}")
-
-                    result = await response.json()
-
-                    return {
-                        "id": result.get("id"),
-                        "title": result.get("title", [{}])[0].get("plain_text", ""),
-                        "description": result.get("description", []),
-                        "properties": result.get("properties", {}),
-                        "url": result.get("url"),
-                        "created_time": result.get("created_time"),
-                        "last_edited_time": result.get("last_edited_time")
-                    }
-
-        except ImportError:
-            raise Exception("aiohttp is required for Notion API requests")
         except Exception as e:
             logger.error(f"Database info retrieval failed: {e}")
             raise
@@ -285,21 +362,14 @@ class NotionDatabaseAction(ApiAction):
     async def test_connection(self) -> bool:
         """Test Notion API connection."""
         try:
-            import aiohttp
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_base_url}/users/me",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    return response.status == 200
+            session = await self._get_session()
+            await self._throttle.acquire()
+            async with session.get(
+                f"{self.api_base_url}/users/me",
+                headers=self._auth_headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                return response.status == 200
 
         except Exception as e:
             logger.error(f"Notion connection test failed: {e}")
@@ -307,78 +377,8 @@ class NotionDatabaseAction(ApiAction):
 
     def get_input_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action input."""
-        if self.operation == "create":
-            return {
-                "type": "object",
-                "properties": {
-                    "properties": {
-                        "type": "object",
-                        "description": "Database properties to set"
-                    },
-                    "children": {
-                        "type": "array",
-                        "description": "Page content blocks"
-                    },
-                    "cover": {
-                        "type": "object",
-                        "description": "Page cover image"
-                    },
-                    "icon": {
-                        "type": "object",
-                        "description": "Page icon"
-                    }
-                },
-                "required": ["properties"]
-            }
-        elif self.operation == "query":
-            return {
-                "type": "object",
-                "properties": {
-                    "filter": {
-                        "type": "object",
-                        "description": "Query filter conditions"
-                    },
-                    "sorts": {
-                        "type": "array",
-                        "description": "Sort specifications"
-                    },
-                    "page_size": {
-                        "type": "integer",
-                        "default": 100,
-                        "description": "Number of results per page"
-                    }
-                }
-            }
-        elif self.operation == "update":
-            return {
-                "type": "object",
-                "properties": {
-                    "page_id": {
-                        "type": "string",
-                        "description": "ID of the page to update"
-                    },
-                    "properties": {
-                        "type": "object",
-                        "description": "Properties to update"
-                    }
-                },
-                "required": ["page_id"]
-            }
-
-        return {"type": "object", "properties": {}}
+        return INPUT_SCHEMAS.get(self.operation, EMPTY_INPUT_SCHEMA)
 
     def get_output_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action output."""
-        return {
-            "type": "object",
-            "properties": {
-                "success": {"type": "boolean"},
-                "operation": {"type": "string"},
-                "database_id": {"type": "string"},
-                "result": {
-                    "description": "Operation result (structure depends on operation)"
-                },
-                "error": {"type": "string"}
-            },
-            "required": ["success", "operation"]
-        }
+        return OUTPUT_SCHEMA
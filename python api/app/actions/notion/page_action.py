@@ -4,15 +4,98 @@ This module implements actions for Notion page operations including
 creating pages, updating page content, and retrieving page information.
 """
 
+import asyncio
+import copy
+import functools
+import hashlib
 import logging
-from typing import Any, Dict, Optional, List
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, List, Tuple
 import json
 
-from ..base import ApiAction
+try:
+    import aiohttp
+except ImportError:  # reported when an operation runs
+    aiohttp = None
+
+from ..base import ApiAction, get_shared_session, read_json, SHARED_POOL_LIMIT, SHARED_POOL_LIMIT_PER_HOST
 from ...core.context import ExecutionContext
+from .base import NotionAPIError, auth_headers, get_throttle, with_retries
 
 logger = logging.getLogger(__name__)
 
+# Operations accepted by validate_config, in the order listed in errors
+VALID_OPERATIONS = ("create", "update", "get", "append")
+
+# Input schemas by operation; the rest use EMPTY_INPUT_SCHEMA
+INPUT_SCHEMAS = {
+    "create": {
+        "type": "object",
+        "properties": {
+            "parent_type": {
+                "type": "string",
+                "enum": ["database", "page"],
+                "default": "database",
+                "description": "Type of parent (database or page)"
+            },
+            "properties": {
+                "type": "object",
+                "description": "Page properties"
+            },
+            "children": {
+                "type": "array",
+                "description": "Content blocks for the page"
+            }
+        },
+        "required": ["properties"]
+    },
+    "append": {
+        "type": "object",
+        "properties": {
+            "children": {
+                "type": "array",
+                "description": "Content blocks to append"
+            }
+        },
+        "required": ["children"]
+    }
+}
+
+EMPTY_INPUT_SCHEMA = {"type": "object", "properties": {}}
+
+OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "success": {"type": "boolean"},
+        "operation": {"type": "string"},
+        "page_id": {"type": "string"},
+        "result": {
+            "description": "Operation result (structure depends on operation)"
+        },
+        "error": {"type": "string"}
+    },
+    "required": ["success", "operation"]
+}
+
+# Most child blocks Notion accepts in one append request
+APPEND_BATCH_SIZE = 100
+
+# Child blocks requested per page when listing a page's content
+BLOCKS_PAGE_SIZE = 100
+
+# Seconds a retrieved page is reused before it is fetched again. Off by
+# default: edits made elsewhere, including by NotionDatabaseAction, are not
+# seen until the entry expires.
+PAGE_CACHE_TTL = 0
+
+# Most retrieved pages kept in memory
+PAGE_CACHE_SIZE = 1024
+
+# Retrieved pages keyed by (API key digest, page ID), least recently used
+# first; values are (expiry time, result)
+_page_cache = OrderedDict()
+
 
 class NotionPageAction(ApiAction):
     """Action for Notion page operations.
@@ -32,6 +115,34 @@ class NotionPageAction(ApiAction):
         self.operation = config.get("operation", "create")  # create, update, get, append
         self.api_base_url = "https://api.notion.com/v1"
 
+        # Request headers are the same for every call
+        self._auth_headers = auth_headers(self.api_key)
+
+        # Connection pool limits. Notion allows about 3 requests/s per
+        # integration token, so larger pools only help across tokens.
+        self.http_pool_size = config.get("http_pool_size", SHARED_POOL_LIMIT)
+        self.http_per_host = config.get("http_per_host", SHARED_POOL_LIMIT_PER_HOST)
+
+        # Requests with this key are paced to stay under Notion's rate limit
+        self._throttle = get_throttle(self.api_key)
+
+        # Seconds to reuse a retrieved page (0 disables), and its cache key
+        self.page_cache_ttl = config.get("page_cache_ttl", PAGE_CACHE_TTL)
+        self._cache_key = (hashlib.blake2b(str(self.api_key).encode(), digest_size=8).digest(), self.page_id)
+
+        # Handler for the configured operation; None if it is unsupported
+        self._operation_handler = {
+            "create": functools.partial(with_retries, self._create_page),
+            "update": functools.partial(with_retries, self._update_page),
+            "get": functools.partial(with_retries, self._get_page),
+            # Each batch of blocks is retried separately
+            "append": self._append_to_page
+        }.get(self.operation)
+
+    async def _get_session(self):
+        """Get the shared session for this action's pool limits."""
+        return await get_shared_session(self.http_pool_size, self.http_per_host)
+
     async def validate_config(self) -> bool:
         """Validate Notion page action configuration."""
         if not self.api_key:
@@ -43,25 +154,25 @@ class NotionPageAction(ApiAction):
         if not self.parent_id and self.operation == "create":
             raise ValueError("parent_id is required for page creation")
 
-        valid_operations = ["create", "update", "get", "append"]
-        if self.operation not in valid_operations:
-            raise ValueError(f"Invalid operation: {self.operation}. Must be one of {valid_operations}")
+        for name in ("http_pool_size", "http_per_host"):
+            value = getattr(self, name)
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive integer")
+
+        if self.operation not in VALID_OPERATIONS:
+            raise ValueError(f"Invalid operation: {self.operation}. Must be one of {list(VALID_OPERATIONS)}")
 
         return True
 
     async def execute(self, input_data: Dict[str, Any], context: ExecutionContext) -> Dict[str, Any]:
         """Execute the Notion page operation."""
         try:
-            if self.operation == "create":
-                result = await self._create_page(input_data)
-            elif self.operation == "update":
-                result = await self._update_page(input_data)
-            elif self.operation == "get":
-                result = await self._get_page(input_data)
-            elif self.operation == "append":
-                result = await self._append_to_page(input_data)
-            else:
+            if aiohttp is None:
+                raise Exception("aiohttp is required for Notion API requests")
+
+            if self._operation_handler is None:
                 raise ValueError(f"Unsupported operation: {self.operation}")
+            result = await self._operation_handler(input_data)
 
             return {
                 "success": True,
@@ -82,8 +193,6 @@ class NotionPageAction(ApiAction):
     async def _create_page(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new Notion page."""
         try:
-            import aiohttp
-
             # Determine parent type (database or page)
             parent_type = input_data.get("parent_type", "database")  # database or page
 
@@ -109,37 +218,29 @@ class NotionPageAction(ApiAction):
             if "icon" in input_data:
                 payload["icon"] = input_data["icon"]
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
+            session = await self._get_session()
+            await self._throttle.acquire()
+            async with session.post(
+                f"{self.api_base_url}/pages",
+                headers=self._auth_headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+
+                if response.status != 200:
+                    raise await NotionAPIError.from_response(response)
+
+                result = await read_json(response)
+
+                return {
+                    "page_id": result.get("id"),
+                    "url": result.get("url"),
+                    "created_time": result.get("created_time"),
+                    "last_edited_time": result.get("last_edited_time"),
+                    "properties": result.get("properties", {}),
+                    "parent_type": parent_type
+                }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_base_url}/pages",
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Notion API error: {error_data}")
-
-                    result = await response.json()
-
-                    return {
-                        "page_id": result.get("id"),
-                        "url": result.get("url"),
-                        "created_time": result.get("created_time"),
-                        "last_edited_time": result.get("last_edited_time"),
-                        "properties": result.get("properties", {}),
-                        "parent_type": parent_type
-                    }
-
-        except ImportError:
-            raise Exception("aiohttp is required for Notion API requests")
         except Exception as e:
             logger.error(f"Page creation failed: {e}")
             raise
@@ -147,8 +248,6 @@ class NotionPageAction(ApiAction):
     async def _update_page(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing Notion page."""
         try:
-            import aiohttp
-
             payload = {}
 
             # Update properties if provided
@@ -164,150 +263,208 @@ class NotionPageAction(ApiAction):
             if not payload:
                 raise ValueError("properties, cover, or icon must be provided for update")
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
+            session = await self._get_session()
+            await self._throttle.acquire()
+            async with session.patch(
+                f"{self.api_base_url}/pages/{self.page_id}",
+                headers=self._auth_headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+
+                if response.status != 200:
+                    raise await NotionAPIError.from_response(response)
+
+                result = await read_json(response)
+
+                return {
+                    "page_id": result.get("id"),
+                    "url": result.get("url"),
+                    "last_edited_time": result.get("last_edited_time"),
+                    "properties": result.get("properties", {})
+                }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.patch(
-                    f"{self.api_base_url}/pages/{self.page_id}",
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Notion API error: {error_data}")
-
-                    result = await response.json()
-
-                    return {
-                        "page_id": result.get("id"),
-                        "url": result.get("url"),
-                        "last_edited_time": result.get("last_edited_time"),
-                        "properties": result.get("properties", {})
-                    }
-
-        except ImportError:
-            raise Exception("aiohttp is required for Notion API requests")
         except Exception as e:
             logger.error(f"Page update failed: {e}")
             raise
+        finally:
+            _page_cache.pop(self._cache_key, None)
 
     async def _get_page(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Retrieve a Notion page with its content."""
-        try:
-            import aiohttp
+        """Retrieve a Notion page with its content.
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
+        The page and its blocks are fetched concurrently. With page_cache_ttl
+        set, complete results are reused for that many seconds, or until this
+        action updates or appends to the page.
+        """
+        try:
+            cached = self._cached_page()
+            if cached is not None:
+                return cached
+
+            session = await self._get_session()
+            page_result, listing = await asyncio.gather(
+                self._fetch_page(session),
+                self._fetch_blocks(session),
+                return_exceptions=True
+            )
+            if isinstance(page_result, BaseException):
+                raise page_result
+            if isinstance(listing, BaseException):
+                raise listing
+            blocks, complete = listing
+
+            result = {
+                "page_id": page_result.get("id"),
+                "url": page_result.get("url"),
+                "title": page_result.get("properties", {}).get("title", {}).get("title", [{}])[0].get("plain_text", ""),
+                "properties": page_result.get("properties", {}),
+                "created_time": page_result.get("created_time"),
+                "last_edited_time": page_result.get("last_edited_time"),
+                "blocks": blocks,
+                "block_count": len(blocks)
             }
+            if complete:
+                self._cache_page(result)
+            return result
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_base_url}/pages/{self.page_id}",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Notion API error: {error_data}")
-
-                    page_result = await response.json()
-
-                    # Also get page content (blocks)
-                    async with session.get(
-                        f"{self.api_base_url}/blocks/{self.page_id}/children",
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=30)
-                    ) as blocks_response:
-
-                        blocks_result = await blocks_response.json() if blocks_response.status == 200 else {"results": []}
-
-                        return {
-                            "page_id": page_result.get("id"),
-                            "url": page_result.get("url"),
-                            "title": page_result.get("properties", {}).get("title", {}).get("title", [{}])[0].get("plain_text", ""),
-                            "properties": page_result.get("properties", {}),
-                            "created_time": page_result.get("created_time"),
-                            "last_edited_time": page_result.get("last_edited_time"),
-                            "blocks": blocks_result.get("results", []),
-                            "block_count": len(blocks_result.get("results", []))
-                        }
-
-        except ImportError:
-            raise Exception("aiohttp is required for Notion API requests")
         except Exception as e:
             logger.error(f"Page retrieval failed: {e}")
             raise
 
+    def _cached_page(self) -> Optional[Dict[str, Any]]:
+        """Get a copy of this page's unexpired cached result, if any."""
+        if self.page_cache_ttl <= 0:
+            return None
+
+        entry = _page_cache.get(self._cache_key)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del _page_cache[self._cache_key]
+            return None
+
+        _page_cache.move_to_end(self._cache_key)
+        return copy.deepcopy(result)
+
+    def _cache_page(self, result: Dict[str, Any]) -> None:
+        """Store a retrieved page, evicting the least recently used one if full."""
+        if self.page_cache_ttl <= 0:
+            return
+
+        _page_cache[self._cache_key] = (time.monotonic() + self.page_cache_ttl, copy.deepcopy(result))
+        _page_cache.move_to_end(self._cache_key)
+        if len(_page_cache) > PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+
+    async def _fetch_page(self, session) -> Dict[str, Any]:
+        """Fetch the page object."""
+        await self._throttle.acquire()
+        async with session.get(
+            f"{self.api_base_url}/pages/{self.page_id}",
+            headers=self._auth_headers,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+
+            if response.status != 200:
+                raise await NotionAPIError.from_response(response)
+
+            return await read_json(response)
+
+    async def _fetch_blocks(self, session) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fetch all of the page's child blocks, following Notion's cursors.
+
+        Returns the blocks and whether the listing succeeded.
+
+        A rate limit, or an error once some blocks have been listed, raises
+        NotionAPIError so the whole retrieval is retried or fails rather
+        than returning part of the page. Any other error on the first
+        request gives an empty, incomplete listing.
+        """
+        blocks = []
+        params = {"page_size": BLOCKS_PAGE_SIZE}
+        while True:
+            await self._throttle.acquire()
+            async with session.get(
+                f"{self.api_base_url}/blocks/{self.page_id}/children",
+                headers=self._auth_headers,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+
+                if response.status != 200:
+                    if response.status == 429 or "start_cursor" in params:
+                        raise await NotionAPIError.from_response(response)
+                    logger.warning(f"Could not list blocks of page {self.page_id}: HTTP {response.status}")
+                    return blocks, False
+
+                result = await read_json(response)
+
+            blocks.extend(result.get("results", []))
+            next_cursor = result.get("next_cursor")
+            if not result.get("has_more") or not next_cursor:
+                return blocks, True
+            params = {"page_size": BLOCKS_PAGE_SIZE, "start_cursor": next_cursor}
+
     async def _append_to_page(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Append content blocks to an existing page."""
-        try:
-            import aiohttp
+        """Append content blocks to an existing page.
 
+        Blocks are sent in batches of at most APPEND_BATCH_SIZE, one after
+        another so they keep their order on the page. Each batch is retried
+        on its own if it is rate limited.
+        """
+        try:
             children = input_data.get("children", [])
             if not children:
                 raise ValueError("children is required for append operation")
 
-            payload = {"children": children}
+            results = []
+            for start in range(0, len(children), APPEND_BATCH_SIZE):
+                batch = children[start:start + APPEND_BATCH_SIZE]
+                results.extend(await with_retries(self._append_blocks, batch))
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
+            return {
+                "page_id": self.page_id,
+                "blocks_added": len(children),
+                "results": results
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.patch(
-                    f"{self.api_base_url}/blocks/{self.page_id}/children",
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-
-                    if response.status != 200:
-                        error_data = await response.json()
-                        raise Exception(f"Notion API error: {error_data}")
-
-                    result = await response.json()
-
-                    return {
-                        "page_id": self.page_id,
-                        "blocks_added": len(children),
-                        "results": result.get("results", [])
-                    }
-
-        except ImportError:
-            raise Exception("aiohttp is required for Notion API requests")
         except Exception as e:
             logger.error(f"Page append failed: {e}")
             raise
+        finally:
+            _page_cache.pop(self._cache_key, None)
+
+    async def _append_blocks(self, children: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Append one batch of blocks and return the created blocks."""
+        session = await self._get_session()
+        await self._throttle.acquire()
+        async with session.patch(
+            f"{self.api_base_url}/blocks/{self.page_id}/children",
+            headers=self._auth_headers,
+            json={"children": children},
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+
+            if response.status != 200:
+                raise await NotionAPIError.from_response(response)
+
+            result = await read_json(response)
+            return result.get("results", [])
 
     async def test_connection(self) -> bool:
         """Test Notion API connection."""
         try:
-            import aiohttp
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.api_base_url}/users/me",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    return response.status == 200
+            session = await self._get_session()
+            await self._throttle.acquire()
+            async with session.get(
+                f"{self.api_base_url}/users/me",
+                headers=self._auth_headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                return response.status == 200
 
         except Exception as e:
             logger.error(f"Notion connection test failed: {e}")
@@ -315,53 +472,8 @@ class NotionPageAction(ApiAction):
 
     def get_input_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action input."""
-        if self.operation == "create":
-            return {
-                "type": "object",
-                "properties": {
-                    "parent_type": {
-                        "type": "string",
-                        "enum": ["database", "page"],
-                        "default": "database",
-                        "description": "Type of parent (database or page)"
-                    },
-                    "properties": {
-                        "type": "object",
-                        "description": "Page properties"
-                    },
-                    "children": {
-                        "type": "array",
-                        "description": "Content blocks for the page"
-                    }
-                },
-                "required": ["properties"]
-            }
-        elif self.operation == "append":
-            return {
-                "type": "object",
-                "properties": {
-                    "children": {
-                        "type": "array",
-                        "description": "Content blocks to append"
-                    }
-                },
-                "required": ["children"]
-            }
-
-        return {"type": "object", "properties": {}}
+        return INPUT_SCHEMAS.get(self.operation, EMPTY_INPUT_SCHEMA)
 
     def get_output_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action output."""
-        return {
-            "type": "object",
-            "properties": {
-                "success": {"type": "boolean"},
-                "operation": {"type": "string"},
-                "page_id": {"type": "string"},
-                "result": {
-                    "description": "Operation result (structure depends on operation)"
-                },
-                "error": {"type": "string"}
-            },
-            "required": ["success", "operation"]
-        }
+        return OUTPUT_SCHEMA
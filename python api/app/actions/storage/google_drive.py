@@ -4,17 +4,102 @@ This module implements an action for interacting with Google Drive.
 It can upload, download, list, and manage files in Google Drive.
 """
 
+import asyncio
+import base64
+import functools
+import hashlib
+import json
 import logging
 import io
 import os
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 
-from ..base import BaseAction
+try:
+    import httplib2
+    from google.oauth2 import service_account
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+    from googleapiclient.http import HttpRequest, MediaIoBaseDownload, MediaIoBaseUpload
+except ImportError:  # reported when the Drive service is first needed
+    build = None
+
+from ..base import BaseAction, json_serialize
 from ...core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+# Supported operations; a tuple so error messages keep this order
+VALID_OPERATIONS = ("upload", "download", "list", "create_folder", "delete", "get_metadata")
+
+# Input schemas for the operations that take input
+INPUT_SCHEMAS = {
+    "upload": {
+        "type": "object",
+        "properties": {
+            "file_content": {
+                "description": "Content of the file to upload"
+            },
+            "file_name": {
+                "type": "string",
+                "description": "Name of the file"
+            },
+            "mime_type": {
+                "type": "string",
+                "description": "MIME type of the file"
+            }
+        },
+        "required": ["file_content"]
+    },
+    "list": {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Search query for files"
+            },
+            "page_size": {
+                "type": "integer",
+                "default": 100,
+                "description": "Number of files to return per page (default 1000 with auto_paginate)"
+            },
+            "page_token": {
+                "type": "string",
+                "description": "next_page_token from a previous listing, to continue it"
+            },
+            "auto_paginate": {
+                "type": "boolean",
+                "default": False,
+                "description": "Follow page tokens and return every matching file"
+            }
+        }
+    }
+}
+
+EMPTY_INPUT_SCHEMA = {"type": "object", "properties": {}}
+
+OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "success": {"type": "boolean"},
+        "operation": {"type": "string"},
+        "result": {
+            "description": "Operation result (structure depends on operation)"
+        },
+        "error": {"type": "string"}
+    },
+    "required": ["success", "operation"]
+}
+
+# Largest page size the Drive files.list endpoint accepts
+MAX_LIST_PAGE_SIZE = 1000
+
+# Bytes fetched per request when downloading file content
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Uploads larger than this are sent resumably, one chunk of this size at a time
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+
 
 class GoogleDriveAction(BaseAction):
     """Action for Google Drive file operations.
@@ -27,6 +112,9 @@ class GoogleDriveAction(BaseAction):
     - File metadata retrieval
     """
 
+    # Drive services already built, keyed by a digest of their credentials
+    _service_cache: Dict[bytes, Any] = {}
+
     def __init__(self, config: Dict[str, Any], connection_id: Optional[str] = None):
         super().__init__(config, connection_id)
         self.operation = config.get("operation", "upload")  # upload, download, list, create_folder, delete
@@ -39,14 +127,23 @@ class GoogleDriveAction(BaseAction):
         self.mime_type = config.get("mime_type", "")
         self.convert_to_google_format = config.get("convert_to_google_format", False)
 
+        # Handler for the configured operation, called as (service, input_data)
+        self._operation_handler = {
+            "upload": self._upload_file,
+            "download": self._download_file,
+            "list": self._list_files,
+            "create_folder": self._create_folder,
+            "delete": self._delete_file,
+            "get_metadata": self._get_file_metadata
+        }.get(self.operation)
+
     async def validate_config(self) -> bool:
         """Validate Google Drive action configuration."""
         if not any([self.credentials_path, self.credentials_json, self.service_account_key]):
             raise ValueError("Google Drive credentials are required (credentials_path, credentials_json, or service_account_key)")
 
-        valid_operations = ["upload", "download", "list", "create_folder", "delete", "get_metadata"]
-        if self.operation not in valid_operations:
-            raise ValueError(f"Invalid operation: {self.operation}. Must be one of {valid_operations}")
+        if self.operation not in VALID_OPERATIONS:
+            raise ValueError(f"Invalid operation: {self.operation}. Must be one of {list(VALID_OPERATIONS)}")
 
         if self.operation in ["upload", "download"] and not self.file_name:
             raise ValueError("file_name is required for upload/download operations")
@@ -63,20 +160,9 @@ class GoogleDriveAction(BaseAction):
             service = await self._get_drive_service()
 
             # Execute operation
-            if self.operation == "upload":
-                result = await self._upload_file(service, input_data)
-            elif self.operation == "download":
-                result = await self._download_file(service)
-            elif self.operation == "list":
-                result = await self._list_files(service, input_data)
-            elif self.operation == "create_folder":
-                result = await self._create_folder(service, input_data)
-            elif self.operation == "delete":
-                result = await self._delete_file(service)
-            elif self.operation == "get_metadata":
-                result = await self._get_file_metadata(service)
-            else:
+            if self._operation_handler is None:
                 raise ValueError(f"Unsupported operation: {self.operation}")
+            result = await self._operation_handler(service, input_data)
 
             return {
                 "success": True,
@@ -92,12 +178,28 @@ class GoogleDriveAction(BaseAction):
                 "operation": self.operation
             }
 
+    def _credentials_fingerprint(self) -> bytes:
+        """Digest identifying the configured credentials."""
+        source = self.service_account_key or self.credentials_path or self.credentials_json
+        if not isinstance(source, str):
+            source = json.dumps(source, sort_keys=True)
+        return hashlib.blake2b(source.encode(), digest_size=16).digest()
+
     async def _get_drive_service(self):
-        """Initialize and return Google Drive service."""
-        try:
-            from googleapiclient.discovery import build
-            from google.oauth2 import service_account
+        """Initialize and return Google Drive service.
+
+        Services are reused across actions with the same credentials, so
+        keys are parsed and the discovery document is loaded only once.
+        """
+        fingerprint = self._credentials_fingerprint()
+        service = self._service_cache.get(fingerprint)
+        if service is not None:
+            return service
+
+        if build is None:
+            raise RuntimeError("google-api-python-client and google-auth are required for Google Drive operations")
 
+        try:
             # Load credentials
             creds = None
 
@@ -109,12 +211,10 @@ class GoogleDriveAction(BaseAction):
                 )
             elif self.credentials_path:
                 # OAuth2 credentials from file
-                from google.oauth2.credentials import Credentials
                 # This would require proper OAuth2 flow implementation
                 raise NotImplementedError("OAuth2 flow not implemented")
             elif self.credentials_json:
                 # Credentials from JSON string
-                import json
                 creds_data = json.loads(self.credentials_json)
                 creds = service_account.Credentials.from_service_account_info(
                     creds_data,
@@ -124,16 +224,33 @@ class GoogleDriveAction(BaseAction):
             if not creds:
                 raise ValueError("Could not load Google Drive credentials")
 
-            # Build Drive service
-            service = build('drive', 'v3', credentials=creds)
+            # Build Drive service from the discovery document bundled with
+            # the client library rather than fetching it over the network.
+            # Each request gets its own Http object, since httplib2 is not
+            # thread-safe and requests run in the default executor.
+            def build_request(http, *args, **kwargs):
+                return HttpRequest(AuthorizedHttp(creds, http=httplib2.Http()), *args, **kwargs)
+
+            loop = asyncio.get_running_loop()
+            service = await loop.run_in_executor(None, functools.partial(
+                build, 'drive', 'v3',
+                http=AuthorizedHttp(creds, http=httplib2.Http()),
+                requestBuilder=build_request,
+                static_discovery=True,
+                cache_discovery=False
+            ))
+            self._service_cache[fingerprint] = service
             return service
 
-        except ImportError:
-            raise RuntimeError("google-api-python-client and google-auth are required for Google Drive operations")
         except Exception as e:
             logger.error(f"Failed to initialize Google Drive service: {e}")
             raise
 
+    async def _execute(self, request) -> Any:
+        """Run a Drive API request without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, request.execute)
+
     async def _upload_file(self, service, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Upload a file to Google Drive."""
         try:
@@ -150,59 +267,71 @@ class GoogleDriveAction(BaseAction):
             if self.parent_folder_id:
                 file_metadata['parents'] = [self.parent_folder_id]
 
-            # Prepare file content
-            if isinstance(file_content, str):
+            # Prepare file content; bytes-like content is uploaded as given
+            # (BytesIO shares a bytes object's buffer rather than copying it)
+            if isinstance(file_content, (bytes, bytearray, memoryview)):
+                pass
+            elif isinstance(file_content, str):
                 file_content = file_content.encode('utf-8')
             elif isinstance(file_content, dict):
-                import json
-                file_content = json.dumps(file_content).encode('utf-8')
+                file_content = json_serialize(file_content).encode('utf-8')
                 mime_type = "application/json"
-
-            media = {
-                'mimeType': mime_type,
-                'body': io.BytesIO(file_content)
-            }
-
-            # Upload file
-            file = service.files().create(
+            else:
+                raise TypeError(f"file_content must be str, bytes or dict, not {type(file_content).__name__}")
+            size = memoryview(file_content).nbytes
+
+            # Small files go in a single request; larger ones resumably so a
+            # failed chunk is retried without resending the whole file
+            media = MediaIoBaseUpload(
+                io.BytesIO(file_content),
+                mimetype=mime_type,
+                chunksize=UPLOAD_CHUNK_SIZE,
+                resumable=size > UPLOAD_CHUNK_SIZE
+            )
+
+            # Upload file; execute() sends the chunks of a resumable upload
+            file = await self._execute(service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id,name,webViewLink,createdTime'
-            ).execute()
+            ))
 
             return {
                 "file_id": file.get('id'),
                 "file_name": file.get('name'),
                 "web_view_link": file.get('webViewLink'),
                 "created_time": file.get('createdTime'),
-                "size": len(file_content)
+                "size": size
             }
 
         except Exception as e:
             logger.error(f"File upload failed: {e}")
             raise
 
-    async def _download_file(self, service) -> Dict[str, Any]:
+    async def _download_file(self, service, input_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Download a file from Google Drive."""
         try:
             if not self.file_id:
                 raise ValueError("file_id is required for download")
 
             # Get file metadata first
-            file_metadata = service.files().get(fileId=self.file_id, fields='name,mimeType,size').execute()
+            file_metadata = await self._execute(service.files().get(fileId=self.file_id, fields='name,mimeType,size'))
 
-            # Download file content
+            # Download file content in chunks straight into one buffer
             request = service.files().get_media(fileId=self.file_id)
             file_content = io.BytesIO()
-            downloader = request.execute()
-            file_content.write(downloader)
+            downloader = MediaIoBaseDownload(file_content, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+            loop = asyncio.get_running_loop()
+            done = False
+            while not done:
+                _, done = await loop.run_in_executor(None, downloader.next_chunk)
 
-            file_content.seek(0)
-            content = file_content.read()
+            # A view of the buffer, so decoding doesn't copy the bytes first
+            content = file_content.getbuffer()
 
             # Try to decode as text, fallback to base64 for binary
             try:
-                text_content = content.decode('utf-8')
+                text_content = str(content, 'utf-8')
                 return {
                     "file_name": file_metadata.get('name'),
                     "content": text_content,
@@ -211,7 +340,6 @@ class GoogleDriveAction(BaseAction):
                     "encoding": "utf-8"
                 }
             except UnicodeDecodeError:
-                import base64
                 return {
                     "file_name": file_metadata.get('name'),
                     "content": base64.b64encode(content).decode('utf-8'),
@@ -228,8 +356,10 @@ class GoogleDriveAction(BaseAction):
         """List files in Google Drive."""
         try:
             query = input_data.get("query", "")
-            page_size = input_data.get("page_size", 100)
+            auto_paginate = input_data.get("auto_paginate", False)
+            page_size = input_data.get("page_size", MAX_LIST_PAGE_SIZE if auto_paginate else 100)
             order_by = input_data.get("order_by", "modifiedTime desc")
+            page_token = input_data.get("page_token")
 
             # Build query
             if self.parent_folder_id and not query:
@@ -237,16 +367,25 @@ class GoogleDriveAction(BaseAction):
             elif self.parent_folder_id and query:
                 query = f"'{self.parent_folder_id}' in parents and ({query})"
 
-            # List files
-            results = service.files().list(
-                q=query,
-                pageSize=page_size,
-                fields="nextPageToken, files(id, name, mimeType, modifiedTime, size, webViewLink)",
-                orderBy=order_by
-            ).execute()
-
-            files = results.get('files', [])
-            next_page_token = results.get('nextPageToken')
+            # List files; each page's token comes from the previous
+            # response, so with auto_paginate the pages are fetched in turn
+            list_params = {
+                "q": query,
+                "pageSize": page_size,
+                "fields": "nextPageToken, files(id, name, mimeType, modifiedTime, size, webViewLink)",
+                "orderBy": order_by
+            }
+            files = []
+            while True:
+                if page_token:
+                    list_params["pageToken"] = page_token
+                results = await self._execute(service.files().list(**list_params))
+
+                files.extend(results.get('files', []))
+                next_page_token = results.get('nextPageToken')
+                if not auto_paginate or not next_page_token:
+                    break
+                page_token = next_page_token
 
             return {
                 "files": files,
@@ -272,10 +411,10 @@ class GoogleDriveAction(BaseAction):
             if self.parent_folder_id:
                 file_metadata['parents'] = [self.parent_folder_id]
 
-            folder = service.files().create(
+            folder = await self._execute(service.files().create(
                 body=file_metadata,
                 fields='id,name,webViewLink,createdTime'
-            ).execute()
+            ))
 
             return {
                 "folder_id": folder.get('id'),
@@ -288,13 +427,13 @@ class GoogleDriveAction(BaseAction):
             logger.error(f"Folder creation failed: {e}")
             raise
 
-    async def _delete_file(self, service) -> Dict[str, Any]:
+    async def _delete_file(self, service, input_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Delete a file from Google Drive."""
         try:
             if not self.file_id:
                 raise ValueError("file_id is required for delete operation")
 
-            service.files().delete(fileId=self.file_id).execute()
+            await self._execute(service.files().delete(fileId=self.file_id))
 
             return {
                 "deleted": True,
@@ -305,16 +444,16 @@ class GoogleDriveAction(BaseAction):
             logger.error(f"File deletion failed: {e}")
             raise
 
-    async def _get_file_metadata(self, service) -> Dict[str, Any]:
+    async def _get_file_metadata(self, service, input_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get file metadata from Google Drive."""
         try:
             if not self.file_id:
                 raise ValueError("file_id is required for metadata operation")
 
-            file = service.files().get(
+            file = await self._execute(service.files().get(
                 fileId=self.file_id,
                 fields='id,name,mimeType,modifiedTime,createdTime,size,webViewLink,owners,permissions'
-            ).execute()
+            ))
 
             return {
                 "file_id": file.get('id'),
@@ -338,7 +477,7 @@ class GoogleDriveAction(BaseAction):
             service = await self._get_drive_service()
 
             # Try to list files (should work if credentials are valid)
-            results = service.files().list(pageSize=1, fields="files(id)").execute()
+            results = await self._execute(service.files().list(pageSize=1, fields="files(id)"))
             return "files" in results
 
         except Exception as e:
@@ -347,53 +486,8 @@ class GoogleDriveAction(BaseAction):
 
     def get_input_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action input."""
-        if self.operation == "upload":
-            return {
-                "type": "object",
-                "properties": {
-                    "file_content": {
-                        "description": "Content of the file to upload"
-                    },
-                    "file_name": {
-                        "type": "string",
-                        "description": "Name of the file"
-                    },
-                    "mime_type": {
-                        "type": "string",
-                        "description": "MIME type of the file"
-                    }
-                },
-                "required": ["file_content"]
-            }
-        elif self.operation == "list":
-            return {
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query for files"
-                    },
-                    "page_size": {
-                        "type": "integer",
-                        "default": 100,
-                        "description": "Number of files to return"
-                    }
-                }
-            }
-
-        return {"type": "object", "properties": {}}
+        return INPUT_SCHEMAS.get(self.operation, EMPTY_INPUT_SCHEMA)
 
     def get_output_schema(self) -> Dict[str, Any]:
         """Get JSON schema for action output."""
-        return {
-            "type": "object",
-            "properties": {
-                "success": {"type": "boolean"},
-                "operation": {"type": "string"},
-                "result": {
-                    "description": "Operation result (structure depends on operation)"
-                },
-                "error": {"type": "string"}
-            },
-            "required": ["success", "operation"]
-        }
+        return OUTPUT_SCHEMA
@@ -4,17 +4,27 @@ This module implements an action for uploading files to Amazon S3.
 It can upload, download, list, and manage files in S3 buckets.
 """
 
+import asyncio
+import base64
+import functools
+import hashlib
 import logging
 import io
-import json
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 
-from ..base import BaseAction
+from ..base import BaseAction, json_serialize
 from ...core.context import ExecutionContext
 
 logger = logging.getLogger(__name__)
 
+# Default botocore connection pool size per client (botocore's own default)
+S3_POOL_SIZE = 10
+
+# boto3 clients shared by actions with the same credentials, region and
+# pool size, so their connection pools outlive a single execution
+_s3_clients: Dict[tuple, Any] = {}
+
 
 class S3UploadAction(BaseAction):
     """Action for Amazon S3 file operations.
@@ -43,6 +53,16 @@ class S3UploadAction(BaseAction):
         self.metadata = config.get("metadata", {})
         self.tags = config.get("tags", {})
         self.expiration = config.get("expiration", 3600)  # For presigned URLs
+        self.http_pool_size = config.get("http_pool_size", S3_POOL_SIZE)
+
+        # Secrets are hashed so the client cache never holds them as keys
+        secrets = f"{self.secret_access_key}\0{self.session_token}".encode()
+        self._client_key = (
+            self.access_key_id,
+            hashlib.blake2b(secrets, digest_size=16).digest(),
+            self.region,
+            self.http_pool_size
+        )
 
     async def validate_config(self) -> bool:
         """Validate S3 action configuration."""
@@ -56,6 +76,9 @@ class S3UploadAction(BaseAction):
         if self.operation not in valid_operations:
             raise ValueError(f"Invalid operation: {self.operation}. Must be one of {valid_operations}")
 
+        if not isinstance(self.http_pool_size, int) or self.http_pool_size < 1:
+            raise ValueError("http_pool_size must be a positive integer")
+
         if self.operation in ["upload", "download"] and not self.file_key:
             raise ValueError("file_key is required for upload/download operations")
 
@@ -106,7 +129,11 @@ class S3UploadAction(BaseAction):
             }
 
     async def _get_s3_client(self):
-        """Initialize and return S3 client."""
+        """Return the shared S3 client for this action's credentials, creating it on first use."""
+        s3_client = _s3_clients.get(self._client_key)
+        if s3_client is not None:
+            return s3_client
+
         try:
             import boto3
             from botocore.config import Config
@@ -126,10 +153,11 @@ class S3UploadAction(BaseAction):
                 retries={
                     'max_attempts': 3,
                     'mode': 'standard'
-                }
+                },
+                max_pool_connections=self.http_pool_size
             )
 
-            s3_client = boto3.client('s3', **aws_config, config=config)
+            s3_client = _s3_clients[self._client_key] = boto3.client('s3', **aws_config, config=config)
             return s3_client
 
         except ImportError:
@@ -138,6 +166,15 @@ class S3UploadAction(BaseAction):
             logger.error(f"Failed to initialize S3 client: {e}")
             raise
 
+    async def _call(self, method, **kwargs) -> Any:
+        """Run a blocking boto3 call in the default executor.
+
+        Concurrent executions then use the client's connection pool in
+        parallel instead of stalling the event loop one request at a time.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(method, **kwargs))
+
     async def _upload_file(self, s3_client, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Upload a file to S3."""
         try:
@@ -151,7 +188,7 @@ class S3UploadAction(BaseAction):
             if isinstance(file_content, str):
                 file_content = file_content.encode('utf-8')
             elif isinstance(file_content, dict):
-                file_content = json.dumps(file_content).encode('utf-8')
+                file_content = json_serialize(file_content).encode('utf-8')
                 if not content_type or content_type == "text/plain":
                     content_type = "application/json"
 
@@ -172,7 +209,7 @@ class S3UploadAction(BaseAction):
                 upload_params['Tagging'] = tag_string
 
             # Upload file
-            response = s3_client.put_object(**upload_params)
+            response = await self._call(s3_client.put_object, **upload_params)
 
             return {
                 "file_key": file_key,
@@ -195,12 +232,13 @@ class S3UploadAction(BaseAction):
                 raise ValueError("file_key is required for download")
 
             # Download file
-            response = s3_client.get_object(
+            response = await self._call(
+                s3_client.get_object,
                 Bucket=self.bucket_name,
                 Key=self.file_key
             )
 
-            file_content = response['Body'].read()
+            file_content = await self._call(response['Body'].read)
 
             # Try to decode as text, fallback to base64 for binary
             content_type = response.get('ContentType', 'application/octet-stream')
@@ -217,7 +255,6 @@ class S3UploadAction(BaseAction):
                         "encoding": "utf-8"
                     }
                 else:
-                    import base64
                     return {
                         "file_key": self.file_key,
                         "content": base64.b64encode(file_content).decode('utf-8'),
@@ -228,7 +265,6 @@ class S3UploadAction(BaseAction):
                         "encoding": "base64"
                     }
             except UnicodeDecodeError:
-                import base64
                 return {
                     "file_key": self.file_key,
                     "content": base64.b64encode(file_content).decode('utf-8'),
@@ -262,7 +298,7 @@ class S3UploadAction(BaseAction):
             if continuation_token:
                 list_params['ContinuationToken'] = continuation_token
 
-            response = s3_client.list_objects_v2(**list_params)
+            response = await self._call(s3_client.list_objects_v2, **list_params)
 
             files = []
             if 'Contents' in response:
@@ -293,7 +329,8 @@ class S3UploadAction(BaseAction):
             if not self.file_key:
                 raise ValueError("file_key is required for delete")
 
-            response = s3_client.delete_object(
+            response = await self._call(
+                s3_client.delete_object,
                 Bucket=self.bucket_name,
                 Key=self.file_key
             )
@@ -351,7 +388,8 @@ class S3UploadAction(BaseAction):
                 'Key': source_key
             }
 
-            response = s3_client.copy_object(
+            response = await self._call(
+                s3_client.copy_object,
                 CopySource=copy_source,
                 Bucket=self.bucket_name,
                 Key=destination_key
@@ -398,7 +436,8 @@ class S3UploadAction(BaseAction):
             s3_client = await self._get_s3_client()
 
             # Try to list objects (should work if credentials are valid)
-            response = s3_client.list_objects_v2(
+            response = await self._call(
+                s3_client.list_objects_v2,
                 Bucket=self.bucket_name,
                 MaxKeys=1
             )
@@ -78,6 +78,10 @@ async def shutdown_event():
             if "scheduler" in _services:
                 await _services["scheduler"].stop()
 
+            # Close the HTTP connection pool shared by actions
+            from ..actions.base import close_shared_session
+            await close_shared_session()
+
             logger.info("FlowForge services shutdown complete")
 
         except Exception as e:
@@ -107,7 +107,10 @@ async def execute_action(
         # Execute the action
         import time
         start_time = time.time()
-        result = await action_instance.execute(input_data, context)
+        try:
+            result = await action_instance.execute(input_data, context)
+        finally:
+            await action_instance.close()
         execution_time = time.time() - start_time
 
         return ActionExecutionResponse(
@@ -154,7 +157,10 @@ async def test_action_config(
         await action_instance.validate_config()
 
         # Test connection
-        connection_test = await action_instance.test_connection()
+        try:
+            connection_test = await action_instance.test_connection()
+        finally:
+            await action_instance.close()
 
         return ActionTestResponse(
             valid=True,
@@ -221,6 +227,7 @@ async def test_http_request(
     test_data: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Test an HTTP request configuration."""
+    http_action = None
     try:
         http_action = HTTPAction(config)
 
@@ -262,6 +269,9 @@ async def test_http_request(
             "test_request_made": False,
             "error": str(e)
         }
+    finally:
+        if http_action is not None:
+            await http_action.close()
 
 
 @router.post("/openai/test-api")
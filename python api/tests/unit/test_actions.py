@@ -15,10 +15,15 @@ This module contains comprehensive unit tests for:
 
 import pytest
 import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 from typing import Dict, Any
 
-from app.actions.http.request import HTTPAction
+from app.actions.http_action import HTTPAction
 from app.actions.http.webhook_response import WebhookResponseAction
 from app.actions.ai.openai_action import OpenAIAction
 from app.actions.ai.claude_action import ClaudeAction
@@ -30,6 +35,7 @@ from app.actions.data.filter import DataFilterAction
 from app.actions.data.aggregate import DataAggregateAction
 from app.actions.storage.google_drive import GoogleDriveAction
 from app.actions.storage.s3_upload import S3UploadAction
+from app.actions.notion.base import NotionAPIError, with_retries
 from app.actions.notion.database_action import NotionDatabaseAction
 from app.actions.notion.page_action import NotionPageAction
 from app.actions.telegram.chat_action import TelegramChatAction
@@ -39,6 +45,12 @@ from app.actions.ai_agent.memory_action import MemoryAction
 from app.core.context import ExecutionContext
 
 
+async def _async_chunks(chunks):
+    """Yield chunks like aiohttp's StreamReader.iter_chunked."""
+    for chunk in chunks:
+        yield chunk
+
+
 class TestHTTPActions:
     """Test HTTP-related actions."""
 
@@ -104,6 +116,83 @@ class TestHTTPActions:
         assert result["content_type"] == "application/json"
         assert result["body"] == input_data
 
+    @pytest.mark.asyncio
+    async def test_webhook_dedupe_is_opt_in_and_uses_delivery_ids(self, execution_context):
+        """Test that only per-delivery ids from known providers are deduplicated."""
+        stripe_event = {"webhook_data": {"id": "evt_1", "type": "charge.succeeded"}}
+
+        action = WebhookResponseAction({"provider": "stripe", "validation_required": False})
+        first = await action.execute(stripe_event, execution_context)
+        second = await action.execute(stripe_event, execution_context)
+        assert "duplicate" not in first and "duplicate" not in second
+
+        action = WebhookResponseAction({"provider": "stripe", "validation_required": False, "dedupe_cache_size": 10})
+        assert "duplicate" not in await action.execute(stripe_event, execution_context)
+        assert (await action.execute(stripe_event, execution_context))["duplicate"] is True
+
+        action = WebhookResponseAction({"provider": "github", "validation_required": False, "dedupe_cache_size": 10})
+        push = {"webhook_data": {"id": 42}, "webhook_headers": {"X-GitHub-Event": "push", "X-GitHub-Delivery": "d-1"}}
+        redelivery = {"webhook_data": {"id": 42}, "webhook_headers": {"X-GitHub-Event": "push", "X-GitHub-Delivery": "d-2"}}
+        assert "duplicate" not in await action.execute(push, execution_context)
+        assert "duplicate" not in await action.execute(redelivery, execution_context)
+        assert (await action.execute(push, execution_context))["duplicate"] is True
+
+        action = WebhookResponseAction({"provider": "generic", "validation_required": False, "dedupe_cache_size": 10})
+        order = {"webhook_data": {"id": "order-7", "status": "paid"}}
+        assert "duplicate" not in await action.execute(order, execution_context)
+        assert "duplicate" not in await action.execute(order, execution_context)
+
+    @pytest.mark.asyncio
+    async def test_webhook_signature_uses_raw_body_and_size_limit(self, execution_context):
+        """Test that signatures cover the raw body and oversized payloads get a 413."""
+        raw_body = b'{"action": "opened",  "number": 7}'
+        signature = "sha256=" + hmac.new(b"secret", raw_body, hashlib.sha256).hexdigest()
+        action = WebhookResponseAction({"provider": "github", "secret_token": "secret", "max_payload_size": 64})
+        signed = {
+            "webhook_data": {"action": "opened", "number": 7},
+            "webhook_headers": {"X-GitHub-Event": "pull_request", "X-Hub-Signature-256": signature}
+        }
+
+        result = await action.execute({**signed, "raw_body": raw_body}, execution_context)
+        assert result["success"] is True
+        assert result["processed_data"]["event_type"] == "pull_request"
+
+        result = await action.execute({**signed, "raw_body": raw_body.replace(b"7", b"8")}, execution_context)
+        assert result["response"]["status"] == 401
+
+        # Without raw_body the compact re-serialization differs from the signed bytes
+        result = await action.execute(signed, execution_context)
+        assert result["response"]["status"] == 401
+
+        result = await action.execute({**signed, "raw_body": raw_body + b" " * 64}, execution_context)
+        assert result["response"]["status"] == 413
+
+    @pytest.mark.asyncio
+    async def test_http_binary_body_stops_at_cap(self):
+        """Test that binary bodies stop downloading once max_binary_bytes is reached."""
+        reads = []
+
+        async def endless_body(size):
+            while True:
+                reads.append(size)
+                yield b"x" * size
+
+        response = MagicMock()
+        response.content.iter_chunked = endless_body
+        action = HTTPAction({"base_url": "https://example.com", "endpoint": "/file", "max_binary_bytes": 100000})
+
+        data = await action._read_binary(response)
+
+        assert data["truncated"] is True
+        assert len(base64.b64decode(data["raw_b64"])) == 100000
+        assert len(reads) * reads[0] < 200000
+        response.close.assert_called_once()
+
+        response = MagicMock()
+        response.content.iter_chunked = lambda size: _async_chunks([b"ab", b"cd"])
+        assert await action._read_binary(response) == {"raw_b64": base64.b64encode(b"abcd").decode()}
+        response.close.assert_not_called()
+
 
 class TestAIActions:
     """Test AI-related actions."""
@@ -268,6 +357,106 @@ class TestEmailActions:
         assert result["subject"] == "Test"
         assert result["body"] == "Email body content"
 
+    def test_attachment_path_confined_to_attachment_root(self, tmp_path):
+        """Test that attachment paths cannot leave attachment_root."""
+        root = tmp_path / "attachments"
+        root.mkdir()
+        (root / "report.txt").write_bytes(b"quarterly numbers")
+        (tmp_path / "secret.env").write_text("TOKEN=abc")
+        (root / "link.env").symlink_to(tmp_path / "secret.env")
+
+        action = SendEmailAction({"from_email": "a@example.com", "attachment_root": str(root)})
+
+        assert action._attachment_path({"path": "report.txt"}) == str(root / "report.txt")
+        assert action._attachment_path({"content": "aGk="}) is None
+        for path in ["../secret.env", str(tmp_path / "secret.env"), "/etc/passwd", "link.env"]:
+            with pytest.raises(ValueError, match="outside attachment_root"):
+                action._attachment_path({"path": path})
+
+        part = action._create_attachment_part({"path": "report.txt"})
+        assert part.get_payload(decode=True) == b"quarterly numbers"
+
+    def test_attachment_path_requires_attachment_root(self):
+        """Test that file attachments are refused when no root is configured."""
+        action = SendEmailAction({"from_email": "a@example.com"})
+
+        with pytest.raises(ValueError, match="attachment_root"):
+            action._sendgrid_attachment({"path": "/etc/passwd"})
+
+    @pytest.mark.asyncio
+    async def test_mailgun_rejects_attachment_outside_root(self, execution_context, tmp_path):
+        """Test that Mailgun sends fail before any request for an unsafe path."""
+        action = SendEmailAction({
+            "provider": "mailgun",
+            "api_key": "key",
+            "domain": "example.com",
+            "from_email": "a@example.com",
+            "attachment_root": str(tmp_path)
+        })
+        action._get_session = AsyncMock()
+
+        result = await action.execute({
+            "to": ["b@example.com"],
+            "subject": "Report",
+            "body": "Attached",
+            "attachments": [{"path": "/etc/passwd"}]
+        }, execution_context)
+
+        assert result["success"] is False
+        assert "outside attachment_root" in result["error"]
+        action._get_session.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_mailgun_send_batch_groups_and_chunks(self, execution_context):
+        """Test Mailgun batching: grouping, chunking, shared addresses and per-message results."""
+        action = SendEmailAction({
+            "provider": "mailgun",
+            "api_key": "key",
+            "domain": "example.com",
+            "from_email": "a@example.com"
+        })
+
+        async def send(to_emails, subject, body, **kwargs):
+            if to_emails == ["shared@example.com"]:
+                raise Exception("Mailgun rejected the request")
+            return {"message_id": f"<{subject}-{len(to_emails)}>"}
+
+        action._send_via_mailgun = AsyncMock(side_effect=send)
+        action.execute = AsyncMock(return_value={"success": True, "message_id": "single"})
+
+        messages = [
+            {"to": ["shared@example.com", "b@example.com", "c@example.com"], "subject": "News", "body": "Hi",
+             "variables": {"plan": "pro"}},
+            {"to": ["shared@example.com"], "subject": "News", "body": "Hi", "variables": {"plan": "free"}},
+            {"to": ["d@example.com"], "subject": "Other", "body": "Hi"},
+            {"to": ["e@example.com"], "subject": "News", "body": "Hi", "cc": ["f@example.com"]}
+        ]
+
+        with patch("app.actions.email.send_email.MAILGUN_BATCH_SIZE", 2):
+            results = await action.send_batch(messages, execution_context)
+
+        calls = [(call.args[0], call.kwargs["recipient_variables"]) for call in action._send_via_mailgun.call_args_list]
+        assert calls == [
+            (["shared@example.com", "b@example.com"],
+             {"shared@example.com": {"plan": "pro"}, "b@example.com": {"plan": "pro"}}),
+            (["c@example.com"], {"c@example.com": {"plan": "pro"}}),
+            (["shared@example.com"], {"shared@example.com": {"plan": "free"}}),
+            (["d@example.com"], {"d@example.com": {}})
+        ]
+        action.execute.assert_awaited_once_with(messages[3], execution_context)
+
+        assert results[0]["success"] is True
+        assert results[0]["recipients"] == 3
+        assert results[1] == {
+            "success": False,
+            "error": "Mailgun rejected the request",
+            "provider": "mailgun",
+            "recipients": 1,
+            "attachments_count": 0
+        }
+        assert results[2]["message_id"] == "<Other-1>"
+        assert results[3] == {"success": True, "message_id": "single"}
+
 
 class TestDataActions:
     """Test data processing actions."""
@@ -347,6 +536,97 @@ class TestDataActions:
         assert "aggregated_data" in result
         assert result["aggregated_data"]["Engineering"]["salary_sum"] == 170000
 
+    def test_aggregate_large_integer_sums_are_exact(self):
+        """Test that numpy integer sums fall back to Python ints instead of wrapping."""
+        action = DataAggregateAction({})
+        large = [2 ** 62] * 2048
+        mixed = [2 ** 62, -(2 ** 62) + 1] * 1024
+        huge = [2 ** 63 + 5] * 2048
+
+        assert action._aggregate_values(large, "sum") == sum(large)
+        assert action._aggregate_values(mixed, "sum") == sum(mixed)
+        assert action._aggregate_values(huge, "sum") == sum(huge)
+        assert action._aggregate_values(huge, "max") == 2 ** 63 + 5
+        assert action._to_numeric_array(huge) is None
+
+    @pytest.mark.parametrize("case_sensitive", [True, False])
+    @pytest.mark.parametrize("operator_name,value", [
+        ("equals", "Alice"), ("==", 30), ("not_equals", "alice"), ("!=", None),
+        ("contains", "LI"), ("not_contains", "li"), ("starts_with", "a"), ("ends_with", "E"),
+        ("in", ["alice", "Bob", 30]), ("in", "Alice"), ("not_in", ["alice", 25]), ("not_in", "Alice"),
+        ("is_null", None), ("not_null", None), ("is_empty", None), ("not_empty", None),
+        ("greater_than", 25), ("<=", "2024-01-01"), ("regex", "^[AB]"), ("length_greater", "3")
+    ])
+    def test_generated_filter_matches_apply_operator(self, operator_name, value, case_sensitive):
+        """Test that the generated filter functions agree with _apply_operator."""
+        items = [
+            {"name": "Alice", "age": 30, "tags": ["a", "b"], "profile": {"city": "alice"}},
+            {"name": "alice", "age": 25, "tags": [], "profile": {"city": "Bob"}},
+            {"name": "BOB", "age": "30", "tags": None, "profile": {}},
+            {"name": "", "age": None, "profile": "flat"},
+            {"name": "   ", "age": 30.0, "profile": {"city": "2023-06-01"}},
+            {"name": 42, "age": True},
+            {}
+        ]
+
+        for field in ("name", "age", "tags", "profile.city", "missing", "tags.0"):
+            for logical_operator in ("AND", "OR"):
+                action = DataFilterAction({
+                    "filter_criteria": [
+                        {"field": field, "operator": operator_name, "value": value, "case_sensitive": case_sensitive},
+                        {"field": "age", "operator": "not_null"}
+                    ],
+                    "logical_operator": logical_operator
+                })
+                assert action._compiled_match is not None
+
+                expected = []
+                for item in items:
+                    results = [
+                        bool(action._apply_operator(getter(item), op, raw, cs, operand))
+                        for getter, op, raw, cs, operand in action._compiled_criteria
+                    ]
+                    expected.append(all(results) if logical_operator == "AND" else any(results))
+
+                assert [action._compiled_match(item) for item in items] == expected, (field, logical_operator)
+                assert action._compiled_select(items + ["not a dict"]) == [
+                    item for item, matched in zip(items, expected) if matched
+                ]
+
+    @pytest.mark.parametrize("group_by", [[], ["dept"], ["dept", "level"]])
+    def test_numpy_aggregation_matches_pure_python(self, group_by):
+        """Test that columnar and numpy aggregation agree with the row-by-row Python path."""
+        data = []
+        for i in range(12000):
+            row = {"dept": ["eng", "ops", "sales", None][i % 4], "level": i % 3, "salary": (i * 7919) % 100000,
+                   "score": ((i * 31) % 1000) / 8, "meta": {"bonus": str(i % 50)}}
+            if i % 11 == 0:
+                del row["salary"]
+            if i % 13 == 0:
+                row["score"] = None
+            data.append(row)
+
+        functions = ("sum", "count", "min", "max", "avg", "median", "std_dev", "variance",
+                     "first", "last", "unique_count")
+        aggregations = {"rows": "count"}
+        for field in ("salary", "score", "meta.bonus"):
+            for function in functions:
+                aggregations[f"{field}_{function}"] = {"function": function, "field": field}
+
+        fast = DataAggregateAction({"group_by": group_by, "aggregations": aggregations})._aggregate_data(data)
+        with patch("app.actions.data.aggregate.np", None), \
+                patch("app.actions.data.aggregate.COLUMNAR_THRESHOLD", len(data) + 1):
+            slow = DataAggregateAction({"group_by": group_by, "aggregations": aggregations})._aggregate_data(data)
+
+        if not group_by:
+            fast, slow = [fast], [slow]
+        key = lambda group: tuple(str(group.get(field)) for field in group_by)
+        fast, slow = sorted(fast, key=key), sorted(slow, key=key)
+
+        assert len(fast) == len(slow)
+        for fast_group, slow_group in zip(fast, slow):
+            assert fast_group == pytest.approx(slow_group, rel=1e-9)
+
 
 class TestStorageActions:
     """Test storage-related actions."""
@@ -412,6 +692,64 @@ class TestStorageActions:
             assert result["bucket"] == "test-bucket"
             mock_s3.upload_file.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_google_drive_list_follows_page_tokens(self):
+        """Test Drive listing: one page by default, every page with auto_paginate."""
+        pages = {
+            None: {"files": [{"id": "f1"}], "nextPageToken": "t1"},
+            "t1": {"files": [{"id": "f2"}], "nextPageToken": "t2"},
+            "t2": {"files": [{"id": "f3"}]}
+        }
+        calls = []
+
+        def list_files(**params):
+            calls.append(dict(params))
+            return MagicMock(execute=MagicMock(return_value=pages[params.get("pageToken")]))
+
+        service = MagicMock()
+        service.files.return_value.list.side_effect = list_files
+        action = GoogleDriveAction({"operation": "list", "credentials_json": "{}"})
+
+        result = await action._list_files(service, {"page_token": "t1"})
+        assert result == {"files": [{"id": "f2"}], "count": 1, "next_page_token": "t2", "has_more": True}
+        assert calls[0]["pageSize"] == 100
+
+        calls.clear()
+        result = await action._list_files(service, {"auto_paginate": True})
+        assert [f["id"] for f in result["files"]] == ["f1", "f2", "f3"]
+        assert result["has_more"] is False
+        assert [call.get("pageToken") for call in calls] == [None, "t1", "t2"]
+        assert all(call["pageSize"] == 1000 for call in calls)
+
+    @pytest.mark.asyncio
+    async def test_s3_client_is_shared_and_called_off_the_event_loop(self, execution_context):
+        """Test that S3 actions reuse one client per credentials and run boto3 calls in the executor."""
+        config = {
+            "operation": "list",
+            "bucket_name": "test-bucket",
+            "access_key_id": "key",
+            "secret_access_key": "secret"
+        }
+        action = S3UploadAction(config)
+        threads = []
+        s3_client = MagicMock()
+        s3_client.list_objects_v2.side_effect = lambda **params: threads.append(threading.get_ident()) or {"Contents": []}
+
+        with patch.dict("app.actions.storage.s3_upload._s3_clients", {action._client_key: s3_client}):
+            results = await asyncio.gather(
+                action.execute({"prefix": "a/"}, execution_context),
+                S3UploadAction(config).execute({"prefix": "b/"}, execution_context)
+            )
+
+        assert all(result["success"] for result in results)
+        assert s3_client.list_objects_v2.call_count == 2
+        assert threading.get_ident() not in threads
+
+        assert S3UploadAction({**config, "secret_access_key": "other"})._client_key != action._client_key
+        assert S3UploadAction({**config, "http_pool_size": 50})._client_key != action._client_key
+        with pytest.raises(ValueError, match="http_pool_size"):
+            await S3UploadAction({**config, "http_pool_size": 0}).validate_config()
+
 
 class TestNotionActions:
     """Test Notion-related actions."""
@@ -479,6 +817,143 @@ class TestNotionActions:
             assert result["success"] is True
             assert result["page_id"] == "new-page-id"
 
+    @staticmethod
+    def _notion_response(status, body=None, headers=None):
+        """Build a mock aiohttp response usable as `async with session.get(...)`."""
+        response = MagicMock()
+        response.status = status
+        response.headers = headers or {}
+        response.read = AsyncMock(return_value=json.dumps(body).encode())
+        response.json = AsyncMock(return_value=body)
+        response.text = AsyncMock(return_value=json.dumps(body))
+        response.__aenter__.return_value = response
+        return response
+
+    @pytest.mark.asyncio
+    async def test_notion_page_blocks_follow_cursors(self):
+        """Test that page blocks are listed across every cursor."""
+        action = NotionPageAction({"api_key": "test-key", "page_id": "page-1", "operation": "get"})
+        session = MagicMock()
+        session.get.side_effect = [
+            self._notion_response(200, {"results": [{"id": "b1"}], "has_more": True, "next_cursor": "c1"}),
+            self._notion_response(200, {"results": [{"id": "b2"}], "has_more": False, "next_cursor": None})
+        ]
+
+        blocks, complete = await action._fetch_blocks(session)
+
+        assert [block["id"] for block in blocks] == ["b1", "b2"]
+        assert complete is True
+        assert session.get.call_args_list[1].kwargs["params"]["start_cursor"] == "c1"
+
+    @pytest.mark.asyncio
+    async def test_notion_page_blocks_errors_are_not_truncated(self):
+        """Test that rate limits and later-page errors raise instead of returning part of a page."""
+        action = NotionPageAction({"api_key": "test-key", "page_id": "page-1", "operation": "get"})
+        first_page = {"results": [{"id": "b1"}], "has_more": True, "next_cursor": "c1"}
+
+        session = MagicMock()
+        session.get.side_effect = [self._notion_response(200, first_page), self._notion_response(500, {})]
+        with pytest.raises(NotionAPIError) as excinfo:
+            await action._fetch_blocks(session)
+        assert excinfo.value.status == 500
+
+        session = MagicMock()
+        session.get.side_effect = [self._notion_response(429, {}, {"Retry-After": "1"})]
+        with pytest.raises(NotionAPIError) as excinfo:
+            await action._fetch_blocks(session)
+        assert excinfo.value.retry_delay() == 1.0
+
+        session = MagicMock()
+        session.get.side_effect = [self._notion_response(404, {})]
+        assert await action._fetch_blocks(session) == ([], False)
+
+    @pytest.mark.asyncio
+    async def test_notion_page_cache_is_opt_in_and_isolated(self):
+        """Test that only complete pages are cached, and cached copies are independent."""
+        page = {"id": "page-1", "properties": {"title": {"title": [{"plain_text": "Plan"}]}}}
+
+        action = NotionPageAction({"api_key": "cache-key", "page_id": "page-1", "operation": "get"})
+        action._get_session = AsyncMock()
+        action._fetch_page = AsyncMock(return_value=page)
+        action._fetch_blocks = AsyncMock(return_value=([{"id": "b1"}], True))
+        await action._get_page({})
+        await action._get_page({})
+        assert action._fetch_page.await_count == 2
+
+        action = NotionPageAction({"api_key": "cache-key", "page_id": "page-1", "operation": "get", "page_cache_ttl": 60})
+        action._get_session = AsyncMock()
+        action._fetch_page = AsyncMock(return_value=page)
+        action._fetch_blocks = AsyncMock(return_value=([], False))
+        await action._get_page({})
+        await action._get_page({})
+        assert action._fetch_page.await_count == 2
+
+        action._fetch_blocks = AsyncMock(return_value=([{"id": "b1"}], True))
+        first = await action._get_page({})
+        first["blocks"][0]["id"] = "changed"
+        first["properties"]["title"]["title"][0]["plain_text"] = "changed"
+        second = await action._get_page({})
+        second["blocks"].clear()
+        third = await action._get_page({})
+
+        assert action._fetch_page.await_count == 3
+        assert third["blocks"] == [{"id": "b1"}]
+        assert third["properties"]["title"]["title"][0]["plain_text"] == "Plan"
+
+    @pytest.mark.asyncio
+    async def test_notion_query_many_is_paced_and_isolates_failures(self):
+        """Test that batched queries go through the throttle and failures stay per query."""
+        action = NotionDatabaseAction({"api_key": "query-key", "database_id": "db-1", "operation": "query"})
+        assert action._throttle is NotionPageAction({"api_key": "query-key"})._throttle
+        action._throttle = MagicMock(acquire=AsyncMock())
+
+        session = MagicMock()
+        session.post.side_effect = [
+            self._notion_response(200, {"results": [{"id": "p1"}], "has_more": False}),
+            self._notion_response(400, {"message": "bad filter"}),
+            self._notion_response(200, {"results": [], "has_more": False})
+        ]
+        action._get_session = AsyncMock(return_value=session)
+
+        results = await action.query_many([{}, {"filter": {}}, {}])
+
+        assert action._throttle.acquire.await_count == 3
+        assert "error" not in results[0] and "error" not in results[2]
+        assert "bad filter" in results[1]["error"]
+
+        action._query_database = AsyncMock(side_effect=[{"results": []}, asyncio.CancelledError()])
+        results = await action.query_many([{}, {}])
+        assert results[0] == {"results": []}
+        assert "error" in results[1]
+
+    @pytest.mark.asyncio
+    async def test_notion_retries_rate_limits_with_backoff(self, execution_context):
+        """Test that 429s are retried with growing delays and other errors are not."""
+        handler = AsyncMock(side_effect=[NotionAPIError(429, "slow down", "0"), NotionAPIError(429, "slow down"), {"ok": True}])
+
+        with patch("app.actions.notion.base.asyncio.sleep", new=AsyncMock()) as sleep:
+            assert await with_retries(handler, {}) == {"ok": True}
+            delays = [call.args[0] for call in sleep.await_args_list]
+            assert len(delays) == 2
+            assert 0.5 <= delays[0] < 0.75 and 1.0 <= delays[1] < 1.25
+
+            handler = AsyncMock(side_effect=NotionAPIError(429, "slow down", "0"))
+            with pytest.raises(NotionAPIError):
+                await with_retries(handler, {})
+            assert handler.await_count == 4
+
+            handler = AsyncMock(side_effect=NotionAPIError(404, "missing"))
+            with pytest.raises(NotionAPIError):
+                await with_retries(handler, {})
+            assert handler.await_count == 1
+
+            # Database actions get the same policy as page actions
+            action = NotionDatabaseAction({"api_key": "retry-key", "database_id": "db-1", "operation": "query"})
+            action._operation_handler = AsyncMock(side_effect=[NotionAPIError(429, "slow down")] * 3 + [{"results": []}])
+            result = await action.execute({}, execution_context)
+            assert result["success"] is True
+            assert action._operation_handler.await_count == 4
+
 
 class TestTelegramActions:
     """Test Telegram-related actions."""